@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Batch-Rendering von Missions-Snapshots (headless)
+
+Funktionen:
+- Nimmt CSV-Dateien per Glob (z. B. Archiv) und/oder feste Zeitbereiche
+- Aufteilung pro Tag, pro Überflug (Pass = Lücke > --pass-gap) oder gesamt
+- Optional ein Diagramm pro Sensor (--per-sensor)
+- PNG und/oder SVG, gerendert im Prozess-Pool über das Agg-Backend
+- Nie plt.show(); bereits aktuelle Ausgaben (neuer als die Quelle) werden übersprungen
+- Ausgabenamen: <stem>-<hash8>_<label>…, hash8 aus dem absoluten Quellpfad –
+  gleichnamige Dateien aus verschiedenen Ordnern überschreiben sich nicht
+
+Beispiel:
+    python -m cube.ground.batch_render --glob "data/archive/**/*.csv" \\
+        --split day --per-sensor --format png --format svg --jobs 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob as globmod
+import hashlib
+import json
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+
+DEFAULT_OUT_DIR = pathlib.Path("data/reports")
+SPLIT_MODES = ("none", "day", "pass")
+ALL_SENSORS = ("temperature", "humidity", "pressure")
+
+
+def parse_range(text: str) -> Tuple[str, str]:
+    """'START/END' (ISO 8601, UTC) → (start, end). Wird im Worker interpretiert."""
+    try:
+        start, end = text.split("/", 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Zeitbereich erwartet als START/END: {text!r}")
+    if not start or not end:
+        raise argparse.ArgumentTypeError(f"Zeitbereich unvollständig: {text!r}")
+    return start.strip(), end.strip()
+
+
+def _is_fresh(out_path: pathlib.Path, src_mtime: float) -> bool:
+    """True, wenn die Ausgabe existiert und nicht älter als die Quelle ist."""
+    try:
+        return out_path.stat().st_mtime >= src_mtime
+    except FileNotFoundError:
+        return False
+
+
+def _output_prefix(src_path: pathlib.Path) -> str:
+    """Eindeutiger Namensanfang je Quelle: Dateistamm + Kurz-Hash des absoluten Pfads."""
+    digest = hashlib.sha1(str(src_path.resolve()).encode("utf-8")).hexdigest()[:8]
+    return f"{src_path.stem}-{digest}"
+
+
+def _read_manifest(path: pathlib.Path, params: dict) -> Optional[List[str]]:
+    """Ausgabenamen des letzten Laufs, falls mit denselben Parametern erzeugt; sonst None."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    if data.get("params") != params:
+        return None
+    return data.get("outputs")
+
+
+def _range_label(start: str, end: str) -> str:
+    """Dateinamensichere Kurzform eines Zeitbereichs."""
+    def keep(s: str) -> str:
+        return "".join(c for c in s if c.isalnum())
+    return f"{keep(start)}-{keep(end)}"
+
+
+def _segments(df, split: str, pass_gap_sec: float):
+    """Teilt einen DataFrame in (label, teil_df) nach Tag oder Überflug."""
+    if split == "day":
+        days = df["ts"].dt.strftime("%Y-%m-%d")
+        for day, part in df.groupby(days, sort=True):
+            yield day, part
+    elif split == "pass":
+        gaps = df["ts"].diff().dt.total_seconds().gt(pass_gap_sec)
+        for n, (_, part) in enumerate(df.groupby(gaps.cumsum(), sort=True), start=1):
+            yield f"pass{n:03d}_{part['ts'].iloc[0].strftime('%Y%m%dT%H%M')}", part
+    else:
+        yield "all", df
+
+
+def _render_source(
+    src: str,
+    out_dir: str,
+    ranges: List[Tuple[str, str]],
+    split: str,
+    pass_gap_sec: float,
+    per_sensor: bool,
+    formats: Tuple[str, ...],
+    force: bool,
+) -> Tuple[str, int, int]:
+    """
+    Worker: rendert alle Snapshots einer Quelldatei.
+    Liefert (quelle, gerendert, übersprungen).
+    """
+    src_path = pathlib.Path(src)
+    out = pathlib.Path(out_dir)
+    stem = src_path.stem
+    prefix = _output_prefix(src_path)
+    src_mtime = src_path.stat().st_mtime
+    sensor_sets = [(s,) for s in ALL_SENSORS] if per_sensor else [ALL_SENSORS]
+
+    def targets(label: str):
+        for sensors in sensor_sets:
+            suffix = f"_{sensors[0]}" if per_sensor else ""
+            for fmt in formats:
+                yield sensors, out / f"{prefix}_{label}{suffix}.{fmt}"
+
+    # Tages-/Überflug-Labels hängen von den Daten ab: exakte Namen aus dem Manifest
+    manifest = out / f".{prefix}.{split}.json"
+    params = {"source": str(src_path.resolve()), "split": split, "pass_gap_sec": pass_gap_sec,
+              "per_sensor": per_sensor, "formats": list(formats)}
+
+    # Schneller Ausstieg ohne CSV-Parsing, wenn alle Ausgaben aktuell sind
+    if not force:
+        if ranges or split == "none":
+            labels = [_range_label(*r) for r in ranges] if ranges else ["all"]
+            expected = [p for label in labels for _, p in targets(label)]
+        else:
+            names = _read_manifest(manifest, params) if _is_fresh(manifest, src_mtime) else None
+            expected = [out / name for name in names or []]
+        if expected and all(_is_fresh(p, src_mtime) for p in expected):
+            return src, 0, len(expected)
+
+    # Erst jetzt die schweren Module laden (Agg-only, kein pyplot)
+    import pandas as pd
+    from cube.ground.loader import load_cached
+    from cube.ground.plot import render_snapshot
+
+    # Geparste CSV aus dem Binär-Cache (ts bereits UTC); auch Dumps ohne Kopfzeile
+    df = load_cached(src_path)
+    if df.empty:
+        return src, 0, 0
+
+    if ranges:
+        parts = []
+        for start, end in ranges:
+            t0, t1 = pd.Timestamp(start), pd.Timestamp(end)
+            t0 = t0.tz_localize("UTC") if t0.tzinfo is None else t0
+            t1 = t1.tz_localize("UTC") if t1.tzinfo is None else t1
+            parts.append((_range_label(start, end), df[(df["ts"] >= t0) & (df["ts"] < t1)]))
+    else:
+        parts = list(_segments(df, split, pass_gap_sec))
+
+    out.mkdir(parents=True, exist_ok=True)
+    rendered = skipped = 0
+    outputs: List[str] = []
+    for label, part in parts:
+        if part.empty:
+            continue
+        for sensors, path in targets(label):
+            outputs.append(path.name)
+            if not force and _is_fresh(path, src_mtime):
+                skipped += 1
+                continue
+            render_snapshot(part, path, title=f"CubeSat Telemetrie – {stem} {label}", sensors=sensors)
+            rendered += 1
+    if not ranges and split != "none":
+        tmp = manifest.with_name(manifest.name + ".tmp")
+        tmp.write_text(json.dumps({"params": params, "outputs": outputs}), encoding="utf-8")
+        os.replace(tmp, manifest)
+    return src, rendered, skipped
+
+
+def collect_sources(patterns: List[str], files: List[pathlib.Path]) -> List[str]:
+    """Expandiert Globs (rekursiv, '**' erlaubt) und Einzeldateien, ohne Duplikate."""
+    seen = {}
+    for pat in patterns:
+        for p in sorted(globmod.glob(pat, recursive=True)):
+            if os.path.isfile(p):
+                seen.setdefault(os.path.abspath(p), p)
+    for f in files:
+        seen.setdefault(os.path.abspath(f), str(f))
+    return list(seen.values())
+
+
+def render_batch(
+    sources: List[str],
+    out_dir: pathlib.Path = DEFAULT_OUT_DIR,
+    ranges: Optional[List[Tuple[str, str]]] = None,
+    split: str = "none",
+    pass_gap_sec: float = 600.0,
+    per_sensor: bool = False,
+    formats: Tuple[str, ...] = ("png",),
+    jobs: Optional[int] = None,
+    force: bool = False,
+) -> Tuple[int, int]:
+    """Rendert alle Quellen parallel. Liefert (gerendert, übersprungen) gesamt."""
+    total_rendered = total_skipped = 0
+    args = (str(out_dir), list(ranges or []), split, pass_gap_sec, per_sensor, tuple(formats), force)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {pool.submit(_render_source, src, *args): src for src in sources}
+        for fut in as_completed(futures):
+            try:
+                src, rendered, skipped = fut.result()
+            except (Exception, SystemExit) as e:
+                print(f"[ERR] {futures[fut]}: {e}")
+                continue
+            total_rendered += rendered
+            total_skipped += skipped
+            print(f"[INFO] {src}: {rendered} gerendert, {skipped} aktuell (übersprungen)")
+    return total_rendered, total_skipped
+
+
+def main() -> int:
+    """CLI-Einstiegspunkt für das Batch-Rendering."""
+    parser = argparse.ArgumentParser(description="Headless Batch-Rendering von Telemetrie-Snapshots")
+    parser.add_argument("--glob", action="append", default=[], help="Glob für CSV-Quellen (mehrfach erlaubt, '**' rekursiv)")
+    parser.add_argument("--csv", type=pathlib.Path, action="append", default=[], help="einzelne CSV-Quelle (mehrfach erlaubt)")
+    parser.add_argument("--range", type=parse_range, action="append", default=[], dest="ranges",
+                        help="Zeitbereich START/END (ISO 8601, UTC), mehrfach erlaubt; ersetzt --split")
+    parser.add_argument("--split", choices=SPLIT_MODES, default="none", help="Aufteilung: gesamt, pro Tag oder pro Überflug")
+    parser.add_argument("--pass-gap", type=float, default=600.0, help="Lücke in Sekunden, die einen neuen Überflug beginnt")
+    parser.add_argument("--per-sensor", action="store_true", help="ein Diagramm pro Sensor statt drei Achsen")
+    parser.add_argument("--format", action="append", choices=("png", "svg"), dest="formats", help="Ausgabeformat (mehrfach erlaubt)")
+    parser.add_argument("--out-dir", type=pathlib.Path, default=DEFAULT_OUT_DIR, help="Zielverzeichnis für Snapshots")
+    parser.add_argument("--jobs", type=int, default=None, help="Anzahl Worker-Prozesse (Standard: CPU-Anzahl)")
+    parser.add_argument("--force", action="store_true", help="auch aktuelle Ausgaben neu rendern")
+    args = parser.parse_args()
+
+    sources = collect_sources(args.glob, args.csv)
+    if not sources:
+        raise SystemExit("[ERR] Keine Quelldateien gefunden (--glob / --csv).")
+
+    rendered, skipped = render_batch(
+        sources,
+        out_dir=args.out_dir,
+        ranges=args.ranges,
+        split=args.split,
+        pass_gap_sec=args.pass_gap,
+        per_sensor=args.per_sensor,
+        formats=tuple(args.formats or ("png",)),
+        jobs=args.jobs,
+        force=args.force,
+    )
+    print(f"[INFO] Batch fertig: {rendered} Snapshots gerendert, {skipped} übersprungen ({len(sources)} Quellen)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
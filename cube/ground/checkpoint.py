@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+checkpoint.py – Wiederaufnehmbare Datei-Ingestion für receiver.py --file
+
+Ein Checkpoint hält fest, wie weit eine Eingabedatei verarbeitet wurde:
+  • Eingabe: absoluter Pfad, Gerät/Inode, Größe, Hash der ersten Bytes
+  • Byte-Offset hinter der letzten vollständig verarbeiteten Zeile
+  • Größen aller Sinks (RAW/PROCESSED/REJECTED/...) zum selben Zeitpunkt
+
+Beim erneuten Start wird ab dem Offset weitergelesen (inkrementelles Einlesen
+wachsender Dateien). Zeilen zwischen letztem Checkpoint und Absturz landen
+dabei ein zweites Mal in den Sinks (at-least-once).
+
+Die Sinks werden von Live-Empfang, Spool und weiteren --file-Läufen geteilt.
+Kürzen auf den Checkpoint-Stand (--repair-sinks) ist daher nur auf Wunsch
+möglich und wird verweigert, sobald ein Sink stärker gewachsen ist, als der
+nicht gesicherte Teil dieses Laufs erklären kann (repair_allowance) – dann hat
+ein anderer Schreiber angehängt, und Kürzen würde dessen Zeilen löschen.
+
+Checkpoints werden atomar geschrieben (Temp-Datei + os.replace).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+CHECKPOINT_VERSION = 1
+HEAD_BYTES = 256  # Fingerprint gegen wiederverwendete Inodes
+LINE_SUFFIX_BYTES = 64   # ",reason=…" / ",anomaly=…" je Zeile in REJECTED/ANOMALIES
+HEADER_BYTES = 256       # Kopfzeile einer neu angelegten Sink-Datei
+
+
+def _head_sha1(path: Path, length: int) -> str:
+    with path.open("rb") as f:
+        return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def default_checkpoint_path(checkpoint_dir: Path, input_path: Path) -> Path:
+    """Eine Checkpoint-Datei pro Eingabedatei (Name + Hash des absoluten Pfads)."""
+    key = hashlib.sha1(str(input_path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return checkpoint_dir / f"{input_path.name}.{key}.json"
+
+
+@dataclass
+class Checkpoint:
+    path: str                 # absoluter Pfad der Eingabedatei
+    dev: int
+    inode: int
+    size: int                 # Dateigröße beim Checkpoint
+    head_len: int
+    head_sha1: str
+    offset: int               # Byte-Offset hinter der letzten verarbeiteten Zeile
+    packets: int              # bisher verarbeitete Pakete
+    sinks: Dict[str, int] = field(default_factory=dict)  # Sink-Pfad → Größe in Bytes
+    updated: float = 0.0
+    version: int = CHECKPOINT_VERSION
+
+    @classmethod
+    def for_file(cls, input_path: Path, offset: int, packets: int, sinks: Dict[str, int]) -> "Checkpoint":
+        st = input_path.stat()
+        head_len = min(HEAD_BYTES, st.st_size)
+        return cls(
+            path=str(input_path.resolve()),
+            dev=st.st_dev,
+            inode=st.st_ino,
+            size=st.st_size,
+            head_len=head_len,
+            head_sha1=_head_sha1(input_path, head_len),
+            offset=offset,
+            packets=packets,
+            sinks=sinks,
+            updated=time.time(),
+        )
+
+    def matches(self, input_path: Path) -> bool:
+        """True, wenn die Datei dieselbe ist (Inode + Anfang) und nicht gekürzt wurde."""
+        try:
+            st = input_path.stat()
+        except OSError:
+            return False
+        if (st.st_dev, st.st_ino) != (self.dev, self.inode):
+            return False
+        if st.st_size < self.offset or st.st_size < self.head_len:
+            return False
+        return _head_sha1(input_path, self.head_len) == self.head_sha1
+
+
+def load_checkpoint(path: Path) -> Optional[Checkpoint]:
+    """Liest einen Checkpoint; None bei fehlender/ungültiger Datei oder anderer Version."""
+    try:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CHECKPOINT_VERSION:
+            return None
+        return Checkpoint(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_checkpoint(path: Path, cp: Checkpoint) -> None:
+    """Schreibt den Checkpoint atomar."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(asdict(cp), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def sink_sizes(paths: Iterable[Path]) -> Dict[str, int]:
+    """Aktuelle Größen der Sink-Dateien (fehlende Datei = 0)."""
+    sizes = {}
+    for p in paths:
+        try:
+            sizes[str(p)] = p.stat().st_size
+        except FileNotFoundError:
+            sizes[str(p)] = 0
+    return sizes
+
+
+def repair_allowance(input_path: Path, offset: int, max_lines: int) -> int:
+    """
+    Obergrenze der Bytes, die dieser Lauf nach dem Checkpoint in einen Sink
+    geschrieben haben kann: höchstens 'max_lines' Zeilen (Checkpoint-Intervall)
+    ab 'offset', je Zeile mit Suffix, plus eine Kopfzeile.
+    """
+    total = HEADER_BYTES
+    with input_path.open("rb") as f:
+        f.seek(offset)
+        for _ in range(max_lines + 1):  # +1: Kopfzeile der Eingabe
+            line = f.readline()
+            if not line:
+                break
+            total += len(line) + LINE_SUFFIX_BYTES
+    return total
+
+
+def truncate_sinks(sizes: Dict[str, int], max_growth: int) -> Dict[str, int]:
+    """
+    Kürzt Sinks, die seit dem Checkpoint gewachsen sind, auf die gespeicherte Größe.
+    Ist ein Sink um mehr als 'max_growth' Bytes gewachsen, wird nichts gekürzt
+    (ValueError): fremde Zeilen anderer Schreiber blieben sonst nicht erhalten.
+    Liefert {pfad: entfernte_bytes} für die Meldung.
+    """
+    grown = {}
+    for p, size in sizes.items():
+        try:
+            current = os.path.getsize(p)
+        except FileNotFoundError:
+            continue
+        if current > size:
+            grown[p] = (size, current - size)
+    foreign = {p: n for p, (_, n) in grown.items() if n > max_growth}
+    if foreign:
+        detail = ", ".join(f"{p} (+{n} Bytes)" for p, n in foreign.items())
+        raise ValueError(f"Sinks stärker gewachsen als dieser Lauf (max. {max_growth} Bytes): {detail}")
+    for p, (size, _) in grown.items():
+        os.truncate(p, size)
+    return {p: n for p, (_, n) in grown.items()}
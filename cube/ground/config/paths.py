@@ -6,6 +6,8 @@ Alle Pfade verweisen auf das zentrale Verzeichnis:
     data/{raw, processed, rejected, archive}
 
 Wird von receiver.py, verify.py und plot.py importiert.
+Der Import hat keine Seiteneffekte (kein mkdir) – Verzeichnisse werden
+erst beim ersten Schreiben angelegt (receiver.ensure_parent).
 """
 
 from pathlib import Path
@@ -19,7 +21,6 @@ ROOT_DIR = Path(__file__).resolve().parents[3]
 
 # Hauptordner für Daten
 DATA_DIR = ROOT_DIR / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # ------------------------------------------------------------
 # 📂 Standardpfade
@@ -28,7 +29,12 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 RAW_PATH = DATA_DIR / "raw" / "telemetry.csv"                # ungeprüfte Rohdaten (Receiver-Eingang)
 PROC_PATH = DATA_DIR / "processed" / "telemetry.csv"         # verifizierte, gültige Daten
 REJ_PATH = DATA_DIR / "rejected" / "telemetry_rejected.csv"  # verworfene Datensätze (Signatur ungültig)
+ANOM_PATH = DATA_DIR / "anomalies" / "telemetry_anomalies.csv"  # signiert, aber physikalisch unplausibel
 ARCHIVE_DIR = DATA_DIR / "archive"                           # für alte Missionen / Backups
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"                    # Fortschritt von receiver.py --file
+PROFILE_DIR = DATA_DIR / "profiles"                          # --profile cpu|mem (receiver.py, plot.py)
+CACHE_DIR = DATA_DIR / "cache"                               # geparste CSVs (plot.py --glob), jederzeit löschbar
+LINK_METRICS_PATH = DATA_DIR / "metrics" / "link_quality.json"  # Verlust/Bursts/Umordnung je Link (receiver.py)
 
 # CSV-Kopfzeile (wird bei Bedarf automatisch hinzugefügt)
-CSV_HEADER = "ts,temperature_c,humidity_pct,pressure_hpa,mode,sig"
+CSV_HEADER = "ts,temperature_c,humidity_pct,pressure_hpa,mode,seq,sig"
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+dashboard.py – Lokales Web-Dashboard: Live-Telemetrie + Sicherheitszustand per SSE
+
+Aufbau:
+  • Ein gemeinsamer Tailer-Thread liest nur neue, vollständige Zeilen aus
+    PROC_PATH (Telemetrie) und dem Security-Audit (JSONL) – unabhängig von
+    der Zahl der Browser. Rotation/Kürzung wird erkannt (inode/Größe).
+  • Beim Start werden nur die letzten --tail-mb je Datei gelesen.
+  • Jeder Browser verbindet sich per Server-Sent Events (/events):
+      event: history – heruntergerechnete Historie (höchstens --history-points
+                       Punkte je Reihe) plus Sicherheits-Buckets und Lockout
+      event: delta   – danach nur neue Punkte/geänderte Buckets (große
+                       Nachschübe, z. B. Replays, ebenfalls heruntergerechnet)
+    Jede Änderung trägt eine laufende Nummer ("seq"); die Historie nennt den
+    Stand, den sie enthält. Deltas mit seq <= Historien-seq verwirft der
+    Browser (abonniert wird vor dem Erstellen der Historie, damit nichts fehlt).
+    Langsame Clients werden getrennt statt den Tailer aufzuhalten; der
+    Browser verbindet sich selbst neu und erhält wieder die Historie.
+  • Sicherheit: Verify-Ergebnisse je BUCKET_SECONDS (ok/Fehler/Gründe →
+    Reject-Rate), admission_shed, Lockout (Ende, Auslöser) aus dem Audit.
+
+Läuft vollständig offline: nur Standardbibliothek, HTML/JS/Canvas inline,
+Standard-Bindung 127.0.0.1.
+
+Aufruf:
+    python -m cube.ground.dashboard [--port 8765] [--csv data/processed/telemetry.csv]
+                                    [--audit logs/security_audit.jsonl]
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import contextlib
+import json
+import math
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+BUCKET_SECONDS = 10          # Auflösung der Sicherheits-Reihen
+SECURITY_BUCKETS = 360       # 1 h Sicherheitsverlauf
+TELEMETRY_POINTS = 50_000    # Ringpuffer der Telemetrie im Speicher
+DELTA_POINTS = 500           # größere Nachschübe werden heruntergerechnet
+CLIENT_QUEUE = 64            # Nachrichten-Puffer pro Browser
+KEEPALIVE_SECONDS = 15.0
+
+
+class FileTailer:
+    """Liefert neue vollständige Zeilen einer wachsenden Datei (robust gegen Rotation)."""
+
+    def __init__(self, path: Path, tail_bytes: int):
+        self.path = Path(path)
+        self.tail_bytes = tail_bytes
+        self._inode: Optional[int] = None
+        self._offset = 0
+        self._partial = b""
+
+    def read_new(self) -> List[str]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return []
+        skip_first = False
+        if self._inode != st.st_ino or st.st_size < self._offset:
+            # Erstes Öffnen, Rotation oder Kürzung: nur das Ende lesen
+            self._inode = st.st_ino
+            self._offset = max(0, st.st_size - self.tail_bytes)
+            self._partial = b""
+            skip_first = self._offset > 0
+        if st.st_size == self._offset:
+            return []
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            data = f.read(st.st_size - self._offset)
+        self._offset += len(data)
+        data = self._partial + data
+        lines = data.split(b"\n")
+        self._partial = lines.pop()  # unvollständige letzte Zeile aufheben
+        if skip_first and lines:
+            lines.pop(0)  # mitten in einer Zeile begonnen
+        return [ln.decode("utf-8", "replace") for ln in lines if ln.strip()]
+
+
+def _downsample(ts: List[float], series: Dict[str, List[float]], points: int) -> Tuple[List[float], Dict[str, List[float]]]:
+    """Mittelwert je Block (letzter Zeitstempel des Blocks), höchstens 'points' Punkte."""
+    n = len(ts)
+    if n <= points:
+        return ts, series
+    step = n / points
+    out_ts: List[float] = []
+    out = {k: [] for k in series}
+    for i in range(points):
+        a, b = int(i * step), int((i + 1) * step)
+        out_ts.append(ts[b - 1])
+        for k, values in series.items():
+            chunk = values[a:b]
+            out[k].append(round(sum(chunk) / len(chunk), 3))
+    return out_ts, out
+
+
+class DashboardState:
+    """Telemetrie-Ringpuffer und Sicherheits-Buckets; erzeugt History- und Delta-Nachrichten."""
+
+    def __init__(self, history_points: int):
+        from cube.ground.packet import parse_ts
+
+        self._parse_ts = parse_ts
+        self.history_points = history_points
+        self.telemetry: Deque[Tuple[float, float, float, float]] = collections.deque(maxlen=TELEMETRY_POINTS)
+        self.buckets: "collections.OrderedDict[int, Dict]" = collections.OrderedDict()
+        self.lockout: Dict = {}
+        self.totals = {"ok": 0, "fail": 0, "shed": 0, "lockouts": 0}
+        self.seq = 0  # Nummer der letzten Änderung (Historie/Delta)
+        self._lock = threading.Lock()
+
+    # ---- Einlesen (nur Tailer-Thread, unter self._lock) ----
+
+    def _add_telemetry(self, lines: List[str]) -> List[Tuple[float, float, float, float]]:
+        new = []
+        for line in lines:
+            fields = line.split(",", 4)
+            if len(fields) < 5 or fields[0].lower() == "ts":
+                continue
+            ts = self._parse_ts(fields[0])
+            try:
+                point = (ts, float(fields[1]), float(fields[2]), float(fields[3]))
+            except ValueError:
+                continue
+            # nan/inf (z. B. --anomaly-action tag, Altbestand) wären kein gültiges JSON
+            if ts is not None and all(math.isfinite(v) for v in point):
+                new.append(point)
+        self.telemetry.extend(new)
+        return new
+
+    def _add_audit(self, lines: List[str]) -> Tuple[List[int], bool]:
+        """Liefert (geänderte Bucket-Zeiten, Lockout geändert)."""
+        changed: Set[int] = set()
+        lockout_changed = False
+        for line in lines:
+            try:
+                rec = json.loads(line)
+                event, ts = rec["event"], float(rec["ts"])
+                meta = rec.get("meta")
+                meta = meta if isinstance(meta, dict) else {}
+                key = int(ts // BUCKET_SECONDS) * BUCKET_SECONDS  # nan/inf → ValueError/OverflowError
+                shed = int(meta.get("packets", 0)) if event == "admission_shed" else 0
+            except (ValueError, KeyError, TypeError, AttributeError, OverflowError):
+                continue
+            if event == "lockout_enabled":
+                until = meta.get("until")
+                if not (isinstance(until, (int, float)) and math.isfinite(until)):
+                    until = None
+                self.lockout = {"since": ts, "until": until, "trigger": str(rec.get("reason")),
+                                "clock": str(meta.get("clock", "wall"))}
+                self.totals["lockouts"] += 1
+                lockout_changed = True
+                continue
+            if event not in ("verify_result", "admission_shed"):
+                continue
+            bucket = self.buckets.get(key)
+            if bucket is None:
+                bucket = self.buckets[key] = {"ok": 0, "fail": 0, "shed": 0, "reasons": {}}
+                while len(self.buckets) > SECURITY_BUCKETS:
+                    self.buckets.popitem(last=False)
+            if event == "admission_shed":
+                bucket["shed"] += shed
+                self.totals["shed"] += shed
+            elif rec.get("ok"):
+                bucket["ok"] += 1
+                self.totals["ok"] += 1
+            else:
+                bucket["fail"] += 1
+                self.totals["fail"] += 1
+                reason = str(rec.get("reason"))
+                bucket["reasons"][reason] = bucket["reasons"].get(reason, 0) + 1
+            changed.add(key)
+        return sorted(changed), lockout_changed
+
+    # ---- Nachrichten ----
+
+    def _telemetry_msg(self, points, limit: int) -> Dict:
+        ts = [p[0] for p in points]
+        series = {"temperature": [p[1] for p in points], "humidity": [p[2] for p in points],
+                  "pressure": [p[3] for p in points]}
+        ts, series = _downsample(ts, series, limit)
+        return {"ts": ts, **series}
+
+    def _security_msg(self, keys) -> Dict:
+        return {"buckets": [[k, *(self.buckets[k][f] for f in ("ok", "fail", "shed")), self.buckets[k]["reasons"]]
+                            for k in keys if k in self.buckets],
+                "lockout": self.lockout, "totals": dict(self.totals)}
+
+    def history(self) -> Dict:
+        with self._lock:
+            return {"seq": self.seq, "bucket_seconds": BUCKET_SECONDS,
+                    "telemetry": self._telemetry_msg(list(self.telemetry), self.history_points),
+                    "security": self._security_msg(list(self.buckets))}
+
+    def ingest(self, csv_lines: List[str], audit_lines: List[str]) -> Optional[Dict]:
+        """
+        Übernimmt neue Zeilen beider Dateien als eine Änderung (eigene seq) und
+        liefert das zugehörige Delta – None, wenn sich nichts geändert hat.
+        Atomar gegenüber history(): ein Delta ist ganz oder gar nicht enthalten.
+        """
+        with self._lock:
+            points = self._add_telemetry(csv_lines)
+            changed, lockout_changed = self._add_audit(audit_lines)
+            if not (points or changed or lockout_changed):
+                return None
+            self.seq += 1
+            return {"seq": self.seq,
+                    "telemetry": self._telemetry_msg(points, DELTA_POINTS),
+                    "security": self._security_msg(changed)}
+
+
+class Hub:
+    """Verteilt Nachrichten an alle verbundenen Browser (eine Queue pro Client)."""
+
+    def __init__(self):
+        self._clients: Set[queue.Queue] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> queue.Queue:
+        q: queue.Queue = queue.Queue(maxsize=CLIENT_QUEUE)
+        with self._lock:
+            self._clients.add(q)
+        return q
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            self._clients.discard(q)
+
+    def publish(self, payload: str) -> None:
+        with self._lock:
+            clients = list(self._clients)
+        for q in clients:
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                # Zu langsam: trennen (None), Browser verbindet neu und bekommt die Historie
+                self.unsubscribe(q)
+                with contextlib.suppress(queue.Empty, queue.Full):
+                    q.get_nowait()
+                    q.put_nowait(None)
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+
+def tail_loop(state: DashboardState, hub: Hub, csv_tail: FileTailer, audit_tail: FileTailer,
+              poll: float, stop: threading.Event) -> None:
+    """Einziger Leser beider Dateien; veröffentlicht Deltas nur bei Änderungen."""
+    while not stop.wait(poll):
+        try:
+            delta = state.ingest(csv_tail.read_new(), audit_tail.read_new())
+        except OSError as e:
+            print(f"[DASH] Lesefehler: {e}")
+            continue
+        if delta is not None:
+            hub.publish(_sse("delta", delta))
+
+
+def _json(data: Dict) -> str:
+    """Striktes JSON (allow_nan=False): NaN/Infinity würde JSON.parse im Browser brechen."""
+    return json.dumps(data, separators=(",", ":"), allow_nan=False)
+
+
+def _sse(event: str, data: Dict) -> str:
+    return f"event: {event}\ndata: {_json(data)}\n\n"
+
+
+def make_handler(state: DashboardState, hub: Hub):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, fmt, *args):  # keine Zeile pro Request
+            pass
+
+        def do_GET(self):
+            if self.path in ("/", "/index.html"):
+                body = INDEX_HTML.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/state":
+                body = _json(state.history()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif self.path == "/events":
+                self._stream()
+            else:
+                self.send_error(404)
+
+        def _stream(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "keep-alive")
+            self.end_headers()
+            # Erst abonnieren, dann Historie: kein Delta geht zwischen beiden verloren
+            q = hub.subscribe()
+            try:
+                self.wfile.write(("retry: 2000\n" + _sse("history", state.history())).encode("utf-8"))
+                self.wfile.flush()
+                while True:
+                    try:
+                        msg = q.get(timeout=KEEPALIVE_SECONDS)
+                    except queue.Empty:
+                        msg = ": keepalive\n\n"
+                    if msg is None:
+                        break
+                    self.wfile.write(msg.encode("utf-8"))
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                hub.unsubscribe(q)
+                self.close_connection = True
+
+    return Handler
+
+
+def _default_audit_path(policy_path: str) -> Path:
+    """audit_log_path aus der Policy (wie der SecurityManager), sonst Standard."""
+    try:
+        from ground_station.security_manager import load_policy
+        return Path(load_policy(policy_path).get("audit_log_path") or "logs/security_audit.jsonl")
+    except Exception:
+        return Path("logs/security_audit.jsonl")
+
+
+def main() -> int:
+    from cube.ground.config.paths import PROC_PATH
+
+    parser = argparse.ArgumentParser(description="Lokales Web-Dashboard (SSE) für Telemetrie und Sicherheitszustand")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind-Adresse (Standard: nur lokal)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--csv", type=Path, default=PROC_PATH, help="Telemetrie-CSV (Standard: PROC_PATH)")
+    parser.add_argument("--audit", type=Path, default=None, help="Security-Audit JSONL (Standard: aus der Policy)")
+    parser.add_argument("--security-policy", default="configs/security_policy.yaml")
+    parser.add_argument("--history-points", type=int, default=600, help="Punkte je Reihe beim Verbinden")
+    parser.add_argument("--poll", type=float, default=0.5, help="Prüfintervall der Dateien in Sekunden")
+    parser.add_argument("--tail-mb", type=float, default=8.0, help="beim Start höchstens so viel vom Dateiende lesen")
+    args = parser.parse_args()
+
+    audit_path = args.audit or _default_audit_path(args.security_policy)
+    tail_bytes = int(args.tail_mb * 2 ** 20)
+    state = DashboardState(args.history_points)
+    hub = Hub()
+    csv_tail, audit_tail = FileTailer(args.csv, tail_bytes), FileTailer(audit_path, tail_bytes)
+    state.ingest(csv_tail.read_new(), audit_tail.read_new())
+
+    stop = threading.Event()
+    threading.Thread(target=tail_loop, args=(state, hub, csv_tail, audit_tail, args.poll, stop),
+                     name="dashboard-tail", daemon=True).start()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state, hub))
+    server.daemon_threads = True
+    print(f"[DASH] http://{args.host}:{args.port}/  (Telemetrie: {args.csv}, Audit: {audit_path})")
+    try:
+        server.serve_forever(poll_interval=0.5)
+    except KeyboardInterrupt:
+        print("\n[DASH] beendet.")
+    finally:
+        stop.set()
+        server.server_close()
+    return 0
+
+
+INDEX_HTML = """<!DOCTYPE html>
+<html lang="de"><head><meta charset="utf-8"><title>CubeSat Bodenstation</title>
+<style>
+body{font-family:system-ui,sans-serif;margin:0;background:#0d1117;color:#c9d1d9}
+header{display:flex;gap:1.5em;align-items:center;padding:.6em 1em;background:#161b22}
+#lock{padding:.2em .7em;border-radius:4px;font-weight:bold}
+.ok{background:#238636}.locked{background:#da3633}.off{background:#6e7681}
+main{display:grid;grid-template-columns:repeat(auto-fit,minmax(420px,1fr));gap:1em;padding:1em}
+figure{margin:0;background:#161b22;border-radius:6px;padding:.5em}
+figcaption{font-size:.9em;margin-bottom:.3em}canvas{width:100%;height:200px}
+small{color:#8b949e}
+</style></head><body>
+<header><strong>CubeSat Bodenstation</strong><span id="lock" class="off">verbinde …</span>
+<span id="totals"></span><small id="conn"></small></header>
+<main>
+<figure><figcaption>Temperatur [°C] <small id="v-temperature"></small></figcaption><canvas id="temperature"></canvas></figure>
+<figure><figcaption>Luftfeuchtigkeit [%] <small id="v-humidity"></small></figcaption><canvas id="humidity"></canvas></figure>
+<figure><figcaption>Luftdruck [hPa] <small id="v-pressure"></small></figcaption><canvas id="pressure"></canvas></figure>
+<figure><figcaption>Reject-Rate [%] je Intervall <small id="reasons"></small></figcaption><canvas id="rejects"></canvas></figure>
+</main>
+<script>
+const MAX_POINTS = 2000, SERIES = ["temperature", "humidity", "pressure"];
+let tel = {ts: [], temperature: [], humidity: [], pressure: []}, buckets = new Map(), sec = {}, bucketSeconds = 10;
+
+function draw(id, xs, ys, color, bars) {
+  const c = document.getElementById(id), dpr = window.devicePixelRatio || 1;
+  c.width = c.clientWidth * dpr; c.height = c.clientHeight * dpr;
+  const g = c.getContext("2d"); g.clearRect(0, 0, c.width, c.height);
+  if (!ys.length) return;
+  let lo = Math.min(...ys), hi = Math.max(...ys);
+  if (bars) { lo = 0; hi = Math.max(hi, 1); } else if (hi === lo) { hi += 1; lo -= 1; }
+  const x0 = xs[0], x1 = Math.max(xs[xs.length - 1], x0 + 1), pad = 30 * dpr;
+  const X = x => pad + (x - x0) / (x1 - x0) * (c.width - pad - 4), Y = y => c.height - 14 * dpr - (y - lo) / (hi - lo) * (c.height - 24 * dpr);
+  g.fillStyle = "#8b949e"; g.font = (10 * dpr) + "px sans-serif";
+  g.fillText(hi.toFixed(1), 2, 10 * dpr); g.fillText(lo.toFixed(1), 2, c.height - 14 * dpr);
+  g.fillText(new Date(x0 * 1000).toLocaleTimeString() + " – " + new Date(x1 * 1000).toLocaleTimeString(), pad, c.height - 2);
+  g.strokeStyle = g.fillStyle = color; g.lineWidth = 1.5 * dpr; g.beginPath();
+  ys.forEach((y, i) => {
+    if (bars) { g.fillRect(X(xs[i]), Y(y), Math.max(1, (c.width - pad) / ys.length - 1), Y(lo) - Y(y)); }
+    else if (i) g.lineTo(X(xs[i]), Y(y)); else g.moveTo(X(xs[i]), Y(y));
+  });
+  if (!bars) g.stroke();
+}
+
+function render() {
+  const colors = {temperature: "#f78166", humidity: "#58a6ff", pressure: "#3fb950"};
+  for (const s of SERIES) {
+    draw(s, tel.ts, tel[s], colors[s], false);
+    const v = tel[s][tel[s].length - 1]; document.getElementById("v-" + s).textContent = v === undefined ? "" : v.toFixed(2);
+  }
+  const keys = [...buckets.keys()].sort((a, b) => a - b), rates = [], reasons = {};
+  for (const k of keys) {
+    const [ok, fail, shed, rs] = buckets.get(k); rates.push(ok + fail ? 100 * fail / (ok + fail) : 0);
+    for (const r in rs) reasons[r] = (reasons[r] || 0) + rs[r];
+  }
+  draw("rejects", keys, rates, "#d29922", true);
+  document.getElementById("reasons").textContent = Object.entries(reasons).map(([r, n]) => r + "=" + n).join(" ");
+  const t = sec.totals || {}, lock = sec.lockout || {}, el = document.getElementById("lock");
+  const locked = lock.until && (lock.clock === "event" ? null : lock.until > Date.now() / 1000);
+  el.className = locked ? "locked" : "ok";
+  el.textContent = locked ? "LOCKOUT bis " + new Date(lock.until * 1000).toLocaleTimeString() + " (" + lock.trigger + ")"
+                 : (lock.until && lock.clock === "event" ? "letzter Lockout: " + lock.trigger + " (Paketzeit)" : "kein Lockout");
+  document.getElementById("totals").textContent = "ok " + (t.ok || 0) + " · abgelehnt " + (t.fail || 0) +
+    " · verworfen (Rate) " + (t.shed || 0) + " · Lockouts " + (t.lockouts || 0);
+}
+
+function apply(msg, replace) {
+  if (replace) { tel = {ts: [], temperature: [], humidity: [], pressure: []}; buckets = new Map(); }
+  const m = msg.telemetry;
+  for (const k of ["ts", ...SERIES]) { tel[k].push(...m[k]); if (tel[k].length > MAX_POINTS) tel[k].splice(0, tel[k].length - MAX_POINTS); }
+  for (const [k, ok, fail, shed, rs] of msg.security.buckets) buckets.set(k, [ok, fail, shed, rs]);
+  const keep = [...buckets.keys()].sort((a, b) => a - b).slice(-360); for (const k of buckets.keys()) if (!keep.includes(k)) buckets.delete(k);
+  sec = msg.security; render();
+}
+
+const es = new EventSource("/events");
+let lastSeq = 0;  // Stand der Historie: ältere Deltas sind darin schon enthalten
+es.addEventListener("history", e => { const m = JSON.parse(e.data); bucketSeconds = m.bucket_seconds; lastSeq = m.seq; apply(m, true);
+  document.getElementById("conn").textContent = "verbunden"; });
+es.addEventListener("delta", e => { const m = JSON.parse(e.data); if (m.seq <= lastSeq) return; lastSeq = m.seq; apply(m, false); });
+es.onerror = () => { document.getElementById("conn").textContent = "getrennt – verbinde neu …"; };
+setInterval(render, 5000);  // Lockout-Ende auch ohne neue Daten anzeigen
+window.addEventListener("resize", render);
+</script></body></html>
+"""
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+keyring.py – HMAC-Schlüsselbund mit Schlüssel-IDs (Schlüsselwechsel ohne Ausfall)
+
+Pakete tragen die Schlüssel-ID vor der Signatur im letzten Feld:
+
+    …,mode,seq,k2:9f3a…(64 Hex)      → Schlüssel "k2"
+    …,mode,seq,9f3a…                 → Standardschlüssel (alte Firmware)
+
+Die ID ist nicht mitsigniert – eine verfälschte ID wählt nur einen anderen
+Schlüssel, und die Prüfung schlägt fehl. Der Verifier schlägt den Eintrag per
+Dict in O(1) nach; jeder Eintrag hält den vorberechneten HMAC-Zustand
+(inner/outer SHA-256 nach dem Key-Padding), pro Paket bleiben zwei
+Hash-Kopien statt einer kompletten Schlüsselaufbereitung.
+
+Datei (Standard cube/ground/config/keyring.json, Rechte 0600):
+
+    {
+      "default_key_id": "k1",
+      "keys": [
+        {"id": "k1", "secret_hex": "…", "not_before": null, "not_after": "2026-11-01T00:00:00Z"},
+        {"id": "k2", "secret_hex": "…", "not_before": "2026-10-25T00:00:00Z", "not_after": null}
+      ]
+    }
+
+Gültigkeit (not_before/not_after) wird gegen den signierten Paket-Zeitstempel
+geprüft: Dumps, die erst nach dem Wechsel heruntergeladen werden, bleiben
+gültig. Ohne Zeitstempel gilt die Wanduhr. "revoked": true sperrt sofort.
+
+Änderungen an der Datei werden ohne Neustart übernommen (mtime/size höchstens
+alle 'reload_seconds' geprüft); eine ungültige Datei wird verworfen, der
+bisherige Stand bleibt aktiv. Fehlt die Datei, gilt wie bisher ein einzelner
+Schlüssel aus HMAC_SECRET_HEX bzw. config/ground.json.
+
+Verwaltung (schreibt atomar, der laufende Receiver lädt nach):
+    python -m cube.ground.keyring list
+    python -m cube.ground.keyring add k2 --generate --not-before 2026-10-25T00:00:00Z
+    python -m cube.ground.keyring set-default k2
+    python -m cube.ground.keyring retire k1 --at 2026-11-01T00:00:00Z
+    python -m cube.ground.keyring revoke k1
+"""
+
+from __future__ import annotations
+
+import argparse
+import binascii
+import datetime
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+KEY_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,16}$")
+_BLOCK = hashlib.sha256().block_size
+
+# Verify-Ergebnisse (Gründe für SecurityManager/REJECTED)
+OK = "ok"
+INVALID_SIGNATURE = "invalid_signature"
+UNKNOWN_KEY_ID = "unknown_key_id"
+KEY_NOT_VALID = "key_not_valid"
+
+
+def _parse_time(value: Any) -> Optional[float]:
+    """ISO-8601 (Z erlaubt) oder Unix-Zeit → Unix-Zeit; None/"" → unbegrenzt."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace("Z", "+00:00")
+    dt = datetime.datetime.fromisoformat(text)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _format_time(ts: Optional[float]) -> Optional[str]:
+    if ts is None:
+        return None
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+class KeyEntry:
+    """Ein Schlüssel mit Gültigkeitsfenster und vorberechnetem HMAC-SHA256-Zustand."""
+
+    __slots__ = ("key_id", "not_before", "not_after", "revoked", "_inner", "_outer")
+
+    def __init__(self, key_id: str, secret_hex: str, not_before: Optional[float] = None,
+                 not_after: Optional[float] = None, revoked: bool = False):
+        self.key_id = key_id
+        self.not_before = not_before
+        self.not_after = not_after
+        self.revoked = revoked
+        key = binascii.unhexlify(secret_hex.strip())
+        if len(key) > _BLOCK:
+            key = hashlib.sha256(key).digest()
+        key = key.ljust(_BLOCK, b"\0")
+        # HMAC = H((K ^ opad) || H((K ^ ipad) || m)); die Key-Blöcke sind je Schlüssel konstant
+        self._inner = hashlib.sha256(bytes(b ^ 0x36 for b in key))
+        self._outer = hashlib.sha256(bytes(b ^ 0x5C for b in key))
+
+    def digest(self, payload) -> bytes:
+        inner = self._inner.copy()
+        inner.update(payload)
+        outer = self._outer.copy()
+        outer.update(inner.digest())
+        return outer.digest()
+
+    def valid_at(self, ts: float) -> bool:
+        if self.revoked:
+            return False
+        if self.not_before is not None and ts < self.not_before:
+            return False
+        return self.not_after is None or ts < self.not_after
+
+
+def parse_keyring(doc: Any) -> Tuple[Dict[str, KeyEntry], Optional[str]]:
+    """Validiert den Datei-Inhalt; liefert ({id: KeyEntry}, default_key_id). Wirft ValueError."""
+    if not isinstance(doc, dict) or not isinstance(doc.get("keys"), list):
+        raise ValueError("Schlüsselbund braucht ein Objekt mit Liste 'keys'")
+    keys: Dict[str, KeyEntry] = {}
+    for raw in doc["keys"]:
+        try:
+            key_id = str(raw["id"])
+            if not KEY_ID_RE.match(key_id):
+                raise ValueError(f"ungültige Schlüssel-ID {key_id!r} (1–16 Zeichen A-Z a-z 0-9 _ -)")
+            if key_id in keys:
+                raise ValueError(f"Schlüssel-ID {key_id!r} doppelt")
+            keys[key_id] = KeyEntry(key_id, str(raw["secret_hex"]), _parse_time(raw.get("not_before")),
+                                    _parse_time(raw.get("not_after")), bool(raw.get("revoked", False)))
+        except (KeyError, TypeError, binascii.Error) as e:
+            raise ValueError(f"ungültiger Schlüsseleintrag: {e!r}")
+    default = doc.get("default_key_id")
+    if default is not None and default not in keys:
+        raise ValueError(f"default_key_id {default!r} ist nicht im Schlüsselbund")
+    return keys, default
+
+
+class Keyring:
+    """
+    Schlüssel nach ID mit Hot-Reload. check() ist der Hot-Path: ein
+    monotonic()-Vergleich, ein Dict-Zugriff, zwei Hash-Kopien.
+    """
+
+    def __init__(self, path: Path, legacy_secret: Callable[[], Tuple[str, str]], reload_seconds: float = 5.0):
+        self.path = Path(path)
+        self.reload_seconds = reload_seconds
+        self._legacy_secret = legacy_secret
+        self._keys: Dict[str, KeyEntry] = {}
+        self._default: Optional[KeyEntry] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._next_check = 0.0
+        self._loaded = False
+
+    def check(self, key_id: Optional[str], ts: Optional[float], payload, mac: bytes) -> str:
+        """Prüft eine Signatur; liefert ok / unknown_key_id / key_not_valid / invalid_signature."""
+        if not self._loaded or time.monotonic() >= self._next_check:
+            self.maybe_reload()
+        entry = self._keys.get(key_id) if key_id is not None else self._default
+        if entry is None:
+            return UNKNOWN_KEY_ID
+        if not entry.valid_at(ts if ts is not None else time.time()):
+            return KEY_NOT_VALID
+        return OK if hmac.compare_digest(entry.digest(payload), mac) else INVALID_SIGNATURE
+
+    def authentic(self, key_id: Optional[str], payload, mac: bytes) -> bool:
+        """Nur die Signatur prüfen (ohne Gültigkeitsfenster, widerrufen = nie echt)."""
+        if not self._loaded or time.monotonic() >= self._next_check:
+            self.maybe_reload()
+        entry = self._keys.get(key_id) if key_id is not None else self._default
+        return entry is not None and not entry.revoked and hmac.compare_digest(entry.digest(payload), mac)
+
+    def key_ids(self) -> List[str]:
+        return sorted(self._keys)
+
+    def known(self, key_id: str) -> bool:
+        """True, wenn die Schlüssel-ID im Schlüsselbund steht (billig, pro Paket)."""
+        if not self._loaded:
+            self.maybe_reload()
+        return key_id in self._keys
+
+    def maybe_reload(self) -> bool:
+        """Lädt die Datei neu, falls sich (mtime_ns, size) geändert hat. True bei Übernahme."""
+        self._next_check = time.monotonic() + self.reload_seconds
+        try:
+            st = self.path.stat()
+            stamp: Optional[Tuple[int, int]] = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+        if self._loaded and stamp == self._stamp:
+            return False
+
+        if stamp is None:
+            # Kein Schlüsselbund: bisheriger Einzelschlüssel (Fehler wie bisher beim Verify)
+            key_id, secret_hex = self._legacy_secret()
+            entry = KeyEntry(key_id, secret_hex)
+            keys, default = {key_id: entry}, key_id
+        else:
+            try:
+                with self.path.open("r", encoding="utf-8") as f:
+                    keys, default = parse_keyring(json.load(f))
+            except (OSError, ValueError) as e:
+                self._stamp = stamp  # fehlerhaften Stand nur einmal melden
+                if not self._loaded:
+                    raise
+                print(f"[KEYRING] Reload abgelehnt ({e}) – bisherige Schlüssel bleiben aktiv")
+                return False
+
+        self._keys = keys
+        self._default = keys.get(default) if default is not None else None
+        self._stamp = stamp
+        if self._loaded or stamp is not None:
+            print(f"[KEYRING] Schlüssel: {', '.join(sorted(keys))} (Standard: {default or '-'})")
+        self._loaded = True
+        return True
+
+
+# ==== Verwaltung (CLI) ==== #
+
+def _read_doc(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {"default_key_id": None, "keys": []}
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_doc(path: Path, doc: Dict[str, Any]) -> None:
+    """Validiert und schreibt atomar (0600) – der Receiver sieht nie eine halbe Datei."""
+    parse_keyring(doc)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(doc, f, indent=2)
+        f.write("\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _find(doc: Dict[str, Any], key_id: str) -> Dict[str, Any]:
+    for raw in doc["keys"]:
+        if raw.get("id") == key_id:
+            return raw
+    raise SystemExit(f"[ERR] Schlüssel {key_id!r} nicht gefunden")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from cube.ground.verify import KEYRING_PATH
+
+    parser = argparse.ArgumentParser(description="HMAC-Schlüsselbund der Bodenstation verwalten")
+    parser.add_argument("--path", type=Path, default=KEYRING_PATH, help="Schlüsselbund-Datei")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("list", help="Schlüssel und Gültigkeit anzeigen (ohne Geheimnisse)")
+    p_add = sub.add_parser("add", help="Schlüssel hinzufügen")
+    p_add.add_argument("key_id")
+    src = p_add.add_mutually_exclusive_group(required=True)
+    src.add_argument("--secret-hex", help="Schlüssel (Hex)")
+    src.add_argument("--generate", action="store_true", help="256-Bit-Schlüssel erzeugen und ausgeben")
+    p_add.add_argument("--not-before", default=None, help="gültig ab (ISO-8601, Paketzeit)")
+    p_add.add_argument("--not-after", default=None, help="gültig bis (ISO-8601, Paketzeit)")
+    p_add.add_argument("--default", action="store_true", help="auch für Pakete ohne Schlüssel-ID verwenden")
+    p_def = sub.add_parser("set-default", help="Standardschlüssel für Pakete ohne Schlüssel-ID")
+    p_def.add_argument("key_id")
+    p_ret = sub.add_parser("retire", help="Gültigkeit enden lassen (not_after)")
+    p_ret.add_argument("key_id")
+    p_ret.add_argument("--at", default=None, help="Ende (ISO-8601, Standard: jetzt)")
+    p_rev = sub.add_parser("revoke", help="Schlüssel sofort sperren (kompromittiert)")
+    p_rev.add_argument("key_id")
+    args = parser.parse_args(argv)
+
+    doc = _read_doc(args.path)
+    if args.cmd == "list":
+        keys, default = parse_keyring(doc)
+        now = time.time()
+        for key_id, e in sorted(keys.items()):
+            state = "gesperrt" if e.revoked else ("gültig" if e.valid_at(now) else "außerhalb")
+            mark = "*" if key_id == default else " "
+            print(f"{mark} {key_id:16s} {state:10s} ab {_format_time(e.not_before) or '-'}  "
+                  f"bis {_format_time(e.not_after) or '-'}")
+        return 0
+
+    if args.cmd == "add":
+        if any(raw.get("id") == args.key_id for raw in doc["keys"]):
+            raise SystemExit(f"[ERR] Schlüssel {args.key_id!r} existiert bereits")
+        secret_hex = secrets.token_hex(32) if args.generate else args.secret_hex
+        doc["keys"].append({
+            "id": args.key_id,
+            "secret_hex": secret_hex,
+            "not_before": _format_time(_parse_time(args.not_before)),
+            "not_after": _format_time(_parse_time(args.not_after)),
+        })
+        if args.default or not doc.get("default_key_id"):
+            doc["default_key_id"] = args.key_id
+        _write_doc(args.path, doc)
+        if args.generate:
+            # Einmalig ausgeben: muss per Uplink in mission.json des OBC (secret_hex + key_id)
+            print(secret_hex, file=sys.stdout)
+    elif args.cmd == "set-default":
+        _find(doc, args.key_id)
+        doc["default_key_id"] = args.key_id
+        _write_doc(args.path, doc)
+    elif args.cmd == "retire":
+        _find(doc, args.key_id)["not_after"] = _format_time(_parse_time(args.at) if args.at else time.time())
+        _write_doc(args.path, doc)
+    elif args.cmd == "revoke":
+        _find(doc, args.key_id)["revoked"] = True
+        _write_doc(args.path, doc)
+    print(f"[KEYRING] {args.cmd} {args.key_id} → {args.path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+linkquality.py – Verlust, Umordnung und Duplikate anhand signierter Sequenznummern
+
+Pro Quelle (Link) wird ein Schiebefenster über die letzten WINDOW Sequenznummern
+als Bitmap gehalten (ein int, konstanter Speicher):
+
+    Bit i gesetzt  ⇔  Sequenznummer (top - i) wurde empfangen
+
+Einordnung einer neuen Nummer s relativ zur höchsten bisher gesehenen (top):
+  • s == top + 1          → ok
+  • s >  top + 1          → seq_gap (Burst von s - top - 1 fehlenden Paketen)
+  • top - WINDOW < s < top, Bit frei   → seq_reorder (füllt eine Lücke, zählt nicht als Verlust)
+  • Bit bereits gesetzt bzw. s == top  → seq_duplicate (signiert → Replay-Verdacht)
+  • s <= top - WINDOW, Abstand klein   → seq_stale (zu alt für das Fenster; zählt als
+                                          verspätet empfangen, nicht als Verlust)
+  • s weit hinter top (> RESET_DISTANCE) → seq_reset (Sender neu gestartet, Fenster neu)
+
+Verlust = erwartete Nummern (top - erste + 1) − eindeutig empfangene.
+Nur verifizierte Pakete werden eingeordnet – unsignierte Nummern sind wertlos.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Optional
+
+WINDOW = 1024                 # Bits im Schiebefenster
+RESET_DISTANCE = 1 << 16      # so weit zurück → Sender-Neustart statt verspätetes Paket
+
+
+class SeqWindow:
+    """Sequenz-Zustand einer Quelle (O(1) Speicher, O(WINDOW/64) pro Paket im Worst Case)."""
+
+    __slots__ = ("top", "bitmap", "first", "received", "duplicates", "reordered",
+                 "stale", "resets", "bursts", "burst_max", "burst_total")
+
+    def __init__(self):
+        self.top: Optional[int] = None
+        self.bitmap = 0
+        self.first = 0
+        self.received = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.stale = 0
+        self.resets = 0
+        self.bursts = 0
+        self.burst_max = 0
+        self.burst_total = 0
+
+    def observe(self, seq: int) -> str:
+        """Ordnet eine Sequenznummer ein; liefert 'ok' oder einen seq_*-Grund."""
+        top = self.top
+        if top is None:
+            self._restart(seq)
+            return "ok"
+
+        d = seq - top
+        if d > 0:
+            self.bitmap = ((self.bitmap << d) | 1) & _MASK if d < WINDOW else 1
+            self.top = seq
+            self.received += 1
+            if d == 1:
+                return "ok"
+            burst = d - 1
+            self.bursts += 1
+            self.burst_total += burst
+            if burst > self.burst_max:
+                self.burst_max = burst
+            return "seq_gap"
+
+        back = -d
+        if back < WINDOW:
+            bit = 1 << back
+            if self.bitmap & bit:
+                self.duplicates += 1
+                return "seq_duplicate"
+            self.bitmap |= bit
+            self.received += 1
+            self.reordered += 1
+            return "seq_reorder"
+        if back > RESET_DISTANCE:
+            self.resets += 1
+            self._restart(seq)
+            return "seq_reset"
+        # Verspätet, aber angekommen: als empfangen zählen (ein Duplikat ist jenseits
+        # des Fensters nicht mehr erkennbar; lost wird in stats() bei 0 gekappt)
+        self.received += 1
+        self.stale += 1
+        return "seq_stale"
+
+    def _restart(self, seq: int) -> None:
+        # Zähler über Neustarts hinweg beibehalten: erwartete Nummern neu basieren
+        expected_so_far = self.expected
+        self.top = seq
+        self.bitmap = 1
+        self.received += 1
+        self.first = seq - expected_so_far
+
+    @property
+    def expected(self) -> int:
+        return 0 if self.top is None else self.top - self.first + 1
+
+    def stats(self) -> Dict[str, float]:
+        expected = self.expected
+        lost = max(expected - self.received, 0)
+        return {
+            "top": self.top,
+            "expected": expected,
+            "received": self.received,
+            "lost": lost,
+            "loss_pct": round(100.0 * lost / expected, 3) if expected else 0.0,
+            "duplicates": self.duplicates,
+            "reordered": self.reordered,
+            "stale": self.stale,
+            "resets": self.resets,
+            "bursts": self.bursts,
+            "burst_max": self.burst_max,
+            "burst_mean": round(self.burst_total / self.bursts, 2) if self.bursts else 0.0,
+        }
+
+
+_MASK = (1 << WINDOW) - 1
+
+
+class LinkQuality:
+    """
+    Sequenz-Fenster pro Link plus periodische Veröffentlichung der Kennzahlen.
+    due() ist billig (ein monotonic()-Vergleich) und darf pro Paket aufgerufen werden.
+    """
+
+    def __init__(self, publish_interval: float = 30.0):
+        self.publish_interval = publish_interval
+        self._links: Dict[str, SeqWindow] = {}
+        self._last_publish = time.monotonic()
+
+    def observe(self, link: str, seq: int) -> str:
+        window = self._links.get(link)
+        if window is None:
+            window = self._links[link] = SeqWindow()
+        return window.observe(seq)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {link: w.stats() for link, w in self._links.items()}
+
+    def pop(self, link: str) -> Optional[Dict[str, float]]:
+        """Entfernt einen abgeschlossenen Link (z. B. fertiger Dump) und liefert seine Kennzahlen."""
+        window = self._links.pop(link, None)
+        return window.stats() if window is not None else None
+
+    def due(self) -> bool:
+        if not self._links:
+            return False
+        now = time.monotonic()
+        if now - self._last_publish < self.publish_interval:
+            return False
+        self._last_publish = now
+        return True
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+loader.py – Paralleles Laden vieler Telemetrie-CSVs (Archive, rotierte Segmente)
+
+Ablauf pro Datei:
+  1) Kopfzeile lesen → Schema A/B auflösen (COL_MAP_CANDIDATES aus plot.py);
+     ohne Kopfzeile (Überflug-Dumps) gilt das Receiver-Format CSV_HEADER
+  2) pd.read_csv nur mit den vier benötigten Spalten (usecols) und festen
+     dtypes (float64 für Messwerte, ts als ISO-8601 in UTC) – keine Typ-Inferenz
+  3) Ergebnis als Binär-Cache (pickle) unter CACHE_DIR ablegen, Schlüssel:
+     Pfad-Hash + Größe + mtime_ns. Unveränderte Dateien werden beim nächsten
+     Mal nur noch aus dem Cache gelesen; veraltete Einträge werden ersetzt.
+
+Dateien ohne Cache-Treffer werden im Prozess-Pool geparst; anschließend wird
+alles zeitlich sortiert zusammengefügt. Spalten im Ergebnis:
+    ts, temperature_norm, humidity_norm, pressure_norm
+
+Der Cache enthält nur lokal erzeugte DataFrames (pickle ist nicht für fremde
+Dateien gedacht) und kann jederzeit gelöscht werden.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import os
+import pathlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CACHE_VERSION = 1
+VALUE_COLUMNS = ("temperature", "humidity", "pressure")
+
+
+def _cache_dir() -> pathlib.Path:
+    from cube.ground.config.paths import CACHE_DIR
+    return CACHE_DIR
+
+
+def _path_key(path: pathlib.Path) -> str:
+    return hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_path_for(path: pathlib.Path, cache_dir: pathlib.Path) -> pathlib.Path:
+    """Cache-Datei für den aktuellen Stand (Größe + mtime_ns) einer CSV."""
+    st = path.stat()
+    return cache_dir / f"{_path_key(path)}-{st.st_size}-{st.st_mtime_ns}-v{CACHE_VERSION}.pkl"
+
+
+def _resolve_header(path: pathlib.Path) -> Tuple[Dict[str, str], Optional[List[str]]]:
+    """
+    Liest nur die erste Zeile und ordnet ts/Temperatur/Feuchte/Druck den
+    Spaltennamen zu. Dateien ohne Kopfzeile (z. B. archivierte Überflug-Dumps)
+    werden mit CSV_HEADER gelesen; dann werden die Spaltennamen mitgeliefert.
+    """
+    from cube.ground.plot import COL_MAP_CANDIDATES
+
+    with path.open("r", encoding="utf-8", newline="") as f:
+        header = next(csv.reader(f), [])
+    names = None
+    if not header or header[0].strip().lower() != "ts":
+        from cube.ground.config.paths import CSV_HEADER
+        header = names = CSV_HEADER.split(",")
+    cols = {c.strip().lower(): c for c in header}
+    resolved = {"ts": cols["ts"]}
+    for canonical, candidates in COL_MAP_CANDIDATES.items():
+        for cand in candidates:
+            if cand in cols:
+                resolved[canonical] = cols[cand]
+                break
+        else:
+            raise SystemExit(
+                f"[ERR] {path}: Erwartete Spalten nicht gefunden.\n"
+                f"- Gesucht: {candidates}\n"
+                f"- Vorhanden: {header}"
+            )
+    return resolved, names
+
+
+def parse_csv(path: pathlib.Path) -> "pd.DataFrame":
+    """Parst eine CSV mit usecols und festen dtypes in das normalisierte Format."""
+    import pandas as pd
+
+    col, names = _resolve_header(path)
+    values = {col[k]: f"{k}_norm" for k in VALUE_COLUMNS}
+    read = dict(usecols=[col["ts"], *values], engine="c")
+    if names:
+        read.update(header=None, names=names)
+    try:
+        df = pd.read_csv(path, dtype={c: "float64" for c in values}, **read)
+    except ValueError:
+        # Nicht-numerische Einträge (z. B. beschädigte Zeilen): als Text lesen und erzwingen
+        df = pd.read_csv(path, dtype=str, **read)
+        for c in values:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    df = df.rename(columns={col["ts"]: "ts", **values})
+    df["ts"] = pd.to_datetime(df["ts"], format="ISO8601", utc=True, errors="coerce")
+    df = df.dropna()
+    if not df["ts"].is_monotonic_increasing:
+        df = df.sort_values("ts", kind="stable")
+    return df[["ts", "temperature_norm", "humidity_norm", "pressure_norm"]].reset_index(drop=True)
+
+
+def load_cached(path: pathlib.Path, cache_dir: Optional[pathlib.Path] = None) -> "pd.DataFrame":
+    """Liefert die geparste CSV aus dem Cache oder parst sie und legt den Cache an."""
+    import pandas as pd
+
+    cache_dir = cache_dir or _cache_dir()
+    target = cache_path_for(path, cache_dir)
+    try:
+        return pd.read_pickle(target)
+    except (OSError, ValueError, EOFError, ImportError, AttributeError):
+        pass
+
+    df = parse_csv(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Veraltete Stände derselben Datei entfernen, dann atomar schreiben
+    for old in cache_dir.glob(f"{_path_key(path)}-*.pkl"):
+        old.unlink(missing_ok=True)
+    tmp = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    df.to_pickle(tmp)
+    os.replace(tmp, target)
+    return df
+
+
+def _load_uncached(path: str, cache_dir: str) -> "pd.DataFrame":
+    """Worker-Einstieg (picklebar) für den Prozess-Pool."""
+    return load_cached(pathlib.Path(path), pathlib.Path(cache_dir))
+
+
+def load_many(
+    sources: Sequence[str],
+    span_sec: Optional[float] = None,
+    jobs: Optional[int] = None,
+    cache_dir: Optional[pathlib.Path] = None,
+) -> "pd.DataFrame":
+    """
+    Lädt mehrere CSVs (Cache-Treffer direkt, Rest parallel) und fügt sie
+    nach Zeitstempel sortiert zusammen. 'span_sec' beschränkt auf das letzte
+    Zeitfenster über alle Dateien.
+    """
+    import pandas as pd
+
+    cache_dir = cache_dir or _cache_dir()
+    paths = [pathlib.Path(s) for s in sources]
+    for p in paths:
+        if not p.exists():
+            raise SystemExit(f"[ERR] Telemetrie-Datei nicht gefunden: {p}")
+
+    frames: Dict[pathlib.Path, pd.DataFrame] = {}
+    misses: List[pathlib.Path] = []
+    for p in paths:
+        target = cache_path_for(p, cache_dir)
+        if target.exists():
+            try:
+                frames[p] = pd.read_pickle(target)
+                continue
+            except (OSError, ValueError, EOFError, ImportError, AttributeError):
+                pass
+        misses.append(p)
+
+    if len(misses) == 1 or jobs == 1:
+        for p in misses:
+            frames[p] = load_cached(p, cache_dir)
+    elif misses:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(_load_uncached, [str(p) for p in misses], [str(cache_dir)] * len(misses))
+            frames.update(zip(misses, results))
+
+    parts = [frames[p] for p in paths if not frames[p].empty]
+    if not parts:
+        return pd.DataFrame(columns=["ts", "temperature_norm", "humidity_norm", "pressure_norm"])
+    df = pd.concat(parts, ignore_index=True)
+    if not df["ts"].is_monotonic_increasing:
+        df = df.sort_values("ts", kind="stable", ignore_index=True)
+    if span_sec:
+        df = df[df["ts"] >= df["ts"].max() - pd.Timedelta(seconds=span_sec)]
+    return df
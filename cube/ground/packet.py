@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+packet.py – Einmaliges, typisiertes Parsen einer Telemetrie-Zeile
+
+Format (siehe CSV_HEADER):
+    ts,temperature_c,humidity_pct,pressure_hpa,mode,seq,sig
+Ältere OBC-Firmware sendet noch ohne 'seq' (6 Felder) → Packet.seq = None.
+Die Sequenznummer liegt vor ',sig' und ist damit mitsigniert.
+Das Feld 'sig' ist "<key_id>:<hmac_hex>" oder – ohne Schlüssel-ID – nur
+"<hmac_hex>" (Packet.key_id = None → Standardschlüssel, siehe keyring.py).
+
+parse_packet() zerlegt die Zeile genau einmal und liefert ein kompaktes
+Packet-Objekt (__slots__), das Verify, SecurityManager-Meta und alle Sinks
+(PROCESSED, Rollups, Plausibilität) gemeinsam nutzen.
+
+Strukturfehler werden früh und billig erkannt – noch vor jeder HMAC-Berechnung:
+  • wrong_field_count – nicht 7 (bzw. 6 ohne seq) Felder
+  • bad_seq           – Sequenznummer keine nicht-negative Ganzzahl
+  • bad_key_id        – Schlüssel-ID leer, zu lang oder mit unzulässigen Zeichen
+  • empty_mac         – Signaturfeld leer
+  • bad_mac_length    – Signatur nicht 64 Hex-Zeichen (SHA-256)
+  • bad_mac_hex       – Signatur kein gültiges Hex
+Nicht-numerische Messwerte oder Zeitstempel sind KEIN Strukturfehler:
+sie werden als NaN bzw. ts=None abgebildet und von der Plausibilität bewertet.
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+from typing import Optional, Tuple
+
+FIELD_COUNT = 7          # mit Sequenznummer
+LEGACY_FIELD_COUNT = 6   # ohne Sequenznummer
+MAC_HEX_LEN = 64  # HMAC-SHA256
+KEY_ID_MAX_LEN = 16
+
+
+class PacketError(ValueError):
+    """Strukturfehler einer Zeile. str(e) ist der Grundcode."""
+
+    def __init__(self, reason: str, packet_id: str = ""):
+        super().__init__(reason)
+        self.reason = reason
+        self.packet_id = packet_id
+
+
+def parse_ts(text: str) -> Optional[float]:
+    """ISO-8601-Zeitstempel → Unix-Zeit (UTC). None bei ungültigem Format."""
+    try:
+        dt = datetime.datetime.fromisoformat(text.strip())
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+class Packet:
+    """Geparste Telemetrie-Zeile (ein Objekt pro Paket, ohne __dict__)."""
+
+    __slots__ = ("line", "packet_id", "ts", "temperature_c", "humidity_pct",
+                 "pressure_hpa", "mode", "seq", "key_id", "mac", "payload")
+
+    def __init__(self, line: str, packet_id: str, ts: Optional[float],
+                 temperature_c: float, humidity_pct: float, pressure_hpa: float,
+                 mode: str, seq: Optional[int], key_id: Optional[str], mac: bytes, payload: memoryview):
+        self.line = line                  # Originalzeile ohne Zeilenende (für Sinks/Forensik)
+        self.packet_id = packet_id        # Zeitstempel-Text wie empfangen
+        self.ts = ts                      # Unix-Zeit oder None
+        self.temperature_c = temperature_c
+        self.humidity_pct = humidity_pct
+        self.pressure_hpa = pressure_hpa
+        self.mode = mode
+        self.seq = seq                    # signierte Sequenznummer oder None (alte Firmware)
+        self.key_id = key_id              # Schlüssel-ID aus 'sig' oder None (Standardschlüssel)
+        self.mac = mac                    # 32 Byte Digest
+        self.payload = payload            # View auf die signierten Bytes (ohne ',sig')
+
+    @property
+    def values(self) -> Tuple[float, float, float]:
+        """(temperature_c, humidity_pct, pressure_hpa)"""
+        return (self.temperature_c, self.humidity_pct, self.pressure_hpa)
+
+
+def parse_packet(line: str) -> Packet:
+    """
+    Zerlegt eine Zeile in ein Packet oder wirft PacketError mit Grundcode.
+    Die Zeile wird genau einmal gesplittet und einmal kodiert.
+    """
+    text = line.rstrip("\r\n")
+    fields = text.split(",")
+    packet_id = fields[0].strip()
+    if len(fields) == FIELD_COUNT:
+        seq_text = fields[5].strip()
+        # isdigit() allein ließe Unicode-Ziffern ("²", "١") durch, an denen int() scheitert
+        if not (seq_text.isascii() and seq_text.isdigit()):
+            raise PacketError("bad_seq", packet_id)
+        seq: Optional[int] = int(seq_text)
+    elif len(fields) == LEGACY_FIELD_COUNT:
+        seq = None
+    else:
+        raise PacketError("wrong_field_count", packet_id)
+
+    sig = fields[-1]
+    key_id, sep, mac_hex = sig.strip().rpartition(":")
+    if sep:
+        bare = key_id.replace("-", "").replace("_", "")
+        if not key_id or len(key_id) > KEY_ID_MAX_LEN or not (bare.isascii() and bare.isalnum()):
+            raise PacketError("bad_key_id", packet_id)
+    else:
+        key_id = None
+    if not mac_hex:
+        raise PacketError("empty_mac", packet_id)
+    if len(mac_hex) != MAC_HEX_LEN:
+        raise PacketError("bad_mac_length", packet_id)
+    try:
+        mac = bytes.fromhex(mac_hex)
+    except ValueError:
+        raise PacketError("bad_mac_hex", packet_id)
+
+    raw = text.encode("utf-8")
+    # Signierte Nutzdaten = alles vor dem letzten Komma
+    payload = memoryview(raw)[: raw.rindex(b",")]
+
+    return Packet(
+        line=text,
+        packet_id=packet_id,
+        ts=parse_ts(fields[0]),
+        temperature_c=_to_float(fields[1]),
+        humidity_pct=_to_float(fields[2]),
+        pressure_hpa=_to_float(fields[3]),
+        mode=fields[4].strip(),
+        seq=seq,
+        key_id=key_id,
+        mac=mac,
+        payload=payload,
+    )
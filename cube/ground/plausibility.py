@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+plausibility.py – Streaming-Plausibilitätsprüfung für signierte Telemetrie
+
+Eine gültige HMAC-Signatur sagt nur, dass die Zeile vom OBC stammt – nicht,
+dass die Messwerte sinnvoll sind. Der PlausibilityScorer prüft jede
+verifizierte Zeile in O(1) Zeit und mit O(1) Zustand pro Kanal:
+
+  • bad_timestamp     – Zeitstempel nicht ISO 8601
+  • non_numeric       – Messwert fehlt, ist kein float oder NaN/inf
+  • out_of_range      – außerhalb des BME280-Messbereichs
+  • implausible_jump  – Abweichung > k·σ vom EWMA-Mittel (nach Warm-up)
+  • stuck_sensor      – alle Kanäle N-mal hintereinander identisch
+
+Anomale Werte fließen nicht in EWMA/Varianz ein (kein „Vergiften“ des Modells).
+Hält ein Sprung länger als 'warmup' Zeilen an, gilt er als echter Niveauwechsel
+und das Modell wird auf die neuen Werte zurückgesetzt.
+
+Modell und Stuck-Zähler gelten pro Datenstrom (Schlüssel, z. B. Link + Key-ID):
+verschränkte Geräte oder Spool-Dateien verfälschen sich nicht gegenseitig. Die
+Zahl der Ströme ist begrenzt (max_streams, der älteste wird verdrängt).
+"""
+
+from __future__ import annotations
+
+import math
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Sequence, Tuple
+
+# BME280-Datenblatt: Betriebsbereich der drei Kanäle
+BME280_BOUNDS: Tuple[Tuple[float, float], ...] = (
+    (-40.0, 85.0),     # temperature_c
+    (0.0, 100.0),      # humidity_pct
+    (300.0, 1100.0),   # pressure_hpa
+)
+
+# Untergrenze für σ je Kanal (verhindert Fehlalarme bei sehr ruhigen Signalen)
+SIGMA_FLOOR: Tuple[float, ...] = (0.5, 2.0, 1.0)
+
+ANOMALY_ACTIONS = ("divert", "tag", "off")
+
+
+class _Ewma:
+    """Exponentiell gewichteter Mittelwert + Varianz (O(1) Zustand)."""
+
+    __slots__ = ("alpha", "mean", "var", "n")
+
+    def __init__(self, alpha: float):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.var = 0.0
+        self.n = 0
+
+    def update(self, x: float) -> None:
+        if self.n == 0:
+            self.mean = x
+        else:
+            diff = x - self.mean
+            incr = self.alpha * diff
+            self.mean += incr
+            self.var = (1.0 - self.alpha) * (self.var + diff * incr)
+        self.n += 1
+
+
+class _Stream:
+    """Modellzustand eines Datenstroms: EWMA je Kanal, letzte Werte, Lauf-Zähler."""
+
+    __slots__ = ("ewma", "last", "same", "jump_run")
+
+    def __init__(self, alpha: float, channels: int):
+        self.ewma = [_Ewma(alpha) for _ in range(channels)]
+        self.last: Optional[Tuple[float, ...]] = None
+        self.same = 0
+        self.jump_run = 0
+
+
+class PlausibilityScorer:
+    """
+    Bewertet verifizierte Pakete und liefert einen Grundcode oder None. Zählt Anomalien pro Grund
+    (gesamt); Modellzustand je Strom-Schlüssel.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        k_sigma: float = 6.0,
+        warmup: int = 10,
+        stuck_threshold: int = 30,
+        bounds: Sequence[Tuple[float, float]] = BME280_BOUNDS,
+        sigma_floor: Sequence[float] = SIGMA_FLOOR,
+        action: str = "divert",
+        max_streams: int = 256,
+    ):
+        self.alpha = alpha
+        self.k_sigma = k_sigma
+        self.warmup = warmup
+        self.stuck_threshold = stuck_threshold
+        self.bounds = tuple(bounds)
+        self.sigma_floor = tuple(sigma_floor)
+        self.action = action
+        self.max_streams = max_streams
+        self._streams: "OrderedDict[Hashable, _Stream]" = OrderedDict()
+        self.counts: Dict[str, int] = {}
+
+    def score_packet(self, pkt, stream: Hashable = None) -> Optional[str]:
+        """Bewertet ein geparstes Packet (cube/ground/packet.py) im Strom 'stream'. None = plausibel."""
+        if pkt.ts is None:
+            return self._count("bad_timestamp")
+        return self.score(pkt.values, stream)
+
+    def score(self, values: Sequence[float], stream: Hashable = None) -> Optional[str]:
+        """Bewertet bereits geparste Messwerte (gleiche Reihenfolge wie BME280_BOUNDS)."""
+        for v, (lo, hi) in zip(values, self.bounds):
+            if not math.isfinite(v):
+                return self._count("non_numeric")
+            if v < lo or v > hi:
+                return self._count("out_of_range")
+
+        st = self._stream(stream)
+        for v, ew, floor in zip(values, st.ewma, self.sigma_floor):
+            if ew.n >= self.warmup:
+                sigma = max(math.sqrt(ew.var), floor)
+                if abs(v - ew.mean) > self.k_sigma * sigma:
+                    st.jump_run += 1
+                    if st.jump_run < self.warmup:
+                        return self._count("implausible_jump")
+                    # Anhaltender Sprung → Niveauwechsel, Modell neu lernen
+                    st.ewma = [_Ewma(self.alpha) for _ in st.ewma]
+                    break
+        st.jump_run = 0
+
+        values = tuple(values)
+        if values == st.last:
+            st.same += 1
+        else:
+            st.last = values
+            st.same = 1
+
+        for v, ew in zip(values, st.ewma):
+            ew.update(v)
+
+        if st.same >= self.stuck_threshold:
+            return self._count("stuck_sensor")
+        return None
+
+    def forget(self, match) -> None:
+        """Entfernt alle Ströme, für deren Schlüssel match(schlüssel) wahr ist (z. B. fertiger Dump)."""
+        for key in [k for k in self._streams if match(k)]:
+            del self._streams[key]
+
+    def _stream(self, key: Hashable) -> _Stream:
+        st = self._streams.get(key)
+        if st is None:
+            st = self._streams[key] = _Stream(self.alpha, len(self.bounds))
+            if len(self._streams) > self.max_streams:
+                self._streams.popitem(last=False)
+        else:
+            self._streams.move_to_end(key)
+        return st
+
+    def _count(self, reason: str) -> str:
+        self.counts[reason] = self.counts.get(reason, 0) + 1
+        return reason
@@ -8,17 +8,54 @@ Funktionen:
   * Schema B: ts,temperature,humidity,pressure,...
 - Zeichnet drei Diagramme (Temperatur / Luftfeuchtigkeit / Luftdruck)
 - Modi: --once (einmalig) oder Live (Standard)
-- Flags: --csv (Pfad), --interval, --window, --save (PNG-Snapshot)
+- Flags: --csv (Pfad), --interval, --window, --save (PNG-Snapshot),
+  --headless (nur Agg-Backend, kein Fenster; für Cron/Batch – automatisch
+  bei --once --save oder ohne Display),
+  --span (Zeitfenster, z. B. 6h / 30d; nutzt Rollups, falls vorhanden),
+  --profile cpu|mem (Laden/Rendern profilieren, siehe cube/ground/profiling.py),
+  --glob (mehrere CSVs parallel laden, mit Binär-Cache, siehe cube/ground/loader.py)
+
+pandas und matplotlib werden erst bei Bedarf importiert (schneller CLI-Start).
 """
 
+from __future__ import annotations
+
 import argparse
+import contextlib
+import os
+import sys
 import time
 import pathlib
-from typing import Tuple, Dict
+from typing import Tuple, Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _import_pandas():
+    """Lazy-Import von pandas."""
+    import pandas as pd
+    return pd
+
+
+def _import_pyplot(headless: bool = False):
+    """
+    Lazy-Import von matplotlib.pyplot.
+    headless=True erzwingt das Agg-Backend, bevor pyplot geladen wird –
+    damit werden keine GUI-Toolkits (Tk/Qt/macOS) importiert.
+    """
+    import matplotlib
+    if headless:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
+
+def _has_display() -> bool:
+    """True, wenn ein Fenster geöffnet werden kann (Linux/BSD: X11 oder Wayland)."""
+    if sys.platform in ("win32", "darwin"):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
 
 
 # Standard: geprüfte Daten (processed) aus dem Projektstamm
@@ -50,16 +87,150 @@ def _resolve_columns(df: pd.DataFrame) -> Dict[str, str]:
     return resolved
 
 
-def load_df(csv_path: pathlib.Path) -> pd.DataFrame:
+# Spalten hinter den Messwerten, die der Plot nicht braucht (Signatur, Sequenznummer)
+_TRAILING_COLUMNS = ("seq", "sig", "mac")
+
+# Mindestanzahl Punkte, die eine Rollup-Auflösung im Zeitfenster liefern muss
+MIN_POINTS = 300
+
+_SPAN_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_span(text: str) -> float:
+    """Zeitfenster wie '90m', '6h', '30d' (oder Sekunden als Zahl) → Sekunden."""
+    text = text.strip().lower()
+    try:
+        if text and text[-1] in _SPAN_UNITS:
+            value = float(text[:-1]) * _SPAN_UNITS[text[-1]]
+        else:
+            value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültiges Zeitfenster: {text!r} (z. B. 90m, 6h, 30d)")
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"Zeitfenster muss positiv sein: {text!r}")
+    return value
+
+
+def _edge_timestamps(path: pathlib.Path, tail_bytes: int = 4096) -> Tuple[float, float] | None:
+    """
+    (erster, jüngster) Zeitstempel einer CSV mit Zeitstempel im ersten Feld,
+    ohne die Datei ganz zu lesen: erste Datenzeile und Maximum der letzten
+    Zeilen (verspätet angehängte Zeilen). None bei leerer/unlesbarer Datei.
+    """
+    from cube.ground.packet import parse_ts
+
+    def ts_of(raw: bytes):
+        return parse_ts(raw.split(b",", 1)[0].decode("utf-8", "replace"))
+
+    try:
+        with path.open("rb") as f:
+            f.readline()  # Kopfzeile
+            first = ts_of(f.readline())
+            size = f.seek(0, os.SEEK_END)
+            f.seek(max(0, size - tail_bytes))
+            tail = f.read().splitlines()[1:]  # erste (evtl. angeschnittene) Zeile verwerfen
+    except OSError:
+        return None
+    stamps = [t for t in map(ts_of, tail) if t is not None]
+    if first is None or not stamps:
+        return None
+    return first, max(stamps)
+
+
+def _rollup_covers(rollup: pathlib.Path, raw: Tuple[float, float], span_sec: float, width: int) -> bool:
+    """
+    True, wenn die Rollup-Datei das angefragte Fenster der Rohdaten abdeckt:
+    erster Bucket nicht nach dem Fensteranfang, letzter höchstens den noch
+    offenen Bucket hinter dem jüngsten Rohdatum (Rollups erst später
+    eingeführt, veraltet oder von einem anderen Lauf → Rohdaten).
+    """
+    edges = _edge_timestamps(rollup)
+    if edges is None:
+        return False
+    first_bucket, last_bucket = edges
+    start = max(raw[0], raw[1] - span_sec)
+    return (first_bucket <= start // width * width
+            and last_bucket >= raw[1] // width * width - width)
+
+
+def _pick_rollup(csv_path: pathlib.Path, span_sec: float, min_points: int) -> pathlib.Path | None:
+    """
+    Wählt die gröbste vorhandene Rollup-Datei, die im Zeitfenster noch
+    mindestens 'min_points' Buckets liefert und das Fenster der Rohdaten
+    abdeckt. None → Rohdaten verwenden.
+    """
+    try:
+        from cube.ground.rollup import RESOLUTIONS, rollup_path
+    except ImportError:
+        return None
+    raw = None
+    for label, width in sorted(RESOLUTIONS.items(), key=lambda kv: kv[1], reverse=True):
+        if span_sec / width >= min_points:
+            path = rollup_path(csv_path, label)
+            if path.exists() and path.stat().st_size > 0:
+                raw = raw or _edge_timestamps(csv_path)
+                if raw is not None and _rollup_covers(path, raw, span_sec, width):
+                    return path
+    return None
+
+
+def _load_rollup(path: pathlib.Path, span_sec: float) -> pd.DataFrame:
+    """
+    Lädt eine Rollup-Datei und führt mehrfach geschriebene Buckets zusammen
+    (Neustarts / verspätete Zeilen). Mittelwerte werden count-gewichtet,
+    'last' stammt aus der Zeile mit dem jüngsten Messwert (last_ts), nicht
+    aus der zuletzt geschriebenen.
+    """
+    from cube.ground.rollup import CHANNELS, ROLLUP_COLUMNS
+
+    pd = _import_pandas()
+    # Feste Spaltennamen: ältere Dateien (Kopfzeile ohne last_ts) bleiben lesbar
+    df = pd.read_csv(path, header=None, skiprows=1, names=ROLLUP_COLUMNS, parse_dates=["bucket_ts"])
+    if df.empty:
+        return df.rename(columns={"bucket_ts": "ts"})
+    # Stabil nach Bucket und last_ts: "last" je Gruppe = jüngster Messwert; Zeilen ohne last_ts zuerst
+    df = df.sort_values(["bucket_ts", "last_ts"], kind="stable", na_position="first")
+
+    agg = {"count": "sum"}
+    for c in CHANNELS:
+        df[f"{c}_wsum"] = df[f"{c}_mean"] * df["count"]
+        agg.update({f"{c}_min": "min", f"{c}_max": "max", f"{c}_wsum": "sum", f"{c}_last": "last"})
+    agg["last_ts"] = "max"
+    df = df.groupby("bucket_ts", sort=True).agg(agg).reset_index()
+    for c in CHANNELS:
+        df[f"{c}_mean"] = df.pop(f"{c}_wsum") / df["count"]
+
+    df = df[df["bucket_ts"] >= df["bucket_ts"].max() - pd.Timedelta(seconds=span_sec)]
+    return df.rename(columns={
+        "bucket_ts": "ts",
+        "temperature_c_mean": "temperature_norm",
+        "humidity_pct_mean": "humidity_norm",
+        "pressure_hpa_mean": "pressure_norm",
+    })
+
+
+def load_df(csv_path: pathlib.Path, span_sec: float | None = None, min_points: int = MIN_POINTS) -> pd.DataFrame:
     """
     Lädt die CSV-Datei, normalisiert Spaltennamen und erzwingt numerische Typen.
     Erwartet eine Spalte 'ts' mit Zeitstempeln (UTC).
+    Mit 'span_sec' wird nur das letzte Zeitfenster geliefert; reicht eine
+    Rollup-Auflösung (telemetry_1h.csv / _1m.csv) für 'min_points' Punkte,
+    wird sie statt der Rohdaten geladen.
     """
     if not csv_path.exists():
         raise SystemExit(f"[ERR] Telemetrie-Datei nicht gefunden: {csv_path}")
 
+    if span_sec:
+        rollup = _pick_rollup(csv_path, span_sec, min_points)
+        if rollup is not None:
+            return _load_rollup(rollup, span_sec)
+
+    pd = _import_pandas()
+
     try:
-        df = pd.read_csv(csv_path, parse_dates=["ts"])
+        # Nur Zeitstempel, Messwerte und Modus: Dateien mit Zeilen alter (ohne seq)
+        # und neuer Firmware haben unterschiedlich viele Felder hinter 'mode'
+        df = pd.read_csv(csv_path, parse_dates=["ts"], usecols=lambda c: c.strip().lower() not in _TRAILING_COLUMNS)
     except ValueError as e:
         # Falls 'ts' anders heißt (Extremfall) — explizite Meldung
         raise SystemExit(f"[ERR] Konnte 'ts' nicht parsen: {e}")
@@ -82,11 +253,15 @@ def load_df(csv_path: pathlib.Path) -> pd.DataFrame:
         col["humidity"]:    "humidity_norm",
         col["pressure"]:    "pressure_norm",
     })
+    if span_sec and not df.empty:
+        df = df[df["ts"] >= df["ts"].max() - pd.Timedelta(seconds=span_sec)]
     return df
 
 
 def _format_time_axis(ax):
     """Schöne, kompakte Zeitachse."""
+    import matplotlib.dates as mdates
+
     locator = mdates.AutoDateLocator()
     formatter = mdates.ConciseDateFormatter(locator)
     ax.xaxis.set_major_locator(locator)
@@ -96,9 +271,14 @@ def _format_time_axis(ax):
 def draw_once(
     df: pd.DataFrame,
     title: str = "CubeSat Telemetrie – Bodenstationsansicht",
-    save_path: pathlib.Path | None = None
+    save_path: pathlib.Path | None = None,
+    headless: bool = False
 ):
-    """Zeichnet eine statische Telemetrie-Grafik (einmalige Ansicht)."""
+    """
+    Zeichnet eine statische Telemetrie-Grafik (einmalige Ansicht).
+    headless=True: nur Agg-Backend, Snapshot speichern, kein plt.show().
+    """
+    plt = _import_pyplot(headless=headless)
     fig, axes = plt.subplots(3, 1, sharex=True, figsize=(9, 7))
     fig.suptitle(title, fontsize=14)
 
@@ -129,19 +309,83 @@ def draw_once(
         plt.savefig(save_path, dpi=150)
         print(f"[INFO] Snapshot gespeichert: {save_path}")
 
+    if headless:
+        plt.close(fig)
+        return
+
     plt.show()
 
 
+# Kanäle für Snapshots: kanonischer Name → (Spalte, Legende, Einheit)
+SENSORS: Dict[str, Tuple[str, str, str]] = {
+    "temperature": ("temperature_norm", "Temperatur (°C)", "°C"),
+    "humidity":    ("humidity_norm", "Luftfeuchtigkeit (%)", "%"),
+    "pressure":    ("pressure_norm", "Luftdruck (hPa)", "hPa"),
+}
+
+
+def render_snapshot(
+    df: pd.DataFrame,
+    save_path: pathlib.Path,
+    title: str = "CubeSat Telemetrie – Bodenstationsansicht",
+    sensors: Tuple[str, ...] = ("temperature", "humidity", "pressure"),
+    dpi: int = 150
+) -> None:
+    """
+    Rendert einen Snapshot direkt über das Agg-Backend (ohne pyplot).
+    Kein GUI-Toolkit, kein plt.show(), keine globalen Figure-Registries –
+    sicher in Worker-Prozessen. Format folgt der Dateiendung (PNG/SVG).
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=(9, 2.5 + 1.5 * len(sensors)))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(len(sensors), 1, sharex=True, squeeze=False)[:, 0]
+    fig.suptitle(title, fontsize=14)
+
+    for ax, name in zip(axes, sensors):
+        col, label, unit = SENSORS[name]
+        ax.plot(df["ts"], df[col], label=label)
+        ax.set_ylabel(unit)
+        ax.legend(loc="upper left")
+        ax.grid(True, linestyle="--", alpha=0.4)
+
+    axes[-1].set_xlabel("Zeit (UTC)")
+    _format_time_axis(axes[-1])
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(save_path, dpi=dpi)
+
+
+def _sources_stamp(patterns: list[str]) -> tuple[list[str], tuple]:
+    """Expandiert Globs und liefert (Quellen, Stempel aus Pfad/Größe/mtime) für die Änderungserkennung."""
+    from cube.ground.batch_render import collect_sources
+
+    sources = collect_sources(patterns, [])
+    stamp = []
+    for src in sources:
+        st = pathlib.Path(src).stat()
+        stamp.append((src, st.st_size, st.st_mtime_ns))
+    return sources, tuple(stamp)
+
+
 def live_loop(
     csv_path: pathlib.Path,
     interval_sec: float = 2.0,
     window: int = 300,
-    save_path: pathlib.Path | None = None
+    save_path: pathlib.Path | None = None,
+    span_sec: float | None = None,
+    patterns: list[str] | None = None,
+    jobs: int | None = None,
 ):
     """
     Live-Modus: aktualisiert die Diagramme alle 'interval_sec' Sekunden.
     'window' gibt die Anzahl der letzten Messpunkte an (Lesbarkeit).
+    Mit 'patterns' (Globs) werden alle passenden Dateien geladen; dank
+    Cache wird pro Aktualisierung nur das gerade wachsende Segment neu geparst.
     """
+    plt = _import_pyplot()
     plt.ion()
     fig, axes = plt.subplots(3, 1, sharex=True, figsize=(9, 7))
     fig.suptitle("CubeSat Telemetrie – LIVE", fontsize=14)
@@ -150,17 +394,28 @@ def live_loop(
 
     try:
         while True:
-            if not csv_path.exists():
+            if patterns:
+                sources, mtime = _sources_stamp(patterns)
+                if not sources:
+                    print(f"[WARN] Keine Dateien für {patterns} (warte)")
+                    plt.pause(interval_sec)
+                    continue
+            elif not csv_path.exists():
                 print(f"[WARN] Datei fehlt (warte): {csv_path}")
                 plt.pause(interval_sec)
                 continue
+            else:
+                mtime = csv_path.stat().st_mtime
 
-            mtime = csv_path.stat().st_mtime
             if mtime == last_mtime:
                 plt.pause(interval_sec)
                 continue
 
-            df = load_df(csv_path)
+            if patterns:
+                from cube.ground.loader import load_many
+                df = load_many(sources, span_sec=span_sec, jobs=jobs)
+            else:
+                df = load_df(csv_path, span_sec=span_sec)
 
             # Wenn leer: Hinweis einblenden und warten
             if df.empty:
@@ -220,16 +475,51 @@ def main():
     parser.add_argument("--interval", type=float, default=2.0, help="Aktualisierungsintervall (Sekunden) im Live-Modus")
     parser.add_argument("--window", type=int, default=300, help="Zeige die letzten N Messpunkte im Live-Modus")
     parser.add_argument("--save", type=pathlib.Path, help="Optional: Pfad zum Speichern eines PNG-Snapshots")
+    parser.add_argument("--span", type=parse_span, default=None,
+                        help="Zeitfenster (z. B. 90m, 6h, 30d); lange Fenster nutzen Minuten-/Stunden-Rollups")
+    parser.add_argument("--headless", action="store_true",
+                        help="ohne Fenster rendern (Agg-Backend); impliziert --once, benötigt --save "
+                             "(automatisch bei --once --save oder ohne Display)")
+    parser.add_argument("--glob", action="append", default=[],
+                        help="mehrere CSVs laden (Glob, mehrfach erlaubt, '**' rekursiv), z. B. Archiv oder rotierte Segmente")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Worker-Prozesse zum Parsen nicht gecachter Dateien (--glob; Standard: CPU-Anzahl)")
+    parser.add_argument("--profile", choices=("cpu", "mem"), default=None,
+                        help="Laden/Rendern profilieren: cpu (cProfile + collapsed stacks) oder mem (tracemalloc)")
+    parser.add_argument("--profile-dir", type=pathlib.Path, default=None,
+                        help="Zielordner für Profile (Standard: data/profiles)")
     args = parser.parse_args()
 
-    df = load_df(args.csv)
-    if df.empty and args.once:
-        raise SystemExit("[ERR] Telemetrie-Datei ist leer. Bitte OBC/Receiver zuerst starten.")
-
-    if args.once:
-        draw_once(df, save_path=args.save)
-    else:
-        live_loop(csv_path=args.csv, interval_sec=args.interval, window=args.window, save_path=args.save)
+    # Snapshot ohne Fenster (Cron/Batch) oder kein Display: Agg statt GUI-Backend
+    if not args.headless and ((args.once and args.save) or not _has_display()):
+        args.headless = True
+    if args.headless:
+        if not args.save:
+            parser.error("--headless benötigt --save (kein Display gefunden?)")
+        args.once = True
+
+    profile = contextlib.nullcontext()
+    if args.profile:
+        from cube.ground.profiling import profile_section
+        profile = profile_section(args.profile, "plot", args.profile_dir)
+
+    with profile:
+        if args.once:
+            if args.glob:
+                from cube.ground.batch_render import collect_sources
+                from cube.ground.loader import load_many
+                sources = collect_sources(args.glob, [])
+                if not sources:
+                    raise SystemExit(f"[ERR] Keine Dateien für {args.glob} gefunden.")
+                df = load_many(sources, span_sec=args.span, jobs=args.jobs)
+            else:
+                df = load_df(args.csv, span_sec=args.span)
+            if df.empty:
+                raise SystemExit("[ERR] Telemetrie-Datei ist leer. Bitte OBC/Receiver zuerst starten.")
+            draw_once(df, save_path=args.save, headless=args.headless)
+        else:
+            live_loop(csv_path=args.csv, interval_sec=args.interval, window=args.window, save_path=args.save,
+                      span_sec=args.span, patterns=args.glob or None, jobs=args.jobs)
 
 
 if __name__ == "__main__":
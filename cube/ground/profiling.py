@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+profiling.py – Eingebaute Profiling-Hooks für receiver.py und plot.py
+
+Aktiviert per CLI-Flag, ohne Code zu ändern:
+  --profile cpu   cProfile (pstats-Datei .prof) + gesampelte Stacks im
+                  "collapsed"-Format (.collapsed) für Flamegraphs, z. B.
+                    flamegraph.pl data/profiles/receiver_….collapsed > fg.svg
+                    speedscope data/profiles/receiver_….collapsed
+  --profile mem   tracemalloc: Top-Allokationen nach Zeile + Spitzenverbrauch (.mem.txt)
+
+Das Profil umfasst nur den Abschnitt im with-Block (Ingest- bzw. Render-Schleife),
+nicht Importe und Initialisierung. Dateien landen mit Zeitstempel in
+PROFILE_DIR (data/profiles/); beim Verlassen wird eine Kurzfassung ausgegeben.
+
+Hinweis: cProfile erfasst nur den aufrufenden Thread; die gesampelten Stacks
+enthalten alle Nicht-Daemon-Threads (z. B. Worker von --watch-dir).
+"""
+
+from __future__ import annotations
+
+import contextlib
+import datetime
+import io
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, Optional
+
+PROFILE_KINDS = ("cpu", "mem")
+TOP_N = 15
+
+
+def _stamp() -> str:
+    return datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """
+    Sampelt periodisch die Stacks aller Nicht-Daemon-Threads (Haupt- und
+    Worker-Threads) und zählt identische Stacks – Ergebnis im collapsed-Format
+    ("wurzel;…;blatt anzahl" pro Zeile).
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.counts: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        threads = {}
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident not in threads:
+                    threads = {t.ident: t for t in threading.enumerate()}
+                thread = threads.get(ident)
+                # Daemon-Threads (Snapshot, Log-Listener, dieser Sampler) warten fast immer
+                if thread is None or thread.daemon:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(thread.name)
+                self.counts[";".join(reversed(stack))] += 1
+
+    def write(self, path: Path) -> None:
+        with path.open("w", encoding="utf-8") as f:
+            for stack, n in self.counts.most_common():
+                f.write(f"{stack} {n}\n")
+
+
+@contextlib.contextmanager
+def _cpu_profile(base: Path) -> Iterator[None]:
+    import cProfile
+    import pstats
+
+    prof = cProfile.Profile()
+    sampler = StackSampler()
+    t0 = time.perf_counter()
+    sampler.start()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        sampler.stop()
+        elapsed = time.perf_counter() - t0
+
+        prof_path = base.with_suffix(".prof")
+        collapsed_path = base.with_suffix(".collapsed")
+        prof.dump_stats(str(prof_path))
+        sampler.write(collapsed_path)
+
+        out = io.StringIO()
+        pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(TOP_N)
+        print(f"\n[PROFILE] CPU: {elapsed:.2f}s, {sum(sampler.counts.values())} Samples", file=sys.stderr)
+        print(out.getvalue().rstrip(), file=sys.stderr)
+        print(f"[PROFILE] pstats:    {prof_path}", file=sys.stderr)
+        print(f"[PROFILE] collapsed: {collapsed_path}", file=sys.stderr)
+
+
+@contextlib.contextmanager
+def _mem_profile(base: Path) -> Iterator[None]:
+    import tracemalloc
+
+    tracemalloc.start(1)  # eine Frame-Ebene genügt für "Top nach Zeile" und hält den Overhead klein
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        elapsed = time.perf_counter() - t0
+
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        stats = snapshot.statistics("lineno")
+        lines = [f"Dauer: {elapsed:.2f}s, aktuell: {current / 1024:.1f} KiB, Spitze: {peak / 1024:.1f} KiB",
+                 f"Top {TOP_N} Allokationen (nach Zeile):"]
+        for stat in stats[:TOP_N]:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size / 1024:10.1f} KiB {stat.count:8d} Blöcke  {frame.filename}:{frame.lineno}")
+
+        mem_path = base.with_suffix(".mem.txt")
+        mem_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        print("\n[PROFILE] Speicher: " + "\n".join(lines), file=sys.stderr)
+        print(f"[PROFILE] Bericht: {mem_path}", file=sys.stderr)
+
+
+def profile_section(kind: Optional[str], name: str, out_dir: Optional[Path] = None):
+    """
+    Kontextmanager für einen profilierten Abschnitt.
+    kind=None → kein Profiling (kein Overhead); 'cpu' oder 'mem' siehe Modulkopf.
+    Ausgabedateien: <out_dir>/<name>_<YYYYmmdd-HHMMSS>.<endung>
+    """
+    if kind is None:
+        return contextlib.nullcontext()
+    if kind not in PROFILE_KINDS:
+        raise ValueError(f"Profil muss eines von {PROFILE_KINDS} sein")
+    if out_dir is None:
+        from cube.ground.config.paths import PROFILE_DIR
+        out_dir = PROFILE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    base = out_dir / f"{name}_{_stamp()}"
+    return _cpu_profile(base) if kind == "cpu" else _mem_profile(base)
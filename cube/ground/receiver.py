@@ -4,7 +4,7 @@
 Ground Receiver: CSV-Telemetrie-Empfang mit HMAC-Verify und Adaptiver Sicherheit.
 
 Pipeline-Stufen:
-  RAW (Eingang) → VERIFY (HMAC) → PROCESSED / REJECTED / QUARANTINE
+  RAW (Eingang) → VERIFY (HMAC) → PLAUSIBILITY → PROCESSED / ANOMALIES / REJECTED / QUARANTINE
   + Adaptive Security Mode:
       • Überwacht Ereignismuster (ok/fail)
       • Sperrt temporär bei Anomalien (Lockout)
@@ -15,36 +15,54 @@ Reduziert Abhängigkeiten und bleibt robust bei fehlender Infrastruktur.
 
 import sys
 import argparse
+import contextlib
 from pathlib import Path
 import datetime
-from typing import Optional, Tuple
-import csv
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
 
 # ==== Adapter-Funktionen mit Fehlerdiagnose ==== #
 
 def try_import_paths():
     """Versucht projektinterne Pfade zu importieren, fällt andernfalls mit verständlicher Meldung."""
     try:
-        from cube.ground.config.paths import RAW_PATH, PROC_PATH, REJ_PATH, CSV_HEADER
-        return RAW_PATH, PROC_PATH, REJ_PATH, CSV_HEADER
+        from cube.ground.config.paths import RAW_PATH, PROC_PATH, REJ_PATH, ANOM_PATH, CSV_HEADER
+        return RAW_PATH, PROC_PATH, REJ_PATH, ANOM_PATH, CSV_HEADER
     except Exception:
         # Klarer Fehler – ohne diese Pfade ist die Pipeline nicht definiert.
         raise RuntimeError("Fehlende Pfaddefinitionen: cube.ground.config.paths nicht gefunden.")
 
 def try_import_verify():
-    """Versucht HMAC-Verify-Callback zu importieren. Fallback: einmalige Warnung, immer False."""
+    """
+    Versucht HMAC-Verify-Callback (für geparste Pakete, liefert den Grundcode) zu importieren.
+    Fallback: einmalige Warnung, immer invalid_signature.
+    """
     try:
-        from cube.ground.verify import verify_with_config
-        return verify_with_config
+        from cube.ground.verify import check_packet
+        return check_packet
     except Exception:
         _warned = {"done": False}
-        def dummy_verify(_payload: bytes, _mac: str) -> bool:
+        def dummy_verify(_pkt) -> str:
             if not _warned["done"]:
                 print("[WARN] HMAC-Verify-Callback nicht geladen! Eingabe wird nicht geprüft (fallback=always-false).")
                 _warned["done"] = True
-            return False
+            return "invalid_signature"
         return dummy_verify
 
+def try_import_admission_checks():
+    """
+    Versucht Schlüssel-ID-Abfrage und reine Signaturprüfung für die Zulassung zu importieren.
+    Fallback: keine ID bekannt (ein Eimer je Link), keine Zeile gilt als gültig signiert.
+    """
+    try:
+        from cube.ground.verify import known_key_id, line_signature_ok
+        return known_key_id, line_signature_ok
+    except Exception:
+        return (lambda _key_id: False), (lambda _line: False)
+
 def try_import_secman():
     """Versucht SecurityManager zu importieren. Fallback: Dummy, der alles erlaubt und nichts loggt."""
     try:
@@ -57,11 +75,83 @@ def try_import_secman():
             def on_verification_result(self, **_kw): pass
         return DummySecman
 
+def try_import_packet():
+    """Importiert den gemeinsamen Paket-Parser (ohne ihn ist keine Zeile verarbeitbar)."""
+    try:
+        from cube.ground.packet import parse_packet, PacketError
+        return parse_packet, PacketError
+    except Exception:
+        raise RuntimeError("Fehlender Paket-Parser: cube.ground.packet nicht gefunden.")
+
+def try_import_rollups(base_path: Path):
+    """Versucht den RollupWriter zu importieren. Fallback: Dummy ohne Aggregation."""
+    try:
+        from cube.ground.rollup import RollupWriter
+        return RollupWriter(base_path)
+    except Exception:
+        class DummyRollups:
+            def add(self, _ts: float, _values) -> None: pass
+            def flush(self) -> None: pass
+        return DummyRollups()
+
+def try_import_plausibility():
+    """Versucht den PlausibilityScorer zu importieren. Fallback: Dummy, der alles durchlässt."""
+    try:
+        from cube.ground.plausibility import PlausibilityScorer
+        return PlausibilityScorer()
+    except Exception:
+        class DummyScorer:
+            action = "off"
+            counts: dict = {}
+            def score_packet(self, _pkt, _stream=None) -> Optional[str]: return None
+            def forget(self, _match) -> None: pass
+        return DummyScorer()
+
+def try_import_linkquality():
+    """Versucht das Sequenz-Tracking zu importieren. Fallback: Dummy ohne Auswertung."""
+    try:
+        from cube.ground.linkquality import LinkQuality
+        return LinkQuality()
+    except Exception:
+        class DummyLinks:
+            publish_interval = 0.0
+            def observe(self, _link: str, _seq: int) -> str: return "ok"
+            def stats(self) -> dict: return {}
+            def pop(self, _link: str) -> None: return None
+            def due(self) -> bool: return False
+        return DummyLinks()
+
+def try_import_summary():
+    """Versucht die Konsolen-Zusammenfassung zu importieren. Fallback: eine Zeile pro Paket wie bisher."""
+    try:
+        from cube.ground.summary import OutcomeSummary
+        return OutcomeSummary()
+    except Exception:
+        class DummySummary:
+            verbose = True
+            def configure(self, *_a, **_kw) -> None: pass
+            def record(self, _outcome: str, _reason=None, text=None) -> None:
+                if text:
+                    print(text)
+            def flush(self) -> None: pass
+            def close(self) -> None: pass
+        return DummySummary()
+
 # ==== Pfad- und Funktionsbindung ==== #
 
-RAW_PATH, PROC_PATH, REJ_PATH, CSV_HEADER = try_import_paths()
-verify_with_config = try_import_verify()
+RAW_PATH, PROC_PATH, REJ_PATH, ANOM_PATH, CSV_HEADER = try_import_paths()
+check_packet = try_import_verify()
+known_key_id, line_signature_ok = try_import_admission_checks()
+parse_packet, PacketError = try_import_packet()
 SecurityManager = try_import_secman()
+ROLLUPS = try_import_rollups(PROC_PATH)  # Minuten-/Stunden-Aggregate neben PROC_PATH
+PLAUSIBILITY = try_import_plausibility()  # EWMA-/Grenzwertprüfung signierter Werte
+SUMMARY = try_import_summary()  # Konsole: pro Paket (verbose) oder periodische Zusammenfassung
+LINKS = try_import_linkquality()  # Verlust/Umordnung/Duplikate je Link (signierte Sequenznummern)
+
+# Serialisiert die Zeilenverarbeitung bei parallelem Einlesen (--watch-dir):
+# SecurityManager, Plausibilität, Rollups und Sinks sind gemeinsamer Zustand.
+PIPELINE_LOCK = threading.RLock()
 
 # ==== Hilfsfunktionen für Datei-/CSV-Operationen ==== #
 
@@ -87,6 +177,8 @@ def append_csv(path: Path, fields: list[str], header_fields: Optional[list[str]]
     Alternative mit csv.writer (korrekte Maskierung von Kommas/Quotes).
     Derzeit nicht zwingend notwendig; behalten wir als Option vor.
     """
+    import csv  # lazy: csv wird im Standardpfad nicht benötigt
+
     ensure_parent(path)
     header_needed = bool(header_fields) and (not path.exists() or path.stat().st_size == 0)
     with path.open("a", encoding="utf-8", newline="") as f:
@@ -95,88 +187,206 @@ def append_csv(path: Path, fields: list[str], header_fields: Optional[list[str]]
             w.writerow(header_fields)
         w.writerow(fields)
 
-def split_payload_mac(line: str) -> Tuple[bytes, str]:
-    """
-    Trennt Payload und MAC anhand des letzten Kommas.
-    Liefert (payload_bytes, mac_hex) oder wirft ValueError mit Grundcode.
-    """
-    try:
-        payload, mac = line.rsplit(",", 1)
-    except ValueError:
-        raise ValueError("no_mac_delimiter")
-    mac = mac.strip()
-    if not mac:
-        raise ValueError("empty_mac")
-    return payload.encode("utf-8"), mac
-
 def is_header(line: str) -> bool:
     """Erkennt CSV-Header anhand des Beginns mit 'ts,'."""
     return line.lower().startswith("ts,")
 
 # ==== Datenverarbeitung + Adaptive Security ==== #
 
+UNVERIFIED_KEY = "?"  # Eimer für Zeilen ohne bekannte Schlüssel-ID
+
+def admission_key(line: str, source: str, link: Optional[str] = None) -> str:
+    """
+    Eimer-Schlüssel einer Zeile: Link (Standard: source) + beanspruchte Schlüssel-ID
+    aus dem Signaturfeld ("kid:hex"). Nur IDs aus dem Schlüsselbund bekommen einen
+    eigenen Eimer; unbekannte/fehlende IDs teilen sich einen (keine Eimer-Flut).
+    """
+    sig = line.rstrip().rpartition(",")[2]
+    key_id, sep, _ = sig.partition(":")
+    try:
+        known = bool(sep) and known_key_id(key_id)
+    except Exception:
+        known = False  # Schlüsselbund/Geheimnis nicht ladbar → wie unbekannte ID
+    return f"{link or source}/{key_id if known else UNVERIFIED_KEY}"
+
+def signature_ok(line: str) -> bool:
+    """Reine HMAC-Prüfung für die Zulassung; ein nicht ladbarer Schlüssel gilt als ungültig."""
+    try:
+        return line_signature_ok(line)
+    except Exception:
+        return False
+
+def admit_line(secman: Optional[object], source: str, link: Optional[str] = None,
+               line: Optional[str] = None) -> bool:
+    """
+    Zulassung vor jeder weiteren Arbeit (Parsen, HMAC, RAW/Sinks): False →
+    Zeile verwerfen. Verworfene Zeilen werden nur gezählt, nie einzeln ausgegeben.
+    Mit 'line' gilt ein Eimer je Link und Schlüssel-ID (admission_key); ist er
+    leer, passieren nur gültig signierte Zeilen (gefälschte IDs leeren ihn nicht
+    für den echten Sender).
+    """
+    if secman is None or not hasattr(secman, "admit"):
+        return True
+    exempt = getattr(secman, "admission_exempt", None)
+    if line is None or (exempt is not None and exempt(source)):
+        # Ausgenommene Quellen (z. B. --file) ohne Schlüsselbund-Zugriff
+        admitted = secman.admit(source, link)
+    else:
+        admitted = secman.admit(source, admission_key(line, source, link), lambda: signature_ok(line))
+    if admitted:
+        return True
+    SUMMARY.record("shed", "rate_limit")
+    return False
+
 def handle_line(
     line: str,
     secman: Optional[object] = None,
     source: str = "unknown",
-    quarantine_path: Optional[Path] = None
+    quarantine_path: Optional[Path] = None,
+    link: Optional[str] = None,
+    admitted: bool = False,
 ) -> None:
     """
     Verarbeitet eine einzelne Telemetrie-Zeile:
+      • Token-Bucket-Zulassung je Quelle/global (entfällt bei admitted=True, s. admit_line),
+      • einmaliges Parsen in ein Packet (Strukturfehler → malformed_packet, ohne HMAC),
       • optionaler Lockout-Check (Adaptive Security) vor Verify,
       • Verify (HMAC),
+      • Sequenznummer je Link (Standard: source) – signierte Duplikate werden verworfen,
       • Routing: PROCESSED oder REJECTED (oder QUARANTINE bei aktivem Lockout).
     Mutiert die Eingabezeile nicht (für Debug/Forensik).
     """
     if not line.strip():
         return
+    if not admitted and not admit_line(secman, source, link, line):
+        return
+
+    # Einmal parsen – Verify, Meta und Sinks nutzen dasselbe Packet
+    try:
+        pkt = parse_packet(line)
+        pkt_id = pkt.packet_id
+        parse_error = None
+    except PacketError as e:
+        pkt = None
+        pkt_id = e.packet_id
+        parse_error = e.reason
+    if not pkt_id:
+        pkt_id = f"ts-{int(datetime.datetime.now(datetime.UTC).timestamp())}"
+    # event_ts: Paket-Zeitstempel für clock=event im SecurityManager (None = unbekannt)
+    meta = {"source": source, "packet_id": pkt_id, "len": len(line),
+            "event_ts": pkt.ts if pkt is not None else None}
 
-    pkt_id = (line.split(",", 1)[0] or f"ts-{int(datetime.datetime.now(datetime.UTC).timestamp())}").strip()
-    meta = {"source": source, "packet_id": pkt_id, "len": len(line)}
+    # HMAC höchstens einmal: ggf. schon im Lockout-Check (clock=event), sonst in Schritt 1
+    checked: Dict[str, str] = {}
+
+    def verify_pkt() -> bool:
+        if pkt is None:
+            return False
+        if "reason" not in checked:
+            try:
+                checked["reason"] = check_packet(pkt)
+            except Exception:
+                return False
+        return checked["reason"] == "ok"
 
     # 0) Lockout vor Verify prüfen
     if secman and hasattr(secman, "on_packet_before_verify"):
-        if not secman.on_packet_before_verify(meta):
+        if not secman.on_packet_before_verify(meta, verify_pkt):
             action = getattr(secman, "action_when_locked", lambda: "reject")()
             reason = "lockout_active"
             if action == "drop":
-                print(f"[LOCKED] dropped id={pkt_id}")
+                SUMMARY.record("locked", "drop", f"[LOCKED] dropped id={pkt_id}")
                 return
             elif action == "quarantine":
                 qpath = quarantine_path or Path("data/quarantine/telemetry.csv")
                 append_line(qpath, line.rstrip() + f",reason={reason}")
-                print(f"[LOCKED] quarantined id={pkt_id}")
+                SUMMARY.record("locked", "quarantine", f"[LOCKED] quarantined id={pkt_id}")
                 return
             else:
                 append_line(REJ_PATH, line.rstrip() + f",reason={reason}")
-                print(f"[LOCKED] rejected id={pkt_id}")
+                SUMMARY.record("locked", "reject", f"[LOCKED] rejected id={pkt_id}")
                 return
 
-    # 1) Verify HMAC (mit differenzierten Fehlercodes)
+    # 1) Verify HMAC (mit differenzierten Fehlercodes); Strukturfehler ohne HMAC-Arbeit
     verify_reason = "ok"
     rej_line = None
-    try:
-        payload, mac = split_payload_mac(line)
-        ok = verify_with_config(payload, mac)
-        if not ok:
-            verify_reason = "invalid_signature"
-    except Exception as e:
+    if pkt is None:
         ok = False
         verify_reason = "malformed_packet"
-        rej_line = line.rstrip() + f",verify_error={e}"
+        rej_line = line.rstrip() + f",verify_error={parse_error}"
+    else:
+        try:
+            # Schlüssel-ID → Schlüsselbund; ok | invalid_signature | unknown_key_id | key_not_valid
+            verify_reason = checked.get("reason") or check_packet(pkt)
+            ok = verify_reason == "ok"
+        except Exception as e:
+            ok = False
+            verify_reason = "malformed_packet"
+            rej_line = line.rstrip() + f",verify_error={e}"
 
     # 2) Ergebnis an SecurityManager melden (Fenster/Auslöser/Lockout)
     if secman and hasattr(secman, "on_verification_result"):
         secman.on_verification_result(ok=ok, reason=verify_reason, meta=meta)
 
-    # 3) Schreiben in Ziel (ohne doppelte RAW-Einträge)
-    if ok:
-        append_line(PROC_PATH, line)
-        print("[OK] processed")
+    # 3) Sequenznummer signierter Pakete: Lücke/Umordnung/Duplikat je Link (O(1))
+    if ok and pkt.seq is not None:
+        seq_reason = LINKS.observe(link or source, pkt.seq)
+        if seq_reason != "ok":
+            if secman and hasattr(secman, "on_sequence_anomaly"):
+                secman.on_sequence_anomaly(reason=seq_reason, meta=meta)
+            if seq_reason == "seq_duplicate":
+                # Signiertes Duplikat (Replay) nicht ein zweites Mal verarbeiten
+                ok = False
+                verify_reason = seq_reason
+        if LINKS.due():
+            publish_link_stats(secman)
+
+    # 4) Plausibilität signierter Werte (O(1) pro Zeile)
+    anomaly = None
+    if ok and PLAUSIBILITY.action != "off":
+        # Eigenes Modell je Link und Schlüssel: verschränkte Geräte/Dateien trennen
+        anomaly = PLAUSIBILITY.score_packet(pkt, (link or source, pkt.key_id))
+        if anomaly and secman and hasattr(secman, "on_anomaly"):
+            secman.on_anomaly(reason=anomaly, meta=meta)
+
+    # 5) Schreiben in Ziel (ohne doppelte RAW-Einträge)
+    if anomaly and PLAUSIBILITY.action == "divert":
+        append_line(ANOM_PATH, pkt.line + f",anomaly={anomaly}")
+        SUMMARY.record("anomaly", anomaly, f"[ANOMALY] {anomaly}")
+    elif ok:
+        append_line(PROC_PATH, pkt.line)
+        if anomaly:
+            # tag: Zeile bleibt in PROCESSED, Index in ANOMALIES, keine Rollup-Verfälschung
+            append_line(ANOM_PATH, pkt.line + f",anomaly={anomaly}")
+            SUMMARY.record("processed", anomaly, f"[OK] processed (anomaly={anomaly})")
+        else:
+            if pkt.ts is not None:
+                ROLLUPS.add(pkt.ts, pkt.values)
+            SUMMARY.record("processed", None, "[OK] processed")
     else:
         out_line = rej_line or (line if "reason=" in line else line.rstrip() + f",reason={verify_reason}")
         append_line(REJ_PATH, out_line)
-        print(f"[REJECTED] {verify_reason}")
+        SUMMARY.record("rejected", verify_reason, f"[REJECTED] {verify_reason}")
+
+def publish_link_stats(secman: Optional[object] = None, stats: Optional[dict] = None) -> None:
+    """Link-Kennzahlen (Standard: alle aktiven Links) ins Audit, als Metrik-Datei und auf die Konsole."""
+    stats = LINKS.stats() if stats is None else stats
+    if not stats:
+        return
+    if secman and hasattr(secman, "on_link_stats"):
+        secman.on_link_stats(stats)
+    try:
+        from cube.ground.config.paths import LINK_METRICS_PATH
+        ensure_parent(LINK_METRICS_PATH)
+        tmp = LINK_METRICS_PATH.with_name(LINK_METRICS_PATH.name + ".tmp")
+        tmp.write_text(json.dumps({"ts": time.time(), "links": stats}, indent=1), encoding="utf-8")
+        os.replace(tmp, LINK_METRICS_PATH)
+    except (ImportError, OSError) as e:
+        print(f"[WARN] Link-Metriken nicht geschrieben: {e}")
+    for name, st in stats.items():
+        print(f"[LINK] {name}: Verlust {st['loss_pct']:.2f}% ({st['lost']}/{st['expected']}), "
+              f"Bursts {st['bursts']} (max {st['burst_max']}, Ø {st['burst_mean']}), "
+              f"umgeordnet {st['reordered']}, Duplikate {st['duplicates']}")
 
 def ingest_raw_line(line: str) -> None:
     """Schreibt eine unveränderte Zeile in RAW (Eingangsspur)."""
@@ -193,24 +403,169 @@ def receive_simulated(n: int = 3, secman: Optional[object] = None, quarantine_pa
         ingest_raw_line(line)  # RAW nur hier (kein Doppel im handle_line)
         handle_line(line, secman=secman, source="simulate", quarantine_path=quarantine_path)
 
-def receive_from_file(path: Path, secman: Optional[object] = None, quarantine_path: Optional[Path] = None) -> None:
-    """Liest eine CSV-Datei und verarbeitet sie Zeile für Zeile."""
+def _sink_paths(quarantine_path: Optional[Path]) -> list[Path]:
+    """Alle Dateien, in die handle_line/ingest_raw_line schreiben können."""
+    paths = [RAW_PATH, PROC_PATH, REJ_PATH, ANOM_PATH, quarantine_path or Path("data/quarantine/telemetry.csv")]
+    return paths + list(getattr(ROLLUPS, "paths", lambda: [])())
+
+def receive_from_file(
+    path: Path,
+    secman: Optional[object] = None,
+    quarantine_path: Optional[Path] = None,
+    checkpoint_path: Optional[Path] = None,
+    checkpoint_every: int = 1000,
+    from_start: bool = False,
+    follow: bool = False,
+    follow_interval: float = 1.0,
+    repair_sinks: bool = False,
+    link: Optional[str] = None,
+) -> int:
+    """
+    Liest eine CSV-Datei und verarbeitet sie Zeile für Zeile.
+    Mit checkpoint_path wird der Fortschritt alle 'checkpoint_every' Pakete
+    atomar gesichert; ein erneuter Aufruf setzt exakt dort fort. Die Sinks
+    werden mit anderen Schreibern geteilt und daher nicht angefasst (Zeilen
+    nach dem letzten Checkpoint ggf. doppelt). repair_sinks=True kürzt sie auf
+    den Checkpoint-Stand – nur, wenn kein anderer Schreiber angehängt hat.
+    follow=True liest eine wachsende Datei weiter (unvollständige letzte
+    Zeilen werden erst nach dem Zeilenende verarbeitet).
+    Liefert die Anzahl in diesem Lauf verarbeiteter Pakete.
+    """
     if not path.exists():
         raise SystemExit(f"[ERR] Datei nicht gefunden: {path}")
     same_as_raw = path.resolve() == RAW_PATH.resolve()
+
+    offset = 0
+    packets = 0
+    sinks = _sink_paths(quarantine_path)
+    if checkpoint_path:
+        from cube.ground.checkpoint import (Checkpoint, load_checkpoint, repair_allowance, save_checkpoint,
+                                            sink_sizes, truncate_sinks)
+        cp = None if from_start else load_checkpoint(checkpoint_path)
+        if cp is not None and cp.matches(path):
+            offset, packets = cp.offset, cp.packets
+            if repair_sinks:
+                try:
+                    with PIPELINE_LOCK:
+                        removed = truncate_sinks(cp.sinks, repair_allowance(path, offset, checkpoint_every))
+                except ValueError as e:
+                    print(f"[WARN] Sink-Reparatur verweigert (anderer Schreiber?): {e}")
+                    removed = {}
+                for sink, n in removed.items():
+                    print(f"[GROUND] Sink auf Checkpoint-Stand gekürzt: {sink} (-{n} Bytes)")
+            if not follow and offset >= path.stat().st_size:
+                print(f"[GROUND] Bereits vollständig verarbeitet ({packets} Pakete bis Byte {offset}, "
+                      f"Checkpoint {checkpoint_path}) – nichts Neues; --from-start liest erneut")
+            else:
+                print(f"[GROUND] Fortsetzen ab Byte {offset} ({packets} Pakete bereits verarbeitet; "
+                      f"--from-start liest von vorn)")
+        elif cp is not None:
+            print("[GROUND] Checkpoint passt nicht zur Datei (ersetzt/gekürzt) – Start von vorn")
+
+    def save() -> None:
+        if checkpoint_path:
+            with PIPELINE_LOCK:
+                ROLLUPS.flush()  # offene Buckets gehören zum gesicherten Stand
+                sizes = sink_sizes(sinks)
+            save_checkpoint(checkpoint_path, Checkpoint.for_file(path, offset, packets, sizes))
+
     print(f"[GROUND] Lese Datei: {path}")
-    with path.open("r", encoding="utf-8") as f:
-        first = f.readline()
-        if first and not is_header(first):
-            if not same_as_raw:
-                ingest_raw_line(first)
-            handle_line(first, secman=secman, source="file", quarantine_path=quarantine_path)
-        for line in f:
-            if is_header(line):
-                continue
-            if not same_as_raw:
-                ingest_raw_line(line)
-            handle_line(line, secman=secman, source="file", quarantine_path=quarantine_path)
+    processed = 0
+    since_checkpoint = 0
+    try:
+        with path.open("rb") as f:
+            f.seek(offset)
+            while True:
+                raw = f.readline()
+                if not raw or (follow and not raw.endswith(b"\n")):
+                    # EOF bzw. unvollständige Zeile einer wachsenden Datei
+                    if not follow:
+                        break
+                    f.seek(offset)
+                    if since_checkpoint:
+                        save()
+                        since_checkpoint = 0
+                    time.sleep(follow_interval)
+                    continue
+                line = raw.decode("utf-8", errors="replace")
+                if not is_header(line) and line.strip():
+                    with PIPELINE_LOCK:
+                        if not same_as_raw:
+                            ingest_raw_line(line)
+                        handle_line(line, secman=secman, source="file", quarantine_path=quarantine_path, link=link)
+                # Offset erst nach vollständiger Verarbeitung weiterschieben
+                offset += len(raw)
+                if is_header(line) or not line.strip():
+                    continue
+                packets += 1
+                processed += 1
+                since_checkpoint += 1
+                if since_checkpoint >= checkpoint_every:
+                    save()
+                    since_checkpoint = 0
+    except KeyboardInterrupt:
+        # Kein Checkpoint hier: die Zeile könnte halb geschrieben sein. Fortgesetzt
+        # wird ab dem letzten periodischen Checkpoint (optional mit --repair-sinks).
+        if not follow:
+            raise
+        print("\n[GROUND] Nachlesen manuell gestoppt.")
+        return processed
+    save()
+    return processed
+
+def receive_from_spool(
+    spool_dir: Path,
+    secman: Optional[object] = None,
+    quarantine_path: Optional[Path] = None,
+    workers: int = 4,
+    poll_interval: float = 1.0,
+    settle_seconds: float = 2.0,
+    use_inotify: Optional[bool] = None,
+) -> None:
+    """
+    Überwacht ein Spool-Verzeichnis und liest fertige Dumps parallel ein
+    (eine Datei pro Worker, Reihenfolge innerhalb der Datei bleibt erhalten).
+    Verarbeitete Dateien wandern nach ARCHIVE_DIR/<YYYY-MM-DD>/.
+    Jede Datei bekommt einen eigenen Checkpoint; Sinks werden dabei nicht
+    gekürzt, da mehrere Dateien gleichzeitig in dieselben Sinks schreiben.
+    """
+    from cube.ground.config.paths import ARCHIVE_DIR, CHECKPOINT_DIR
+    from cube.ground.checkpoint import default_checkpoint_path
+    from cube.ground.spool import watch_directory
+
+    def ingest(path: Path) -> int:
+        link = f"spool:{path.name}"  # eigene Sequenz pro Dump, parallele Dateien verfälschen nichts
+        packets = receive_from_file(
+            path,
+            secman=secman,
+            quarantine_path=quarantine_path,
+            checkpoint_path=default_checkpoint_path(CHECKPOINT_DIR, path),
+            link=link,
+        )
+        with PIPELINE_LOCK:
+            final = LINKS.pop(link)
+            PLAUSIBILITY.forget(lambda key: key[0] == link)
+        if final:
+            publish_link_stats(secman, {link: final})
+        return packets
+
+    # Verschränkte Dateien: ein offener Rollup-Bucket pro Worker statt Ein-Zeilen-Buckets
+    if hasattr(ROLLUPS, "max_open"):
+        ROLLUPS.max_open = max(ROLLUPS.max_open, workers)
+
+    def done(path: Path) -> None:
+        default_checkpoint_path(CHECKPOINT_DIR, path).unlink(missing_ok=True)
+
+    watch_directory(
+        spool_dir,
+        ARCHIVE_DIR,
+        ingest,
+        workers=workers,
+        poll_interval=poll_interval,
+        settle_seconds=settle_seconds,
+        use_inotify=use_inotify,
+        on_done=done,
+    )
 
 def receive_from_stdin(secman: Optional[object] = None, quarantine_path: Optional[Path] = None) -> None:
     """Liest Telemetrie über STDIN (Pipe)."""
@@ -219,13 +574,55 @@ def receive_from_stdin(secman: Optional[object] = None, quarantine_path: Optiona
         for line in sys.stdin:
             if is_header(line):
                 continue
+            # Zulassung vor RAW: eine Flut kostet keinen Schreibzugriff; Eimer je Schlüssel-ID
+            if not admit_line(secman, "stdin", line=line):
+                continue
             ingest_raw_line(line)  # RAW für STDIN (keine Duplikate in handle_line)
-            handle_line(line, secman=secman, source="stdin", quarantine_path=quarantine_path)
+            handle_line(line, secman=secman, source="stdin", quarantine_path=quarantine_path, admitted=True)
     except KeyboardInterrupt:
         print("\n[GROUND] Empfang manuell gestoppt.")
 
 # ==== CLI ==== #
 
+def _dispatch(args: argparse.Namespace, secman: Optional[object]) -> None:
+    """Startet den gewählten Empfangsmodus (profilierter Abschnitt)."""
+    if args.simulate:
+        receive_simulated(
+            n=args.simulate_count,
+            secman=secman,
+            quarantine_path=args.quarantine_csv
+        )
+    elif args.file:
+        checkpoint = None
+        if not args.no_checkpoint:
+            from cube.ground.config.paths import CHECKPOINT_DIR
+            from cube.ground.checkpoint import default_checkpoint_path
+            checkpoint = args.checkpoint or default_checkpoint_path(CHECKPOINT_DIR, args.file)
+        receive_from_file(
+            args.file,
+            secman=secman,
+            quarantine_path=args.quarantine_csv,
+            checkpoint_path=checkpoint,
+            checkpoint_every=args.checkpoint_every,
+            from_start=args.from_start,
+            follow=args.follow,
+            repair_sinks=args.repair_sinks,
+        )
+    elif args.watch_dir:
+        receive_from_spool(
+            args.watch_dir,
+            secman=secman,
+            quarantine_path=args.quarantine_csv,
+            workers=args.watch_workers,
+            poll_interval=args.watch_poll,
+            settle_seconds=args.watch_settle,
+            use_inotify=False if args.watch_polling else None,
+        )
+    elif args.stdin:
+        receive_from_stdin(secman=secman, quarantine_path=args.quarantine_csv)
+    else:
+        print("[GROUND] Receiver bereit. --simulate | --file <pfad> | --watch-dir <verz> | --stdin")
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Ground Receiver – CSV-Telemetrie mit Adaptiver Sicherheit")
     parser.add_argument("--simulate", action="store_true", help="Simulierter Empfang")
@@ -235,34 +632,78 @@ def main() -> int:
         default=3,
         help="Anzahl simulierter Pakete im Simulationsmodus"
     )
-    parser.add_argument("--file", type=Path, help="CSV-Datei einlesen")
+    parser.add_argument("--file", type=Path,
+                        help="CSV-Datei einlesen; mit Checkpoint setzt ein erneuter Lauf hinter dem gesicherten "
+                             "Stand fort (fertige Dateien werden nicht erneut gelesen, s. --from-start)")
+    parser.add_argument("--checkpoint", type=Path, default=None,
+                        help="Checkpoint-Datei für --file (Standard: data/checkpoints/<datei>.<hash>.json)")
+    parser.add_argument("--checkpoint-every", type=int, default=1000,
+                        help="Checkpoint alle N Pakete. At-least-once: nach einem Absturz werden bis zu N "
+                             "Pakete erneut verarbeitet und in die Sinks geschrieben (s. --repair-sinks)")
+    parser.add_argument("--no-checkpoint", action="store_true", help="--file ohne Checkpoint/Fortsetzen verarbeiten")
+    parser.add_argument("--from-start", action="store_true", help="vorhandenen Checkpoint ignorieren und von vorn lesen")
+    parser.add_argument("--repair-sinks", action="store_true",
+                        help="beim Fortsetzen Sinks auf den Checkpoint-Stand kürzen (nur ohne andere Schreiber)")
+    parser.add_argument("--follow", action="store_true", help="--file: wachsende Datei weiterlesen (Ctrl+C beendet)")
     parser.add_argument("--stdin", action="store_true", help="Lesen von STDIN")
+    parser.add_argument("--watch-dir", type=Path, default=None,
+                        help="Spool-Verzeichnis überwachen, fertige Dateien einlesen und archivieren")
+    parser.add_argument("--watch-workers", type=int, default=4, help="Parallel eingelesene Dateien (--watch-dir)")
+    parser.add_argument("--watch-poll", type=float, default=1.0, help="Abfrageintervall in Sekunden (--watch-dir)")
+    parser.add_argument("--watch-settle", type=float, default=2.0,
+                        help="Polling: Datei gilt als fertig nach N Sekunden ohne Änderung")
+    parser.add_argument("--watch-polling", action="store_true", help="Polling erzwingen, auch wenn inotify verfügbar ist")
     parser.add_argument("--security-policy", default="configs/security_policy.yaml", help="Pfad zur Sicherheits-Policy (YAML)")
     parser.add_argument("--security-log", default=None, help="Override Security-Log-Pfad")
     parser.add_argument("--security-audit", default=None, help="Override Security-Audit-JSONL-Pfad")
+    parser.add_argument("--security-audit-db", default=None, help="Audit zusätzlich in SQLite schreiben (Pfad)")
     parser.add_argument("--quarantine-csv", type=Path, default=Path("data/quarantine/telemetry.csv"),
                         help="Pfad für Quarantäne-CSV bei aktivem Lockout (Policy=quarantine)")
+    parser.add_argument("--anomaly-action", choices=("divert", "tag", "off"), default="divert",
+                        help="Unplausible signierte Werte: nach ANOMALIES umleiten, in PROCESSED markieren oder nicht prüfen")
+    parser.add_argument("--log-mode", choices=("verbose", "summary"), default=None,
+                        help="Konsole: eine Zeile pro Paket oder periodische Zusammenfassung (Standard: Policy log_mode)")
+    parser.add_argument("--clock", choices=("wall", "event"), default=None,
+                        help="Zeitbasis für Fenster/Lockout: Wanduhr oder Paket-Zeitstempel "
+                             "(event: beschleunigte Replays mit --file; Standard: Policy clock)")
+    parser.add_argument("--summary-every", type=float, default=None,
+                        help="Intervall der Zusammenfassung in Sekunden (Standard: Policy log_summary_seconds)")
+    parser.add_argument("--link-stats-every", type=float, default=30.0,
+                        help="Link-Kennzahlen (Verlust, Bursts, Umordnung) alle N Sekunden veröffentlichen")
+    parser.add_argument("--profile", choices=("cpu", "mem"), default=None,
+                        help="Empfangsschleife profilieren: cpu (cProfile + collapsed stacks) oder mem (tracemalloc)")
+    parser.add_argument("--profile-dir", type=Path, default=None, help="Zielordner für Profile (Standard: data/profiles)")
     args = parser.parse_args()
+    PLAUSIBILITY.action = args.anomaly_action
+    LINKS.publish_interval = args.link_stats_every
 
     # SecurityManager-Init, tolerant bei fehlender Policy/Modul
     try:
-        secman = SecurityManager(args.security_policy, security_log_path=args.security_log, audit_log_path=args.security_audit)
+        secman = SecurityManager(args.security_policy, security_log_path=args.security_log, audit_log_path=args.security_audit,
+                                 audit_db_path=args.security_audit_db, log_mode=args.log_mode, clock=args.clock)
     except Exception as e:
         print(f"[SECURITY] Adaptive Security deaktiviert ({e})")
         secman = None
+    SUMMARY.configure(
+        args.log_mode or getattr(secman, "log_mode", "verbose"),
+        args.summary_every or getattr(secman, "log_summary_seconds", 10.0),
+    )
 
-    if args.simulate:
-        receive_simulated(
-            n=args.simulate_count,
-            secman=secman,
-            quarantine_path=args.quarantine_csv
-        )
-    elif args.file:
-        receive_from_file(args.file, secman=secman, quarantine_path=args.quarantine_csv)
-    elif args.stdin:
-        receive_from_stdin(secman=secman, quarantine_path=args.quarantine_csv)
-    else:
-        print("[GROUND] Receiver bereit. --simulate | --file <pfad> | --stdin")
+    profile = contextlib.nullcontext()
+    if args.profile:
+        from cube.ground.profiling import profile_section
+        profile = profile_section(args.profile, "receiver", args.profile_dir)
+
+    try:
+        with profile:
+            _dispatch(args, secman)
+    finally:
+        # Offene Rollup-Buckets, Zusammenfassung und gepuffertes Audit auch bei Abbruch sichern
+        ROLLUPS.flush()
+        SUMMARY.close()
+        publish_link_stats(secman)
+        if secman and hasattr(secman, "close"):
+            secman.close()
     return 0
 
 if __name__ == "__main__":
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+rollup.py – Inkrementelle Aggregate (Rollups) für Langzeitansichten
+
+Der Receiver meldet jedes verifizierte Paket (ts, Messwerte) an einen RollupWriter.
+Pro Auflösung (1 Minute, 1 Stunde) werden höchstens 'max_open' offene
+Buckets im Speicher gehalten (Standard 1); sobald ein neuer Bucket diese
+Zahl überschreitet, wird der älteste als eine CSV-Zeile neben PROC_PATH
+angehängt:
+
+    data/processed/telemetry_1m.csv
+    data/processed/telemetry_1h.csv
+
+Spalten: bucket_ts,count,<kanal>_min,<kanal>_max,<kanal>_mean,<kanal>_last,last_ts
+'last' ist der Wert mit dem jüngsten Zeitstempel im Bucket, 'last_ts' dessen
+Unix-Zeit. Verspätete Zeilen (älter als alle offenen Buckets) und Neustarts
+erzeugen zusätzliche Zeilen für denselben Bucket – Leser fassen sie zusammen
+(count-gewichteter Mittelwert, min/max, 'last' der Zeile mit dem größten
+last_ts – nicht der zuletzt geschriebenen). Ältere Dateien ohne 'last_ts'
+bleiben lesbar (ROLLUP_COLUMNS; fehlender Wert → Dateireihenfolge).
+"""
+
+from __future__ import annotations
+
+import datetime
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# Auflösungen: Label → Bucketbreite in Sekunden (fein → grob)
+RESOLUTIONS: Dict[str, int] = {"1m": 60, "1h": 3600}
+
+# Aggregierte Kanäle (Spaltennamen wie in CSV_HEADER)
+CHANNELS = ("temperature_c", "humidity_pct", "pressure_hpa")
+STATS = ("min", "max", "mean", "last")
+
+ROLLUP_COLUMNS = ["bucket_ts", "count"] + [f"{c}_{s}" for c in CHANNELS for s in STATS] + ["last_ts"]
+ROLLUP_HEADER = ",".join(ROLLUP_COLUMNS)
+
+
+def rollup_path(base: Path, label: str) -> Path:
+    """Pfad der Rollup-Datei neben der Basisdatei: telemetry.csv → telemetry_1m.csv"""
+    return base.with_name(f"{base.stem}_{label}{base.suffix}")
+
+
+class _Bucket:
+    """Offener Aggregations-Bucket einer Auflösung (O(1) Zustand)."""
+
+    __slots__ = ("start", "count", "mins", "maxs", "sums", "lasts", "last_ts")
+
+    def __init__(self, start: int):
+        self.start = start
+        self.count = 0
+        n = len(CHANNELS)
+        self.mins = [float("inf")] * n
+        self.maxs = [float("-inf")] * n
+        self.sums = [0.0] * n
+        self.lasts = [0.0] * n
+        self.last_ts = float("-inf")
+
+    def add(self, ts: float, values: Sequence[float]) -> None:
+        self.count += 1
+        for i, v in enumerate(values):
+            if v < self.mins[i]:
+                self.mins[i] = v
+            if v > self.maxs[i]:
+                self.maxs[i] = v
+            self.sums[i] += v
+        if ts >= self.last_ts:  # nach Zeitstempel, nicht nach Ankunft
+            self.last_ts = ts
+            self.lasts = list(values)
+
+    def to_line(self) -> str:
+        ts = datetime.datetime.fromtimestamp(self.start, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        fields: List[str] = [ts, str(self.count)]
+        for i in range(len(CHANNELS)):
+            fields += [f"{self.mins[i]:.2f}", f"{self.maxs[i]:.2f}",
+                       f"{self.sums[i] / self.count:.4f}", f"{self.lasts[i]:.2f}"]
+        fields.append(f"{self.last_ts:.3f}")
+        return ",".join(fields)
+
+
+class RollupWriter:
+    """
+    Pflegt Minuten-/Stunden-Aggregate inkrementell.
+    Dateien werden nur beim Schließen eines Buckets geschrieben
+    (höchstens einmal pro Minute), nicht pro Paket.
+    """
+
+    def __init__(self, base_path: Path, resolutions: Optional[Dict[str, int]] = None, max_open: int = 1):
+        self.base_path = base_path
+        self.resolutions = dict(resolutions or RESOLUTIONS)
+        # Offene Buckets pro Auflösung; >1 wenn mehrere Dateien verschränkt eingelesen werden
+        self.max_open = max_open
+        self._open: Dict[str, Dict[int, _Bucket]] = {label: {} for label in self.resolutions}
+
+    def add(self, ts: float, values: Sequence[float]) -> None:
+        """Aktualisiert alle Auflösungen mit einem Messpunkt (NaN/inf werden ignoriert)."""
+        if not all(map(math.isfinite, values)):
+            return
+        for label, width in self.resolutions.items():
+            start = int(ts // width) * width
+            buckets = self._open[label]
+            bucket = buckets.get(start)
+            if bucket is None:
+                if len(buckets) >= self.max_open:
+                    earlier = [b for b in buckets if b < start]
+                    if not earlier:
+                        # Verspätete Zeile: eigener Ein-Zeilen-Bucket, Leser mergen nach bucket_ts
+                        late = _Bucket(start)
+                        late.add(ts, values)
+                        self._write(label, late)
+                        continue
+                    # Vorgänger schließen – bei verschränkten Dateien der Bucket desselben Stroms
+                    self._write(label, buckets.pop(max(earlier)))
+                bucket = buckets[start] = _Bucket(start)
+            bucket.add(ts, values)
+
+    def paths(self) -> List[Path]:
+        """Alle Rollup-Dateien dieses Writers (z. B. für Checkpoints)."""
+        return [rollup_path(self.base_path, label) for label in self.resolutions]
+
+    def flush(self) -> None:
+        """Schreibt offene Buckets (z. B. bei Programmende)."""
+        for label, buckets in self._open.items():
+            for start in sorted(buckets):
+                if buckets[start].count:
+                    self._write(label, buckets[start])
+            buckets.clear()
+
+    close = flush
+
+    def _write(self, label: str, bucket: _Bucket) -> None:
+        path = rollup_path(self.base_path, label)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header_needed = not path.exists() or path.stat().st_size == 0
+        with path.open("a", encoding="utf-8", newline="") as f:
+            if header_needed:
+                f.write(ROLLUP_HEADER + "\n")
+            f.write(bucket.to_line() + "\n")
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+spool.py – Überwachung eines Spool-Verzeichnisses für Überflug-Dumps
+
+Ablauf:
+  1) Fertige Dateien erkennen
+       • inotify (IN_CLOSE_WRITE / IN_MOVED_TO), falls das optionale Paket
+         'inotify_simple' installiert ist (nur Linux)
+       • sonst Polling: Datei gilt als fertig, wenn Größe und mtime
+         'settle_seconds' lang unverändert sind
+     Versteckte Dateien (.*) und Endungen .tmp/.part werden ignoriert –
+     Schreiber sollten unter solchem Namen schreiben und dann umbenennen.
+  2) Mehrere Dateien parallel einlesen (Thread-Pool); jede Datei wird von
+     genau einem Worker sequentiell verarbeitet → Reihenfolge pro Datei bleibt.
+  3) Fertige Datei nach ARCHIVE_DIR/<YYYY-MM-DD>/ verschieben, fehlerhafte
+     nach <spool>/failed/.
+  4) Pro Datei Durchsatz (Pakete/s) und Latenz (fertig erkannt → archiviert) melden.
+"""
+
+from __future__ import annotations
+
+import datetime
+import shutil
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+
+IGNORED_SUFFIXES = (".tmp", ".part")
+
+
+def _is_candidate(path: Path) -> bool:
+    return path.is_file() and not path.name.startswith(".") and path.suffix not in IGNORED_SUFFIXES
+
+
+def _ready_by_polling(spool_dir: Path, settle_seconds: float, poll_interval: float,
+                      stop: threading.Event) -> Iterator[Path]:
+    """Liefert Dateien, deren Größe/mtime seit 'settle_seconds' stabil sind."""
+    seen: Dict[Path, tuple] = {}
+    while not stop.is_set():
+        now = time.monotonic()
+        present = set()
+        for p in spool_dir.iterdir():
+            if not _is_candidate(p):
+                continue
+            present.add(p)
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            sig = (st.st_size, st.st_mtime_ns)
+            prev = seen.get(p)
+            if prev is None or prev[0] != sig:
+                seen[p] = (sig, now)
+            elif now - prev[1] >= settle_seconds:
+                yield p
+        for p in list(seen):
+            if p not in present:
+                del seen[p]
+        stop.wait(poll_interval)
+
+
+def _ready_by_inotify(spool_dir: Path, poll_interval: float, stop: threading.Event) -> Iterator[Path]:
+    """Liefert Dateien bei IN_CLOSE_WRITE / IN_MOVED_TO (plus beim Start vorhandene)."""
+    from inotify_simple import INotify, flags
+
+    ino = INotify()
+    ino.add_watch(str(spool_dir), flags.CLOSE_WRITE | flags.MOVED_TO)
+    try:
+        for p in sorted(spool_dir.iterdir()):
+            if _is_candidate(p):
+                yield p
+        while not stop.is_set():
+            for ev in ino.read(timeout=int(poll_interval * 1000)):
+                p = spool_dir / ev.name
+                if _is_candidate(p):
+                    yield p
+    finally:
+        ino.close()
+
+
+def inotify_available() -> bool:
+    try:
+        import inotify_simple  # noqa: F401
+        return True
+    except Exception:
+        return False
+
+
+def _archive(path: Path, archive_dir: Path) -> Path:
+    """Verschiebt nach archive_dir/<YYYY-MM-DD>/; Namenskollisionen bekommen ein Suffix."""
+    day_dir = archive_dir / datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d")
+    day_dir.mkdir(parents=True, exist_ok=True)
+    target = day_dir / path.name
+    n = 1
+    while target.exists():
+        target = day_dir / f"{path.stem}.{n}{path.suffix}"
+        n += 1
+    shutil.move(str(path), str(target))
+    return target
+
+
+def watch_directory(
+    spool_dir: Path,
+    archive_dir: Path,
+    ingest: Callable[[Path], int],
+    workers: int = 4,
+    poll_interval: float = 1.0,
+    settle_seconds: float = 2.0,
+    use_inotify: Optional[bool] = None,
+    stop: Optional[threading.Event] = None,
+    on_done: Optional[Callable[[Path], None]] = None,
+) -> None:
+    """
+    Überwacht 'spool_dir' bis 'stop' gesetzt wird (oder Ctrl+C).
+    'ingest(path)' verarbeitet eine Datei und liefert die Paketanzahl;
+    'on_done(path)' wird nach erfolgreichem Archivieren aufgerufen
+    (z. B. um den Checkpoint zu löschen).
+    """
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    stop = stop or threading.Event()
+    if use_inotify is None:
+        use_inotify = inotify_available()
+    source = (_ready_by_inotify(spool_dir, poll_interval, stop) if use_inotify
+              else _ready_by_polling(spool_dir, settle_seconds, poll_interval, stop))
+    mode = "inotify" if use_inotify else f"polling (settle={settle_seconds}s)"
+    print(f"[SPOOL] Überwache {spool_dir} mit {workers} Workern, Erkennung: {mode}")
+
+    in_flight: Dict[Path, Future] = {}
+    lock = threading.Lock()
+
+    def run(path: Path, detected: float) -> None:
+        t0 = time.monotonic()
+        try:
+            try:
+                packets = ingest(path)
+            except (Exception, SystemExit) as e:
+                failed_dir = spool_dir / "failed"
+                failed_dir.mkdir(exist_ok=True)
+                shutil.move(str(path), str(failed_dir / path.name))
+                print(f"[SPOOL] FEHLER {path.name}: {e} → {failed_dir}")
+                return
+            busy = time.monotonic() - t0
+            target = _archive(path, archive_dir)
+            if on_done:
+                on_done(path)
+            latency = time.monotonic() - detected
+            rate = packets / busy if busy > 0 else float("inf")
+            print(f"[SPOOL] {path.name}: {packets} Pakete in {busy:.2f}s ({rate:.0f} pkt/s), "
+                  f"Latenz {latency:.2f}s → {target}")
+        finally:
+            # Erst nach dem Verschieben freigeben – sonst könnte die Datei erneut eingeplant werden
+            with lock:
+                in_flight.pop(path, None)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="spool") as pool:
+        try:
+            for path in source:
+                with lock:
+                    if path in in_flight or not path.exists():
+                        continue
+                    in_flight[path] = pool.submit(run, path, time.monotonic())
+        except KeyboardInterrupt:
+            print("\n[SPOOL] Überwachung gestoppt – laufende Dateien werden abgeschlossen …")
+            stop.set()
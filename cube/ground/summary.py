@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+summary.py – Konsolen-Ausgabe des Receivers: pro Paket oder als Zusammenfassung
+
+Modi:
+  • verbose – wie bisher eine Zeile pro Paket ("[OK] processed", "[REJECTED] …")
+  • summary – Pakete werden nur gezählt (Ergebnis + Grund); alle 'interval'
+              Sekunden erscheint eine Zeile mit Rate und Zählern, z. B.
+
+      [SUMMARY] 10.0s 5321 Pakete (532.1/s) | processed=5300 rejected=21 (invalid_signature=20, malformed_packet=1)
+
+Im summary-Modus schreibt ein Timer-Thread fällige Zeilen auch dann, wenn
+keine Pakete mehr kommen; close() gibt das angebrochene Intervall aus.
+Seltene Ereignisse (Lockout, Policy-Reload) meldet der SecurityManager in
+beiden Modi sofort. Bei hohen Paketraten ist die Terminal-Ausgabe sonst der
+Engpass der Station.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import weakref
+from typing import Dict, Optional, TextIO
+
+LOG_MODES = ("verbose", "summary")
+
+
+def _tick_loop(ref: "weakref.ReferenceType[OutcomeSummary]", stop: threading.Event, period: float):
+    """Hintergrund-Thread: fällige Zusammenfassung auch ohne neue Pakete ausgeben."""
+    while not stop.wait(period):
+        summary = ref()
+        if summary is None:
+            return
+        summary.tick()
+        del summary
+
+
+class OutcomeSummary:
+    """Zählt Paket-Ergebnisse und gibt sie periodisch zusammengefasst aus."""
+
+    def __init__(self, mode: str = "verbose", interval: float = 10.0, out: Optional[TextIO] = None):
+        self.mode = mode
+        self.interval = interval
+        self.out = out
+        self._lock = threading.Lock()
+        self._ticker_stop = threading.Event()
+        self._ticker: Optional[threading.Thread] = None
+        self._reset(time.monotonic())
+
+    @property
+    def verbose(self) -> bool:
+        return self.mode != "summary"
+
+    def configure(self, mode: str, interval: Optional[float] = None) -> None:
+        if mode not in LOG_MODES:
+            raise ValueError(f"log_mode muss eines von {LOG_MODES} sein")
+        self.flush()
+        self.mode = mode
+        if interval is not None:
+            self.interval = interval
+        with self._lock:
+            self._reset(time.monotonic())
+        if not self.verbose and self._ticker is None:
+            self._ticker = threading.Thread(
+                target=_tick_loop,
+                args=(weakref.ref(self), self._ticker_stop, min(1.0, self.interval)),
+                name="summary-tick",
+                daemon=True,
+            )
+            self._ticker.start()
+
+    def record(self, outcome: str, reason: Optional[str] = None, text: Optional[str] = None) -> None:
+        """
+        Ein Paket-Ergebnis (processed/rejected/anomaly/locked) mit optionalem Grund.
+        'text' ist die Einzelzeile für den verbose-Modus.
+        """
+        if self.verbose:
+            if text:
+                print(text, file=self.out or sys.stdout)
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._total += 1
+            self._outcomes[outcome] = self._outcomes.get(outcome, 0) + 1
+            if reason:
+                key = (outcome, reason)
+                self._reasons[key] = self._reasons.get(key, 0) + 1
+            if now < self._next:
+                return
+            line = self._format(now)
+            self._reset(now)
+        print(line, file=self.out or sys.stdout, flush=True)
+
+    def tick(self) -> None:
+        """Gibt die Zusammenfassung aus, wenn das Intervall abgelaufen ist (Timer-Thread)."""
+        if not self.verbose and time.monotonic() >= self._next:
+            self.flush()
+
+    def close(self) -> None:
+        """Timer beenden und das angebrochene Intervall ausgeben (Programmende)."""
+        self._ticker_stop.set()
+        self.flush()
+
+    def flush(self) -> None:
+        """Gibt die laufende Zusammenfassung aus (z. B. bei Programmende)."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._total:
+                return
+            line = self._format(now)
+            self._reset(now)
+        print(line, file=self.out or sys.stdout, flush=True)
+
+    def _reset(self, now: float) -> None:
+        self._since = now
+        self._next = now + self.interval
+        self._total = 0
+        self._outcomes: Dict[str, int] = {}
+        self._reasons: Dict[tuple, int] = {}
+
+    def _format(self, now: float) -> str:
+        span = max(now - self._since, 1e-9)
+        parts = []
+        for outcome, count in sorted(self._outcomes.items()):
+            reasons = sorted((r, n) for (o, r), n in self._reasons.items() if o == outcome)
+            detail = f" ({', '.join(f'{r}={n}' for r, n in reasons)})" if reasons else ""
+            parts.append(f"{outcome}={count}{detail}")
+        return f"[SUMMARY] {span:.1f}s {self._total} Pakete ({self._total / span:.1f}/s) | " + " ".join(parts)
@@ -5,14 +5,19 @@ verify.py – HMAC-Signaturprüfung für Telemetriedaten
 Funktionen:
  - Lädt geheimen Schlüssel aus config/ground.json oder Umgebungsvariable
  - Verifiziert HMAC-SHA256-Signaturen
+ - Schlüsselbund mit Schlüssel-IDs für Pakete (config/keyring.json, siehe keyring.py)
  - Wird vom Receiver-Modul verwendet
 """
 
 import hmac, hashlib, binascii, json, os, pathlib
+from typing import Tuple
 
 # --- Neue Sektion: Laden der Konfiguration ---
 HERE = pathlib.Path(__file__).resolve().parent
 CFG_PATH = HERE / "config" / "ground.json"
+# Schlüsselbund (überschreibbar per HMAC_KEYRING); fehlt er, gilt der Einzelschlüssel
+KEYRING_PATH = pathlib.Path(os.getenv("HMAC_KEYRING") or HERE / "config" / "keyring.json")
+DEFAULT_KEY_ID = "k1"
 
 def _load_secret_hex() -> str:
     """
@@ -51,3 +56,57 @@ def verify_with_config(payload_bytes: bytes, mac_hex: str) -> bool:
     """Lädt den geheimen Schlüssel automatisch aus config/ground.json."""
     secret = _load_secret_hex()
     return verify(secret, payload_bytes, mac_hex)
+
+
+def _load_legacy_key() -> Tuple[str, str]:
+    """
+    Einzelschlüssel ohne Schlüsselbund: (Schlüssel-ID, Hex). Die ID kommt aus
+    HMAC_KEY_ID bzw. ground.json ("hmac_key_id"), Standard "k1" wie in mission.json.
+    """
+    secret_hex = _load_secret_hex()
+    key_id = os.getenv("HMAC_KEY_ID")
+    if not key_id and CFG_PATH.exists():
+        with open(CFG_PATH, "r", encoding="utf-8") as f:
+            key_id = json.load(f).get("hmac_key_id")
+    return (key_id or DEFAULT_KEY_ID).strip(), secret_hex
+
+
+_KEYRING = None
+
+
+def get_keyring():
+    """Prozessweiter Schlüsselbund (lazy, lädt Änderungen ohne Neustart nach)."""
+    global _KEYRING
+    if _KEYRING is None:
+        from cube.ground.keyring import Keyring
+        _KEYRING = Keyring(KEYRING_PATH, legacy_secret=_load_legacy_key)
+    return _KEYRING
+
+
+def check_packet(pkt) -> str:
+    """
+    Prüft ein Packet über den Schlüsselbund (Schlüssel-ID → vorberechneter
+    HMAC-Zustand, Gültigkeit gegen den Paket-Zeitstempel). Liefert den Grund:
+    ok | invalid_signature | unknown_key_id | key_not_valid
+    """
+    return get_keyring().check(pkt.key_id, pkt.ts, pkt.payload, pkt.mac)
+
+
+def line_signature_ok(line: str) -> bool:
+    """
+    Nur die HMAC-Signatur einer Rohzeile prüfen – ohne Messwerte zu parsen und
+    ohne Gültigkeitsfenster (Zulassung bei erschöpfter Quelle; die vollständige
+    Prüfung folgt in handle_line). Widerrufene Schlüssel gelten nie.
+    """
+    payload, _, sig = line.rstrip("\r\n").rpartition(",")
+    key_id, sep, mac_hex = sig.strip().rpartition(":")
+    try:
+        mac = bytes.fromhex(mac_hex)
+    except ValueError:
+        return False
+    return get_keyring().authentic(key_id if sep else None, payload.encode("utf-8"), mac)
+
+
+def known_key_id(key_id: str) -> bool:
+    """True, wenn die (noch ungeprüfte) Schlüssel-ID im Schlüsselbund steht."""
+    return get_keyring().known(key_id)
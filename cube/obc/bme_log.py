@@ -6,6 +6,8 @@ HERE = pathlib.Path(__file__).resolve().parent
 CFG = json.load(open(HERE / "config" / "mission.json", "r"))
 CSV_PATH = pathlib.Path(CFG["csv_path"])
 CSV_PATH.parent.mkdir(parents=True, exist_ok=True)
+# Letzte vergebene Sequenznummer (überlebt Neustarts → monoton steigend)
+SEQ_PATH = CSV_PATH.with_name(CSV_PATH.name + ".seq")
 
 
 def sign_csv(payload_str: str, secret_hex: str) -> str:
@@ -13,30 +15,56 @@ def sign_csv(payload_str: str, secret_hex: str) -> str:
     key = binascii.unhexlify(secret_hex.strip())
     return hmac.new(key, payload_str.encode("utf-8"), hashlib.sha256).hexdigest()
 
+def load_seq(path: pathlib.Path) -> int:
+    """Nächste Sequenznummer: gespeicherte + 1, sonst 0."""
+    try:
+        return int(path.read_text().strip()) + 1
+    except (OSError, ValueError):
+        return 0
+
+def save_seq(path: pathlib.Path, seq: int) -> None:
+    """Speichert die zuletzt vergebene (reservierte) Sequenznummer atomar."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        f.write(str(seq))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
 def write_header_if_needed(path):
     if not path.exists() or path.stat().st_size == 0:
         with open(path, "w", newline="") as f:
             w = csv.writer(f)
-            w.writerow(["ts","temperature_c","humidity_pct","pressure_hpa","mode","sig"])
+            w.writerow(["ts","temperature_c","humidity_pct","pressure_hpa","mode","seq","sig"])
 
 def main():
     sensor = BME280Reader()
     write_header_if_needed(CSV_PATH)
-    interval = int(CFG["interval_sec"])
-    secret_hex = CFG["hmac_secret"]
+    interval = int(CFG["sample_interval_sec"])
+    secret_hex = CFG["secret_hex"]
+    # Schlüssel-ID vor der Signatur: Bodenstation wählt den Schlüssel im Schlüsselbund
+    key_id = CFG.get("key_id")
+    seq = load_seq(SEQ_PATH)
 
     print(f"[OBC] logging to {CSV_PATH} every {interval}s ... Ctrl+C to stop")
     while True:
         d = sensor.read()
 
-        payload = f"{d['ts']},{d['temperature_c']:.2f},{d['humidity_pct']:.2f},{d['pressure_hpa']:.2f},{d['mode']}"
+        # Nummer vor dem Schreiben reservieren: ein Absturz dazwischen hinterlässt
+        # nur eine Lücke (seq_gap), nie ein signiertes Duplikat (seq_duplicate → Reject)
+        save_seq(SEQ_PATH, seq)
+
+        # Sequenznummer steht vor der Signatur → mitsigniert
+        payload = f"{d['ts']},{d['temperature_c']:.2f},{d['humidity_pct']:.2f},{d['pressure_hpa']:.2f},{d['mode']},{seq}"
         sig = sign_csv(payload, secret_hex)
+        sig_field = f"{key_id}:{sig}" if key_id else sig
 
 
         with open(CSV_PATH, "a", newline="") as f:
             writer = csv.writer(f)
             writer.writerow([d["ts"], f"{d['temperature_c']:.2f}", f"{d['humidity_pct']:.2f}",
-                             f"{d['pressure_hpa']:.2f}", d["mode"], sig])
+                             f"{d['pressure_hpa']:.2f}", d["mode"], seq, sig_field])
+        seq += 1
 
         print("[OBC]", payload, "->", sig[:8])
         time.sleep(interval)
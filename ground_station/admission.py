@@ -0,0 +1,209 @@
+"""
+Admission – Token-Bucket-Zulassung vor der Verifikation (Flut-Abwehr)
+
+Jede Zeile einer Live-Quelle muss vor Parsen, HMAC und SecurityManager-Fenster
+einen Token ziehen – zuerst aus dem Eimer ihrer Quelle, dann aus dem globalen:
+
+    Token-Bucket: 'rate' Tokens/s, höchstens 'burst' auf Vorrat
+
+Pakete ohne Token werden verworfen (over_limit: drop) oder nur gezählt
+(over_limit: count – Beobachtungsmodus zum Einmessen der Raten). Ein
+verworfenes Paket kostet höchstens drei Eimer-Updates und einen Zähler: kein
+Ereignis im Fenster, kein Schreibzugriff und – jenseits des Prüf-Budgets (s. u.) –
+keine HMAC-Prüfung. Zusammengefasst gemeldet wird höchstens alle
+'report_seconds' (siehe SecurityManager.admit).
+
+Quellen-Eimer sind auf 'max_sources' begrenzt; weitere Quellen teilen sich
+einen Überlauf-Eimer, damit wechselnde Quellnamen den Speicher nicht füllen.
+
+Der Quellen-Schlüssel (z. B. beanspruchte Schlüssel-ID) ist vor der
+Verifikation ungeprüft – ein Angreifer kann ihn fälschen und den Eimer einer
+echten Quelle leeren. Ist der Quellen-Eimer leer, entscheidet deshalb ein
+optionaler verify()-Callback (nur HMAC, kein Audit/Sink): gültig signierte
+Pakete passieren (weiter begrenzt durch den globalen Eimer), gefälschte werden
+verworfen. Jede dieser Prüfungen zieht einen Token aus einem eigenen kleinen
+Prüf-Eimer der Quelle ('verify_rate'/'verify_burst'); ist auch er leer, wird
+ohne HMAC verworfen (Grund "rate_verify") – eine Flut mit gefälschter ID kostet
+so höchstens 'verify_rate' HMAC-Prüfungen pro Sekunde.
+"""
+
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+OVER_LIMIT_ACTIONS = ("drop", "count")
+OVERFLOW_SOURCE = "<overflow>"
+
+
+def parse_admission(raw: Any) -> Dict[str, Any]:
+    """
+    Validiert den Policy-Abschnitt 'admission' und liefert normalisierte Werte.
+    Fehlt der Abschnitt, ist die Zulassung deaktiviert. Wirft ValueError.
+    """
+    if raw is None:
+        raw = {"enabled": False}
+    if not isinstance(raw, dict):
+        raise ValueError("admission muss ein Mapping sein")
+    try:
+        cfg = {
+            "enabled": bool(raw.get("enabled", True)),
+            "per_source_rate": float(raw.get("per_source_rate", 200)),
+            "per_source_burst": float(raw.get("per_source_burst", 400)),
+            "global_rate": float(raw.get("global_rate", 1000)),
+            "global_burst": float(raw.get("global_burst", 2000)),
+            "verify_rate": float(raw.get("verify_rate", 50)),
+            "verify_burst": float(raw.get("verify_burst", 100)),
+            "max_sources": int(raw.get("max_sources", 256)),
+            "over_limit": str(raw.get("over_limit", "drop")),
+            "exempt_sources": sorted(str(s) for s in (raw.get("exempt_sources") or [])),
+            "report_seconds": float(raw.get("report_seconds", 10)),
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"ungültiger admission-Wert: {e}")
+
+    if min(cfg["per_source_rate"], cfg["global_rate"], cfg["verify_rate"]) < 0:
+        raise ValueError("admission: Raten dürfen nicht negativ sein (0 = unbegrenzt)")
+    if min(cfg["per_source_burst"], cfg["global_burst"], cfg["verify_burst"]) < 1:
+        raise ValueError("admission: burst muss >= 1 sein")
+    if cfg["max_sources"] < 1:
+        raise ValueError("admission: max_sources muss >= 1 sein")
+    if cfg["over_limit"] not in OVER_LIMIT_ACTIONS:
+        raise ValueError(f"admission: over_limit muss eines von {OVER_LIMIT_ACTIONS} sein")
+    if cfg["report_seconds"] <= 0:
+        raise ValueError("admission: report_seconds muss > 0 sein")
+    return cfg
+
+
+class TokenBucket:
+    """Klassischer Token-Bucket; Auffüllen erfolgt beim Zugriff (kein Timer)."""
+
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+
+    def take(self, now: float) -> bool:
+        tokens = self.tokens + (now - self.stamp) * self.rate
+        if tokens > self.burst:
+            tokens = self.burst
+        self.stamp = now
+        if tokens >= 1.0:
+            self.tokens = tokens - 1.0
+            return True
+        self.tokens = tokens
+        return False
+
+
+class AdmissionControl:
+    """
+    Eimer pro Quelle plus globaler Eimer, dazu je Quelle ein Prüf-Eimer für
+    die HMAC-Prüfung bei erschöpfter Quelle. admit() ist der Hot-Path und
+    liefert (zugelassen, Grund) mit Grund "rate_source" / "rate_verify" / "rate_global".
+    """
+
+    def __init__(self, cfg: Optional[Dict[str, Any]] = None):
+        self._lock = threading.Lock()
+        self._sources: Dict[str, TokenBucket] = {}
+        self._verify: Dict[str, TokenBucket] = {}  # gleiche Schlüssel wie _sources (also begrenzt)
+        self._global: Optional[TokenBucket] = None
+        self._shed: Dict[Tuple[str, str], int] = {}
+        self.next_report = time.monotonic()
+        self.configure(cfg or parse_admission(None))
+
+    def configure(self, cfg: Dict[str, Any]) -> None:
+        """Übernimmt (neue) Raten; Eimer starten voll, Zähler bleiben erhalten."""
+        now = time.monotonic()
+        with self._lock:
+            self.enabled = cfg["enabled"]
+            self.per_source_rate = cfg["per_source_rate"]
+            self.per_source_burst = cfg["per_source_burst"]
+            self.verify_rate = cfg["verify_rate"]
+            self.verify_burst = cfg["verify_burst"]
+            self.max_sources = cfg["max_sources"]
+            self.drop = cfg["over_limit"] == "drop"
+            self.exempt_sources = frozenset(cfg["exempt_sources"])
+            self.report_seconds = cfg["report_seconds"]
+            self._sources.clear()
+            self._verify.clear()
+            self._global = (TokenBucket(cfg["global_rate"], cfg["global_burst"], now)
+                            if cfg["global_rate"] > 0 else None)
+            self.next_report = now + self.report_seconds
+
+    def exempt(self, source: str) -> bool:
+        """True, wenn Zeilen dieser Eingangsart ohne Eimer passieren (Zulassung aus oder exempt_sources)."""
+        return not self.enabled or source in self.exempt_sources
+
+    def admit(self, source: str, now: float, key: Optional[str] = None,
+              verify: Optional[Callable[[], bool]] = None) -> Tuple[bool, Optional[str]]:
+        """
+        'source' = Eingangsart (exempt_sources), 'key' = Eimer-Schlüssel (Standard: source).
+        'verify' wird nur bei leerem Quellen-Eimer aufgerufen (außerhalb der Sperre).
+        """
+        if self.exempt(source):
+            return True, None
+        source = key or source
+        with self._lock:
+            bucket = None
+            if self.per_source_rate > 0:
+                bucket = self._sources.get(source)
+                if bucket is None:
+                    if len(self._sources) >= self.max_sources:
+                        source = OVERFLOW_SOURCE
+                        bucket = self._sources.get(source)
+                    if bucket is None:
+                        bucket = self._sources[source] = TokenBucket(self.per_source_rate,
+                                                                     self.per_source_burst, now)
+                if not bucket.take(now):
+                    if not self.drop or verify is None:
+                        return self._over_limit(source, "rate_source")
+                    if not self._take_verify(source, now):
+                        return self._over_limit(source, "rate_verify")
+                    bucket = None  # Quelle erschöpft: Echtheit entscheidet (im Prüf-Budget)
+            if bucket is not None or self.per_source_rate <= 0:
+                return self._take_global(source, now, bucket)
+
+        if not verify():
+            with self._lock:
+                return self._over_limit(source, "rate_source")
+        with self._lock:
+            return self._take_global(source, now, None)
+
+    def _take_verify(self, source: str, now: float) -> bool:
+        """Token für eine HMAC-Prüfung der erschöpften Quelle (verify_rate 0 = unbegrenzt)."""
+        if self.verify_rate <= 0:
+            return True
+        bucket = self._verify.get(source)
+        if bucket is None:
+            bucket = self._verify[source] = TokenBucket(self.verify_rate, self.verify_burst, now)
+        return bucket.take(now)
+
+    def _take_global(self, source: str, now: float, bucket: Optional[TokenBucket]) -> Tuple[bool, Optional[str]]:
+        if self._global is not None and not self._global.take(now):
+            if bucket is not None:
+                bucket.tokens += 1.0  # Quelle nicht für globale Überlast bestrafen
+            return self._over_limit(source, "rate_global")
+        return True, None
+
+    def _over_limit(self, source: str, reason: str) -> Tuple[bool, Optional[str]]:
+        key = (source, reason)
+        self._shed[key] = self._shed.get(key, 0) + 1
+        return not self.drop, reason
+
+    def take_report(self, now: float) -> Optional[Dict[str, Dict[str, int]]]:
+        """
+        Liefert die seit dem letzten Bericht verworfenen/gezählten Pakete
+        ({quelle: {grund: anzahl}}) und setzt die Zähler zurück; None ohne Überlast.
+        """
+        with self._lock:
+            self.next_report = now + self.report_seconds
+            if not self._shed:
+                return None
+            shed, self._shed = self._shed, {}
+        report: Dict[str, Dict[str, int]] = {}
+        for (source, reason), n in shed.items():
+            report.setdefault(source, {})[reason] = n
+        return report
@@ -0,0 +1,347 @@
+"""
+AuditStore – Indizierter SQLite-Speicher für das Security-Audit
+
+Funktionen:
+    • SQLite im WAL-Modus, Inserts gebündelt (executemany, eine Transaktion pro Batch)
+    • Indizes auf ts, event, reason, source → Abfragen in Millisekunden statt JSONL-Scan
+    • Direkt vom SecurityManager befüllt (Policy: audit_db_path) oder per Import
+      bestehender security_audit.jsonl (inkrementell, merkt sich den Byte-Offset)
+    • Jeder Datensatz höchstens einmal (ts, event, packet_id, source eindeutig):
+      ein Import der JSONL in eine direkt befüllte DB verdoppelt nichts
+    • CLI für Abfragen und Zusammenfassungen mit Zeit-Buckets
+
+Beispiele:
+    python -m ground_station.audit_store import logs/security_audit.jsonl
+    python -m ground_station.audit_store query --event verify_result --reason invalid_signature \\
+        --source file --since 7d --bucket 1d
+    python -m ground_station.audit_store summary --since 24h
+"""
+
+from __future__ import annotations
+import argparse
+import datetime
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_DB_PATH = "logs/security_audit.sqlite"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit (
+    id        INTEGER PRIMARY KEY,
+    ts        REAL    NOT NULL,
+    event     TEXT    NOT NULL,
+    ok        INTEGER NOT NULL,
+    reason    TEXT,
+    source    TEXT,
+    packet_id TEXT,
+    meta      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_audit_ts     ON audit(ts);
+CREATE INDEX IF NOT EXISTS idx_audit_event  ON audit(event, ts);
+CREATE INDEX IF NOT EXISTS idx_audit_reason ON audit(reason, ts);
+CREATE INDEX IF NOT EXISTS idx_audit_source ON audit(source, ts);
+CREATE TABLE IF NOT EXISTS imports (
+    path   TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+);
+"""
+
+# Eindeutigkeit eines Datensatzes; NULL zählt wie "" (sonst wären NULL-Zeilen nie gleich)
+_UNIQUE_INDEX = ("CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_unique "
+                 "ON audit(ts, event, IFNULL(packet_id, ''), IFNULL(source, ''))")
+_DEDUPE = ("DELETE FROM audit WHERE id NOT IN (SELECT MIN(id) FROM audit "
+           "GROUP BY ts, event, IFNULL(packet_id, ''), IFNULL(source, ''))")
+
+_INSERT = ("INSERT OR IGNORE INTO audit (ts, event, ok, reason, source, packet_id, meta) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+_SPAN_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def _row(rec: Dict[str, Any]) -> Tuple:
+    """Audit-Datensatz (wie in security_audit.jsonl) → Tabellenzeile."""
+    meta = rec.get("meta") or {}
+    if not isinstance(meta, dict):
+        meta = {"value": meta}
+    return (
+        float(rec.get("ts", 0.0)),
+        str(rec.get("event", "")),
+        1 if rec.get("ok") else 0,
+        rec.get("reason"),
+        meta.get("source"),
+        meta.get("packet_id"),
+        json.dumps(meta, ensure_ascii=False, default=str),
+    )
+
+
+def _flush_loop(ref: "weakref.ReferenceType[AuditStore]", stop: threading.Event, interval: float):
+    """Hintergrund-Thread: Puffer alle 'interval' Sekunden schreiben (hält keine starke Referenz)."""
+    while not stop.wait(interval):
+        store = ref()
+        if store is None:
+            return
+        try:
+            if store._buf:
+                store.flush()
+        except sqlite3.Error as e:
+            print(f"[AUDIT] Flush fehlgeschlagen: {e}")
+        del store
+
+
+class AuditStore:
+    """
+    Gebündelter Schreiber + Abfrage-API.
+    add() hängt nur an einen Puffer an; geschrieben wird pro 'batch_size'
+    Datensätze oder spätestens nach 'flush_interval' Sekunden (Timer-Thread,
+    gestartet mit dem ersten add() – auch wenn danach nichts mehr kommt).
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, batch_size: int = 500, flush_interval: float = 1.0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        parent = os.path.dirname(db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._ensure_unique_index()
+
+        self._buf: List[Tuple] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    def _ensure_unique_index(self) -> None:
+        """Legt den Eindeutigkeits-Index an; ältere DBs werden dabei einmalig dedupliziert."""
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_audit_unique'").fetchone()
+        if exists:
+            return
+        with self._conn:
+            self._conn.execute("BEGIN")
+            removed = self._conn.execute(_DEDUPE).rowcount
+            self._conn.execute(_UNIQUE_INDEX)
+        if removed > 0:
+            print(f"[AUDIT] {removed} doppelte Datensätze entfernt ({self.db_path})")
+
+    # ----------------------------------------------------------
+    # Schreiben
+    # ----------------------------------------------------------
+
+    def add(self, rec: Dict[str, Any]) -> None:
+        """Puffert einen Audit-Datensatz (dict mit ts/event/ok/reason/meta)."""
+        with self._lock:
+            self._buf.append(_row(rec))
+            due = (len(self._buf) >= self.batch_size
+                   or time.monotonic() - self._last_flush >= self.flush_interval)
+            if self._flusher is None and self.flush_interval > 0:
+                self._flusher = threading.Thread(
+                    target=_flush_loop,
+                    args=(weakref.ref(self), self._flush_stop, self.flush_interval),
+                    name="audit-store-flush",
+                    daemon=True,
+                )
+                self._flusher.start()
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Schreibt den Puffer in einer Transaktion."""
+        with self._lock:
+            rows, self._buf = self._buf, []
+            self._last_flush = time.monotonic()
+            if not rows:
+                return
+            with self._conn:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(_INSERT, rows)
+
+    def close(self) -> None:
+        self._flush_stop.set()
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._conn.close()
+
+    def import_jsonl(self, jsonl_path: str, batch_size: int = 10000) -> int:
+        """
+        Importiert eine Audit-JSONL-Datei. Der erreichte Byte-Offset wird
+        gespeichert – ein erneuter Import liest nur neu angehängte Zeilen.
+        Bereits vorhandene Datensätze (z. B. direkt vom SecurityManager
+        geschrieben) werden übersprungen. Liefert die Anzahl neuer Datensätze.
+        """
+        key = os.path.abspath(jsonl_path)
+        self.flush()
+        cur = self._conn.execute("SELECT offset FROM imports WHERE path = ?", (key,)).fetchone()
+        offset = cur[0] if cur else 0
+        if os.path.getsize(jsonl_path) < offset:
+            offset = 0  # Datei wurde rotiert/gekürzt
+
+        imported = 0
+        rows: List[Tuple] = []
+        with open(jsonl_path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # unvollständige letzte Zeile – beim nächsten Import
+                offset += len(raw)
+                try:
+                    rows.append(_row(json.loads(raw)))
+                except (ValueError, TypeError, AttributeError):
+                    continue
+                if len(rows) >= batch_size:
+                    imported += self._commit_import(rows, key, offset)
+                    rows = []
+        imported += self._commit_import(rows, key, offset)
+        return imported
+
+    def _commit_import(self, rows: List[Tuple], key: str, offset: int) -> int:
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN")
+            inserted = self._conn.executemany(_INSERT, rows).rowcount if rows else 0
+            self._conn.execute(
+                "INSERT INTO imports (path, offset) VALUES (?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET offset = excluded.offset",
+                (key, offset),
+            )
+        return max(inserted, 0)
+
+    # ----------------------------------------------------------
+    # Abfragen
+    # ----------------------------------------------------------
+
+    def counts(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        event: Optional[str] = None,
+        reason: Optional[str] = None,
+        source: Optional[str] = None,
+        bucket_seconds: Optional[float] = None,
+        group_by: Tuple[str, ...] = (),
+    ) -> List[Tuple]:
+        """
+        Zählt Audit-Datensätze mit optionalen Filtern.
+        Liefert Tupel (bucket_start?, *group_by, count), sortiert nach Bucket.
+        """
+        where, params = [], []
+        for col, val in (("event", event), ("reason", reason), ("source", source)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                params.append(val)
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("ts < ?")
+            params.append(until)
+
+        cols = [c for c in group_by if c in ("event", "reason", "source", "ok")]
+        select = list(cols)
+        if bucket_seconds:
+            select.insert(0, "CAST(ts / ? AS INTEGER) * ? AS bucket")
+            params = [bucket_seconds, bucket_seconds] + params
+        group = (["bucket"] if bucket_seconds else []) + cols
+
+        sql = f"SELECT {', '.join(select + ['COUNT(*)'])} FROM audit"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if group:
+            sql += f" GROUP BY {', '.join(group)} ORDER BY {', '.join(group)}"
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+# --------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------
+
+def _parse_since(text: str) -> float:
+    """'7d' / '24h' / '90m' (relativ) oder ISO-Zeitstempel → Unix-Zeit."""
+    text = text.strip()
+    if text and text[-1].lower() in _SPAN_UNITS and text[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(text[:-1]) * _SPAN_UNITS[text[-1].lower()]
+    try:
+        dt = datetime.datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültige Zeitangabe: {text!r} (z. B. 7d, 24h, 2025-11-19T00:00:00Z)")
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _parse_bucket(text: str) -> float:
+    text = text.strip().lower()
+    try:
+        if text and text[-1] in _SPAN_UNITS:
+            return float(text[:-1]) * _SPAN_UNITS[text[-1]]
+        return float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Ungültige Bucket-Breite: {text!r} (z. B. 1h, 1d)")
+
+
+def _fmt_ts(ts: float) -> str:
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Security-Audit (SQLite): Import, Abfrage, Zusammenfassung")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH, help="Pfad zur Audit-Datenbank")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_imp = sub.add_parser("import", help="security_audit.jsonl importieren (inkrementell)")
+    p_imp.add_argument("jsonl", nargs="+", help="JSONL-Datei(en)")
+
+    for name, help_text in (("query", "gefilterte Zählung mit Zeit-Buckets"),
+                            ("summary", "Zählung nach event/reason")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--since", type=_parse_since, help="ab Zeitpunkt (7d, 24h, ISO)")
+        p.add_argument("--until", type=_parse_since, help="bis Zeitpunkt (exklusiv)")
+        p.add_argument("--event", help="z. B. verify_result, lockout_enabled, lockout_drop")
+        p.add_argument("--reason", help="z. B. invalid_signature, malformed_packet")
+        p.add_argument("--source", help="z. B. file, stdin, simulate")
+        if name == "query":
+            p.add_argument("--bucket", type=_parse_bucket, default=None, help="Bucket-Breite (z. B. 1h, 1d)")
+
+    args = parser.parse_args()
+    store = AuditStore(args.db)
+    t0 = time.perf_counter()
+    try:
+        if args.cmd == "import":
+            for path in args.jsonl:
+                n = store.import_jsonl(path)
+                print(f"[OK] {path}: {n} neue Datensätze importiert (vorhandene übersprungen)")
+            return 0
+
+        filters = dict(since=args.since, until=args.until, event=args.event, reason=args.reason, source=args.source)
+        if args.cmd == "query":
+            rows = store.counts(bucket_seconds=args.bucket, **filters)
+            for row in rows:
+                if args.bucket:
+                    print(f"{_fmt_ts(row[0])}  {row[-1]}")
+                else:
+                    print(row[-1])
+        else:
+            rows = store.counts(group_by=("event", "reason"), **filters)
+            for event, reason, count in rows:
+                print(f"{event:<22} {str(reason):<22} {count}")
+        print(f"[INFO] {len(rows)} Zeilen in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        return 0
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,15 @@ Funktionen:
     • Gewichtete Fehlerrate (unterschiedliche Fehler-Typen werden unterschiedlich gewichtet)
     • Auslösen eines temporären Lockouts
     • Audit-Logging (JSONL) + Security-Log (über logging.Logger)
+    • Zählung von Plausibilitäts-Anomalien (signiert, aber unplausibel)
+    • Sequenz-Anomalien (Lücke, Umordnung, Duplikat/Replay) als gewichtete Gründe im Fenster
+    • Token-Bucket-Zulassung pro Quelle und global vor der Verifikation (Flut-Abwehr)
+    • Uhr "wall" (Wanduhr) oder "event" (Paket-Zeitstempel) für Fenster, Lockout
+      und Cooldown – beschleunigte Replays treffen dieselben Entscheidungen wie live
+    • Hot-Reload der Policy ohne Neustart (mtime-Check höchstens alle N Sekunden)
+    • Periodische Zustands-Snapshots (Fenster/Lockout) und Wiederherstellung beim Start
+    • log_mode "summary": Einzelereignisse pro Paket nur asynchron ins Security-Log,
+      Konsole zeigt nur seltene Ereignisse (Lockout, Policy, Restore)
 """
 
 from __future__ import annotations
@@ -16,9 +25,134 @@ import os
 import threading
 import collections
 import logging
+import queue
+import weakref
 from dataclasses import dataclass
-from typing import Deque, Optional, Dict, Any
-import yaml
+from pathlib import Path
+from typing import Deque, List, Optional, Dict, Any, Callable
+
+from ground_station.admission import AdmissionControl, parse_admission
+from ground_station.state_snapshot import read_snapshot, write_snapshot
+
+
+# --------------------------------------------------------------
+# Policy-Laden mit Cache (vermeidet yaml-Import beim CLI-Start)
+# --------------------------------------------------------------
+
+def _policy_cache_path(policy_path: Path) -> Path:
+    """Cache-Datei liegt neben der Policy: .<name>.cache.json"""
+    return policy_path.with_name(f".{policy_path.name}.cache.json")
+
+
+def load_policy(policy_path: str) -> Dict[str, Any]:
+    """
+    Lädt die Security-Policy.
+    Ein vorgeparstes JSON-Abbild wird neben der YAML-Datei abgelegt und
+    über (mtime_ns, size) validiert. Solange die YAML unverändert ist,
+    wird yaml gar nicht erst importiert.
+    """
+    path = Path(policy_path)
+    st = path.stat()  # FileNotFoundError wie bisher beim open()
+    cache_path = _policy_cache_path(path)
+
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+            return dict(cached.get("policy") or {})
+    except (OSError, ValueError):
+        pass
+
+    import yaml  # nur bei Cache-Miss
+
+    with open(path, "r", encoding="utf-8") as f:
+        policy = yaml.safe_load(f) or {}
+
+    # Cache atomar schreiben; schreibgeschützte Verzeichnisse sind kein Fehler
+    try:
+        tmp = cache_path.with_name(cache_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "policy": policy}, f)
+        os.replace(tmp, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass
+    return policy
+
+
+LOCKOUT_ACTIONS = ("drop", "reject", "quarantine")
+LOG_MODES = ("verbose", "summary")
+CLOCK_MODES = ("wall", "event")
+
+
+def parse_policy(policy: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validiert eine geladene Policy und liefert die normalisierten
+    Laufzeit-Einstellungen. Wirft ValueError bei ungültigen Werten.
+    """
+    if not isinstance(policy, dict):
+        raise ValueError("Policy muss ein Mapping sein")
+    try:
+        cfg = {
+            "window_seconds": float(policy.get("window_seconds", 120)),
+            "max_fail_ratio": float(policy.get("max_fail_ratio", 0.4)),
+            "min_events_in_window": int(policy.get("min_events_in_window", 10)),
+            "consecutive_fail_threshold": int(policy.get("consecutive_fail_threshold", 5)),
+            "lockout_seconds": int(policy.get("lockout_seconds", 60)),
+            "cooldown_seconds": int(policy.get("cooldown_seconds", 90)),
+            "action_during_lockout": str(policy.get("action_during_lockout", "quarantine")),
+            "weights": {str(k): float(v) for k, v in dict(policy.get("weights") or {}).items()},
+            "policy_reload_seconds": float(policy.get("policy_reload_seconds", 5)),
+            "max_out_of_order_seconds": float(policy.get("max_out_of_order_seconds", 30)),
+        }
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"ungültiger Policy-Wert: {e}")
+
+    if cfg["window_seconds"] <= 0:
+        raise ValueError("window_seconds muss > 0 sein")
+    if not 0.0 <= cfg["max_fail_ratio"] <= 1.0:
+        raise ValueError("max_fail_ratio muss zwischen 0.0 und 1.0 liegen")
+    if cfg["min_events_in_window"] < 0 or cfg["consecutive_fail_threshold"] < 1:
+        raise ValueError("min_events_in_window >= 0 und consecutive_fail_threshold >= 1 erforderlich")
+    if cfg["lockout_seconds"] < 0 or cfg["cooldown_seconds"] < 0 or cfg["policy_reload_seconds"] < 0:
+        raise ValueError("lockout_seconds, cooldown_seconds und policy_reload_seconds dürfen nicht negativ sein")
+    if cfg["max_out_of_order_seconds"] < 0:
+        raise ValueError("max_out_of_order_seconds darf nicht negativ sein")
+    if cfg["action_during_lockout"] not in LOCKOUT_ACTIONS:
+        raise ValueError(f"action_during_lockout muss eines von {LOCKOUT_ACTIONS} sein")
+    if any(w < 0 for w in cfg["weights"].values()):
+        raise ValueError("weights dürfen nicht negativ sein")
+    cfg["admission"] = parse_admission(policy.get("admission"))
+    return cfg
+
+
+def _snapshot_loop(ref: "weakref.ReferenceType[SecurityManager]", stop: threading.Event, interval: float):
+    """Hintergrund-Thread: Snapshot alle 'interval' Sekunden (hält keine starke Referenz)."""
+    while not stop.wait(interval):
+        sm = ref()
+        if sm is None:
+            return
+        try:
+            sm.snapshot_state()
+        except Exception as e:
+            sm._logger.error(f"State-Snapshot fehlgeschlagen: {e}")
+        del sm
+
+
+def _audit_flush_loop(ref: "weakref.ReferenceType[SecurityManager]", stop: threading.Event, interval: float):
+    """Hintergrund-Thread (log_mode=summary): gepufferte Audit-Datensätze alle 'interval' Sekunden schreiben."""
+    while not stop.wait(interval):
+        sm = ref()
+        if sm is None:
+            return
+        try:
+            sm.flush_audit()
+        except Exception as e:
+            sm._logger.error(f"Audit-Flush fehlgeschlagen: {e}")
+        del sm
+
+
+# Markiert Log-Einträge, die pro Paket entstehen (log_mode=summary: nicht auf die Konsole)
+_PER_PACKET = {"per_packet": True}
 
 
 # --------------------------------------------------------------
@@ -47,34 +181,64 @@ class SecurityManager:
         • führt Audit-Log (JSONL) und Security-Log (Logging)
     """
 
-    def __init__(self, policy_path: str, security_log_path: Optional[str] = None, audit_log_path: Optional[str] = None):
-    # Policy laden
-        with open(policy_path, "r", encoding="utf-8") as f:
-            self.policy = yaml.safe_load(f) or {}
-
-        # Konfiguration aus Policy
-        self.window_seconds = float(self.policy.get("window_seconds", 120))
-        self.max_fail_ratio = float(self.policy.get("max_fail_ratio", 0.4))
-        self.min_events_in_window = int(self.policy.get("min_events_in_window", 10))
-        self.consecutive_fail_threshold = int(self.policy.get("consecutive_fail_threshold", 5))
+    def __init__(self, policy_path: str, security_log_path: Optional[str] = None, audit_log_path: Optional[str] = None,
+                 audit_db_path: Optional[str] = None, log_mode: Optional[str] = None, clock: Optional[str] = None):
+        # Policy laden (gecacht, siehe load_policy) und validieren
+        self.policy_path = policy_path
+        self.policy = load_policy(policy_path)
+        self._policy_stamp = self._stat_policy()
+        self._next_policy_check = time.monotonic()
 
-        self.lockout_seconds = int(self.policy.get("lockout_seconds", 60))
-        self.cooldown_seconds = int(self.policy.get("cooldown_seconds", 90))
-        self.action_during_lockout = str(self.policy.get("action_during_lockout", "quarantine"))
-        self.weights = dict(self.policy.get("weights", {}))
+        # Konfiguration aus Policy (inkl. Token-Bucket-Zulassung vor Verify)
+        self._admission = AdmissionControl()
+        self._apply_policy(parse_policy(self.policy))
 
         # Log-Pfade (überschreibbar per CLI)
         self.security_log_path = security_log_path or self.policy.get("security_log_path", "logs/security.log")
         self.audit_log_path = audit_log_path or self.policy.get("audit_log_path", "logs/security_audit.jsonl")
 
+        # Optional: indizierter SQLite-Audit-Speicher (zusätzlich zum JSONL)
+        self.audit_db_path = audit_db_path or self.policy.get("audit_db_path") or None
+
+        # Optional: Zustands-Snapshots für Neustarts (Fenster, Lockout, Fehlerserie)
+        self.state_snapshot_path = self.policy.get("state_snapshot_path") or None
+        self.state_snapshot_seconds = float(self.policy.get("state_snapshot_seconds", 10))
+
+        # Log-Modus: verbose = jedes Ereignis auch auf der Konsole, summary = nur seltene Ereignisse
+        self.log_mode = log_mode or self.policy.get("log_mode", "verbose")
+        if self.log_mode not in LOG_MODES:
+            raise ValueError(f"log_mode muss eines von {LOG_MODES} sein")
+        self.log_summary_seconds = float(self.policy.get("log_summary_seconds", 10))
+
+        # Uhr: wall = Wanduhr, event = höchster Paket-Zeitstempel (Replays, siehe _now)
+        self.clock = clock or self.policy.get("clock", "wall")
+        if self.clock not in CLOCK_MODES:
+            raise ValueError(f"clock muss eines von {CLOCK_MODES} sein")
+        self._event_now: Optional[float] = None
+        if self.clock == "event":
+            # Replays starten ohne Vorzustand und überschreiben den Live-Snapshot nicht
+            self.state_snapshot_path = None
+
+        # Pfade, Log-Modus und Uhr werden nur beim Start übernommen (Hot-Reload warnt bei Änderung)
+        self._initial_policy_paths = {k: self.policy.get(k) for k in
+                                      ("security_log_path", "audit_log_path", "audit_db_path",
+                                       "state_snapshot_path", "log_mode", "clock")}
+
         os.makedirs(os.path.dirname(self.security_log_path), exist_ok=True)
         os.makedirs(os.path.dirname(self.audit_log_path), exist_ok=True)
 
         # Datenstrukturen für das Analysefenster
         self._events: Deque[SecurityEvent] = collections.deque()
+        # Laufende Gewichtssummen des Fensters (O(1) statt Durchlauf pro Paket)
+        self._total_w = 0.0
+        self._fail_w = 0.0
         self._lock = threading.Lock()
         self._lockout_until: float = 0.0
         self._consecutive_fail = 0
+        self._anomaly_counts: Dict[str, int] = {}
+        self._sequence_counts: Dict[str, int] = {}
+        self._state_dirty = False
+        self._snapshot_stop = threading.Event()
 
         # Logger für sicherheitsrelevante Ereignisse
         self._logger = logging.getLogger("security")
@@ -84,37 +248,120 @@ class SecurityManager:
 
         # File-/Stream-Handler nur einmal hinzufügen
         # (sonst bei mehrfacher Instanzierung doppelte Logs)
+        self._log_listener = None
+        self._own_handlers: List[logging.Handler] = []  # nur diese entfernt close()
         if not self._logger.handlers:
-            handlers = []
+            # Gemeinsames Format für alle Handler
+            fmt = logging.Formatter(
+                fmt="%(asctime)s [%(levelname)s] %(message)s",
+                datefmt="%Y-%m-%dT%H:%M:%S"
+            )
 
             # FileHandler für das Security-Log
             fh = logging.FileHandler(self.security_log_path, encoding="utf-8")
             fh.setLevel(logging.INFO)
-            handlers.append(fh)
+            fh.setFormatter(fmt)
 
             # Konsolen-Handler für Realtime-Ausgabe im Terminal
             ch = logging.StreamHandler()
             ch.setLevel(logging.INFO)
-            handlers.append(ch)
+            ch.setFormatter(fmt)
 
-            # Gemeinsames Format für alle Handler
-            fmt = logging.Formatter(
-                fmt="%(asctime)s [%(levelname)s] %(message)s",
-                datefmt="%Y-%m-%dT%H:%M:%S"
-            )
-            for h in handlers:
-                h.setFormatter(fmt)
+            if self.log_mode == "summary":
+                from logging.handlers import QueueHandler, QueueListener  # lazy: nur im summary-Modus
+
+                # Datei-I/O in einen Listener-Thread; Konsole ohne Einzelereignisse pro Paket
+                log_queue: queue.SimpleQueue = queue.SimpleQueue()
+                self._log_listener = QueueListener(log_queue, fh, respect_handler_level=True)
+                self._log_listener.start()
+                ch.addFilter(lambda record: not getattr(record, "per_packet", False))
+                self._own_handlers.append(QueueHandler(log_queue))
+            else:
+                self._own_handlers.append(fh)
+            self._own_handlers.append(ch)
+            for h in self._own_handlers:
                 self._logger.addHandler(h)
 
-        # Audit-Datei (JSONL) für maschinenlesbare Auswertung
+        # Audit-Datei (JSONL) für maschinenlesbare Auswertung. summary: Datensätze nur
+        # puffern (kein json.dumps/flush pro Paket), Schreiben im Flush-Thread und in close()
         self._audit_fp = open(self.audit_log_path, "a", encoding="utf-8")
+        self._audit_buffer: Optional[Deque[Dict[str, Any]]] = None
+        self._audit_flush_lock = threading.Lock()
+        self._audit_stop = threading.Event()
+        if self.log_mode == "summary":
+            self._audit_buffer = collections.deque()
+            threading.Thread(
+                target=_audit_flush_loop,
+                args=(weakref.ref(self), self._audit_stop, min(1.0, self.log_summary_seconds)),
+                name="secman-audit-flush",
+                daemon=True,
+            ).start()
+
+        # SQLite-Audit (gebündelte Inserts, siehe ground_station/audit_store.py)
+        self._audit_store = None
+        if self.audit_db_path:
+            from ground_station.audit_store import AuditStore
+            self._audit_store = AuditStore(self.audit_db_path)
+
+        # Zustand aus Snapshot wiederherstellen, dann periodisch sichern (eigener Thread)
+        if self.state_snapshot_path:
+            self._restore_state()
+            if self.state_snapshot_seconds > 0:
+                threading.Thread(
+                    target=_snapshot_loop,
+                    args=(weakref.ref(self), self._snapshot_stop, self.state_snapshot_seconds),
+                    name="secman-snapshot",
+                    daemon=True,
+                ).start()
 
     def __del__(self):
-        """Sicheres Schließen der Audit-Datei."""
+        self.close()
+
+    def close(self):
+        """
+        Sicheres Schließen: letzter State-Snapshot, Audit-Datei und
+        Audit-Datenbank (flusht gepufferte Inserts).
+        """
+        try:
+            self._snapshot_stop.set()
+            if self.state_snapshot_path:
+                self.snapshot_state()
+        except Exception:
+            pass
+        try:
+            self._report_admission(time.monotonic())
+        except Exception:
+            pass
+        try:
+            self._audit_stop.set()
+            self.flush_audit()
+        except Exception:
+            pass
         try:
             self._audit_fp.close()
         except Exception:
             pass
+        try:
+            if self._audit_store is not None:
+                self._audit_store.close()
+                self._audit_store = None
+        except Exception:
+            pass
+        try:
+            # Wartet, bis alle gepufferten Log-Einträge geschrieben sind; nur die
+            # eigenen Handler abmelden (fremde Handler am Logger bleiben), damit
+            # eine spätere Instanz wieder einen Listener startet
+            if self._log_listener is not None:
+                self._log_listener.stop()
+                for h in self._log_listener.handlers:
+                    h.close()
+                self._log_listener = None
+            for h in self._own_handlers:
+                self._logger.removeHandler(h)
+                h.close()
+            self._own_handlers = []
+        except Exception:
+            pass
 
     # ----------------------------------------------------------
     # Öffentliche API
@@ -122,19 +369,46 @@ class SecurityManager:
 
     def is_locked(self) -> bool:
         """True, wenn sich das System aktuell im Lockout befindet."""
-        return time.time() < self._lockout_until
+        return self._now() < self._lockout_until
 
     def action_when_locked(self) -> str:
         """Rückgabe des in der Policy definierten Verhaltens."""
         return self.action_during_lockout
 
-    def on_packet_before_verify(self, meta: Dict[str, Any]) -> bool:
+    def admission_exempt(self, source: str) -> bool:
+        """True, wenn 'source' keinen Token braucht (Zulassung aus oder exempt_sources)."""
+        return self._admission.exempt(source)
+
+    def admit(self, source: str, key: Optional[str] = None, verify: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Token-Bucket-Zulassung, noch VOR on_packet_before_verify und vor jedem
+        Parsen (siehe ground_station/admission.py). 'source' ist die Eingangsart
+        (exempt_sources), 'key' die Quelle mit eigenem Eimer (Standard: source),
+        'verify' die reine HMAC-Prüfung für Pakete einer erschöpften Quelle.
+        Gibt False zurück, wenn das Paket verworfen werden soll. Überlast wird
+        nicht pro Paket protokolliert, sondern alle 'report_seconds' zusammengefasst.
+        """
+        now = time.monotonic()
+        ok, _ = self._admission.admit(source, now, key, verify)
+        if now >= self._admission.next_report:
+            self._report_admission(now)
+        return ok
+
+    def on_packet_before_verify(self, meta: Dict[str, Any], verify: Optional[Callable[[], bool]] = None) -> bool:
         """
         Wird VOR der HMAC-Verifikation aufgerufen.
         Gibt zurück:
             True  – Paket darf verifiziert werden
             False – Paket wird sofort nach Policy behandelt (Lockout aktiv)
+        'verify' (reine HMAC-Prüfung des Pakets) wird nur bei clock=event während
+        eines Lockouts aufgerufen: Nur ein gültig signierter Zeitstempel darf die
+        Uhr vorschieben und so den Lockout beenden – ein gefälschter nie.
         """
+        self.maybe_reload_policy()
+        if self.clock == "event" and verify is not None and meta.get("event_ts") is not None and self.is_locked():
+            if verify():
+                with self._lock:
+                    self._advance_clock(meta["event_ts"])
         if self.is_locked():
             self._audit("lockout_drop", ok=False, reason="lockout_active", meta=meta)
             return False
@@ -147,13 +421,19 @@ class SecurityManager:
         und prüft, ob ein Lockout ausgelöst werden muss.
         """
 
-        now = time.time()
-        ev = SecurityEvent(ts=now, ok=ok, reason=(reason if not ok else "ok"), meta=meta)
-
         with self._lock:
-            self._events.append(ev)
+            if ok:
+                self._advance_clock(meta.get("event_ts"))
+            now = self._now()
+            ts = now
+            if self.clock == "event" and ok and meta.get("event_ts") is not None:
+                # Signierter Zeitstempel; verspätete Pakete höchstens max_out_of_order_seconds zurück
+                ts = max(meta["event_ts"], now - self.max_out_of_order_seconds)
+            self._add_event(SecurityEvent(ts=ts, ok=ok, reason=(reason if not ok else "ok"), meta=meta))
             self._trim_window(now)
 
+            self._state_dirty = True
+
             # Aktualisierung der "consecutive fails"
             if ok:
                 self._consecutive_fail = 0
@@ -166,40 +446,274 @@ class SecurityManager:
 
         # Security-Log (lesbares Log)
         level = logging.INFO if ok else logging.WARNING
-        self._logger.log(level, f"verify_result ok={ok} reason={reason} meta={self._safe_meta(meta)}")
+        self._logger.log(level, "verify_result ok=%s reason=%s meta=%s", ok, reason, self._safe_meta(meta),
+                         extra=_PER_PACKET)
 
         # Audit-Log (JSONL)
         self._audit("verify_result", ok=ok, reason=reason, meta=meta)
 
+    def on_anomaly(self, reason: str, meta: Dict[str, Any]):
+        """
+        Wird für signierte, aber physikalisch unplausible Zeilen aufgerufen
+        (siehe cube/ground/plausibility.py). Zählt pro Grund und schreibt
+        ins Audit-Log; beeinflusst das Lockout-Fenster nicht, da die
+        Signatur gültig war.
+        """
+        with self._lock:
+            count = self._anomaly_counts.get(reason, 0) + 1
+            self._anomaly_counts[reason] = count
+
+        self._logger.warning("plausibility_anomaly reason=%s count=%s meta=%s", reason, count, self._safe_meta(meta),
+                             extra=_PER_PACKET)
+        self._audit("plausibility_anomaly", ok=True, reason=reason, meta=meta)
+
+    def on_sequence_anomaly(self, reason: str, meta: Dict[str, Any]):
+        """
+        Wird für signierte Pakete mit auffälliger Sequenznummer aufgerufen
+        (seq_gap, seq_reorder, seq_duplicate, seq_stale, seq_reset; siehe
+        cube/ground/linkquality.py). Das Ereignis geht mit dem Policy-Gewicht
+        des Grundes ins Fenster – Gewicht 0 zählt nur, ohne Lockout-Wirkung.
+        Die Serie aufeinanderfolgender Fehler bleibt unberührt (Signatur war gültig).
+        """
+        with self._lock:
+            now = self._now()
+            self._sequence_counts[reason] = self._sequence_counts.get(reason, 0) + 1
+            if float(self.weights.get(reason, 1.0)) > 0:
+                self._add_event(SecurityEvent(ts=now, ok=False, reason=reason, meta=meta))
+                self._trim_window(now)
+                self._state_dirty = True
+                if self._should_lock(now):
+                    self._enable_lockout(now, trigger=reason)
+
+        self._logger.warning("sequence_anomaly reason=%s meta=%s", reason, self._safe_meta(meta), extra=_PER_PACKET)
+        self._audit("sequence_anomaly", ok=False, reason=reason, meta=meta)
+
+    def on_link_stats(self, stats: Dict[str, Dict[str, Any]]):
+        """Periodische Link-Kennzahlen (Verlust %, Bursts, Umordnung) je Link ins Audit."""
+        for link, st in stats.items():
+            self._audit("link_quality", ok=st.get("lost", 0) == 0, reason="link_stats", meta={"source": link, **st})
+
+    def sequence_counts(self) -> Dict[str, int]:
+        """Bisherige Sequenz-Anomalien pro Grundcode (Kopie)."""
+        with self._lock:
+            return dict(self._sequence_counts)
+
+    def maybe_reload_policy(self, force: bool = False) -> bool:
+        """
+        Prüft höchstens alle 'policy_reload_seconds' die mtime der Policy-Datei
+        (ein stat(), nicht pro Paket). Bei Änderung wird die neue Policy
+        validiert und atomar übernommen; das Ereignisfenster und ein
+        laufender Lockout bleiben erhalten (Gewichte wirken beim nächsten
+        Ratio-Durchlauf automatisch auf alle Ereignisse im Fenster).
+        Ungültige Policies werden verworfen, die alte bleibt aktiv.
+        Liefert True, wenn eine neue Policy übernommen wurde.
+        """
+        now = time.monotonic()
+        if not force and (self.policy_reload_seconds <= 0 or now < self._next_policy_check):
+            return False
+        self._next_policy_check = now + self.policy_reload_seconds
+
+        stamp = self._stat_policy()
+        if stamp is None or stamp == self._policy_stamp:
+            return False
+        # Stempel sofort merken: eine fehlerhafte Datei wird nur einmal gemeldet
+        self._policy_stamp = stamp
+
+        try:
+            policy = load_policy(self.policy_path)
+            cfg = parse_policy(policy)
+        except Exception as e:
+            self._logger.error(f"Policy-Reload abgelehnt ({e}) – bisherige Policy bleibt aktiv")
+            self._audit("policy_rejected", ok=False, reason=str(e), meta={"path": str(self.policy_path)})
+            return False
+
+        old = {k: getattr(self, k) for k in cfg}
+        changed = {k: {"old": old[k], "new": v} for k, v in cfg.items() if old[k] != v}
+        with self._lock:
+            self.policy = policy
+            self._apply_policy(cfg)
+            self._trim_window(self._now())
+
+        for key in self._initial_policy_paths:
+            if policy.get(key) != self._initial_policy_paths.get(key):
+                self._logger.warning(f"Policy-Reload: {key} wird erst nach Neustart wirksam")
+        self._logger.info(f"Policy neu geladen: {sorted(changed)}")
+        self._audit("policy_reloaded", ok=True, reason="policy_changed", meta={"path": str(self.policy_path), "changed": changed})
+        return True
+
+    def snapshot_state(self) -> bool:
+        """
+        Schreibt einen Snapshot, falls sich der Zustand seit dem letzten geändert hat.
+        Unter dem Lock wird nur kopiert; Serialisierung und I/O laufen außerhalb.
+        """
+        if not self.state_snapshot_path:
+            return False
+        with self._lock:
+            if not self._state_dirty:
+                return False
+            events = [[ev.ts, 1 if ev.ok else 0, ev.reason] for ev in self._events]
+            lockout_until = self._lockout_until
+            consecutive_fail = self._consecutive_fail
+            self._state_dirty = False
+        write_snapshot(self.state_snapshot_path, time.time(), lockout_until, consecutive_fail, events)
+        return True
+
+    def anomaly_counts(self) -> Dict[str, int]:
+        """Bisherige Anomalien pro Grundcode (Kopie)."""
+        with self._lock:
+            return dict(self._anomaly_counts)
+
     # ----------------------------------------------------------
     # Interne Logik
     # ----------------------------------------------------------
 
+    def _restore_state(self):
+        """
+        Lädt den letzten Snapshot (Version + Prüfsumme geprüft).
+        Ignoriert ihn, wenn er älter als das Analysefenster ist und weder
+        Lockout noch Cooldown mehr laufen; sonst werden Ereignisse im
+        Fenster, Lockout-Ende und Fehlerserie übernommen.
+        """
+        snap = read_snapshot(self.state_snapshot_path)
+        if snap is None:
+            return
+        now = time.time()
+        age = now - snap["created"]
+        if age > self.window_seconds and now >= snap["lockout_until"] + self.cooldown_seconds:
+            self._logger.info(f"State-Snapshot veraltet ({age:.0f}s) – ignoriert")
+            return
+
+        border = now - self.window_seconds
+        with self._lock:
+            for ts, ok, reason in snap["events"]:
+                if ts >= border:
+                    self._add_event(SecurityEvent(ts=float(ts), ok=bool(ok), reason=str(reason), meta={}))
+            self._lockout_until = snap["lockout_until"]
+            self._consecutive_fail = snap["consecutive_fail"]
+
+        info = {"age_seconds": round(age, 3), "events": len(self._events),
+                "lockout_until": self._lockout_until, "consecutive_fail": self._consecutive_fail}
+        self._logger.info(f"State wiederhergestellt: {info}")
+        self._audit("state_restored", ok=True, reason="snapshot", meta=info)
+
+    def _apply_policy(self, cfg: Dict[str, Any]):
+        """Übernimmt validierte Einstellungen (Aufrufer hält ggf. self._lock)."""
+        self.window_seconds = cfg["window_seconds"]
+        self.max_fail_ratio = cfg["max_fail_ratio"]
+        self.min_events_in_window = cfg["min_events_in_window"]
+        self.consecutive_fail_threshold = cfg["consecutive_fail_threshold"]
+
+        self.lockout_seconds = cfg["lockout_seconds"]
+        self.cooldown_seconds = cfg["cooldown_seconds"]
+        self.action_during_lockout = cfg["action_during_lockout"]
+        if cfg["weights"] != getattr(self, "weights", None):
+            self.weights = cfg["weights"]
+            self._recompute_weights()
+        self.policy_reload_seconds = cfg["policy_reload_seconds"]
+        self.max_out_of_order_seconds = cfg["max_out_of_order_seconds"]
+        if cfg["admission"] != getattr(self, "admission", None):
+            self.admission = cfg["admission"]
+            self._admission.configure(self.admission)
+
+    def _report_admission(self, now: float):
+        """Meldet die seit dem letzten Bericht durch Token-Buckets verworfenen Pakete."""
+        report = self._admission.take_report(now)
+        if not report:
+            return
+        action = "drop" if self._admission.drop else "count"
+        total = sum(n for reasons in report.values() for n in reasons.values())
+        self._logger.warning("admission_shed action=%s packets=%s by_source=%s", action, total, report)
+        self._audit("admission_shed", ok=False, reason="rate_limit",
+                    meta={"action": action, "packets": total, "by_source": report})
+
+    def _stat_policy(self):
+        """(mtime_ns, size) der Policy-Datei oder None, wenn nicht lesbar."""
+        try:
+            st = os.stat(self.policy_path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _now(self) -> float:
+        """
+        Zeitbasis für Fenster, Lockout und Cooldown:
+            wall  – time.time()
+            event – höchster bisher gesehener Zeitstempel eines gültig signierten
+                    Pakets (Wasserstand), läuft nie rückwärts. Vor dem ersten
+                    signierten Paket läuft die Uhr relativ ab 0 (siehe _advance_clock)
+        """
+        if self.clock == "wall":
+            return time.time()
+        return self._event_now if self._event_now is not None else 0.0
+
+    def _advance_clock(self, ts: Optional[float]):
+        """
+        Schiebt die Event-Uhr auf den signierten Zeitstempel 'ts' vor (nur clock=event,
+        nur vorwärts; Aufrufer hält self._lock). Beim Start der Uhr werden Fehler-
+        Ereignisse und Lockout von davor (relativ ab 0) auf 'ts' verschoben.
+        """
+        if self.clock != "event" or ts is None:
+            return
+        if self._event_now is None:
+            for ev in self._events:
+                ev.ts += ts
+            if self._lockout_until:
+                self._lockout_until += ts
+            self._event_now = ts
+        elif ts > self._event_now:
+            self._event_now = ts
+
+    def _event_weight(self, ev: SecurityEvent) -> float:
+        return 1.0 if ev.ok else float(self.weights.get(ev.reason, 1.0))
+
+    def _add_event(self, ev: SecurityEvent):
+        """Fügt ein Ereignis zeitlich sortiert ein und aktualisiert die Gewichtssummen."""
+        events = self._events
+        if not events or ev.ts >= events[-1].ts:
+            events.append(ev)
+        else:
+            # Verspätet (Event-Uhr) oder Uhrsprung: von hinten die Einfügestelle suchen
+            i = len(events) - 1
+            while i > 0 and events[i - 1].ts > ev.ts:
+                i -= 1
+            events.insert(i, ev)
+        w = self._event_weight(ev)
+        self._total_w += w
+        if not ev.ok:
+            self._fail_w += w
+
+    def _recompute_weights(self):
+        """Gewichtssummen neu bilden (nach geänderten Gewichten per Hot-Reload)."""
+        self._total_w = self._fail_w = 0.0
+        for ev in getattr(self, "_events", ()):  # beim ersten _apply_policy gibt es noch kein Fenster
+            w = self._event_weight(ev)
+            self._total_w += w
+            if not ev.ok:
+                self._fail_w += w
+
     def _trim_window(self, now: float):
         """Entfernt alte Ereignisse außerhalb des Analysefensters."""
         border = now - self.window_seconds
-        while self._events and self._events[0].ts < border:
-            self._events.popleft()
+        events = self._events
+        while events and events[0].ts < border:
+            ev = events.popleft()
+            w = self._event_weight(ev)
+            self._total_w -= w
+            if not ev.ok:
+                self._fail_w -= w
+        if not events:
+            # Rundungsfehler der laufenden Summen nicht mitschleppen
+            self._total_w = self._fail_w = 0.0
 
     def _weighted_fail_ratio(self) -> float:
         """
         Berechnet die gewichtete Fehlerrate:
             Summe(Fehlergewicht) / Summe(Gewichte aller Events)
+        Die Summen werden beim Einfügen/Entfernen laufend geführt.
         """
         if not self._events:
             return 0.0
-
-        total_w = 0.0
-        fail_w = 0.0
-
-        for ev in self._events:
-            w = 1.0
-            if not ev.ok:
-                w = float(self.weights.get(ev.reason, 1.0))
-                fail_w += w
-            total_w += w
-
-        return (fail_w / total_w) if total_w > 0 else 0.0
+        return (self._fail_w / self._total_w) if self._total_w > 0 else 0.0
 
     def _should_lock(self, now: float) -> bool:
         """
@@ -230,9 +744,10 @@ class SecurityManager:
         """Aktiviert einen Lockout und protokolliert ihn."""
         self._lockout_until = now + self.lockout_seconds
         self._consecutive_fail = 0
+        self._state_dirty = True
 
         self._logger.error(f"SECURITY LOCKOUT enabled for {self.lockout_seconds}s (trigger={trigger})")
-        self._audit("lockout_enabled", ok=False, reason=trigger, meta={"until": self._lockout_until})
+        self._audit("lockout_enabled", ok=False, reason=trigger, meta={"until": self._lockout_until, "clock": self.clock})
 
     # ----------------------------------------------------------
     # Logging / Audit
@@ -247,8 +762,26 @@ class SecurityManager:
             "reason": reason,
             "meta": meta,
         }
-        self._audit_fp.write(json.dumps(rec, ensure_ascii=False) + "\n")
-        self._audit_fp.flush()
+        if self._audit_buffer is not None:
+            self._audit_buffer.append(rec)  # summary: Schreiben in flush_audit()
+        else:
+            self._audit_fp.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._audit_fp.flush()
+        if self._audit_store is not None:
+            self._audit_store.add(rec)
+
+    def flush_audit(self):
+        """Schreibt gepufferte Audit-Datensätze (log_mode=summary) in einem Block ins JSONL."""
+        buf = self._audit_buffer
+        if not buf:
+            return
+        with self._audit_flush_lock:
+            lines = []
+            while buf:
+                lines.append(json.dumps(buf.popleft(), ensure_ascii=False) + "\n")
+            if lines and not self._audit_fp.closed:
+                self._audit_fp.writelines(lines)
+                self._audit_fp.flush()
 
     @staticmethod
     def _safe_meta(meta: Dict[str, Any]) -> Dict[str, Any]:
@@ -0,0 +1,70 @@
+"""
+State-Snapshot – Kompakte Sicherung des SecurityManager-Zustands
+
+Format (zwei Zeilen, UTF-8):
+    1) Header-JSON: {"version": 1, "sha256": "<hex über Zeile 2>", "created": <unix>}
+    2) Body-JSON:   {"lockout_until": ..., "consecutive_fail": ...,
+                     "events": [[ts, ok(0/1), reason], ...]}
+
+Die Prüfsumme deckt den Body byte-genau ab; Schreiben erfolgt atomar
+(Temp-Datei + os.replace), ein Absturz hinterlässt nie einen halben Snapshot.
+Metadaten einzelner Ereignisse werden nicht gesichert – für Fenster,
+Ratio und Lockout sind nur ts/ok/reason relevant.
+"""
+
+from __future__ import annotations
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+SNAPSHOT_VERSION = 1
+
+
+def write_snapshot(path: str, created: float, lockout_until: float, consecutive_fail: int,
+                   events: List[list]) -> None:
+    """Schreibt einen Snapshot atomar."""
+    body = json.dumps(
+        {"lockout_until": lockout_until, "consecutive_fail": consecutive_fail, "events": events},
+        separators=(",", ":"),
+    ).encode("utf-8")
+    header = json.dumps(
+        {"version": SNAPSHOT_VERSION, "sha256": hashlib.sha256(body).hexdigest(), "created": created},
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(header + b"\n" + body + b"\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Liest und prüft einen Snapshot.
+    Liefert {"created", "lockout_until", "consecutive_fail", "events"} oder
+    None (fehlt, falsche Version, Prüfsumme falsch, unlesbar).
+    """
+    try:
+        with open(path, "rb") as f:
+            header_raw = f.readline()
+            body = f.readline().rstrip(b"\n")
+        header = json.loads(header_raw)
+        if header.get("version") != SNAPSHOT_VERSION:
+            return None
+        if hashlib.sha256(body).hexdigest() != header.get("sha256"):
+            return None
+        state = json.loads(body)
+        return {
+            "created": float(header.get("created", 0.0)),
+            "lockout_until": float(state.get("lockout_until", 0.0)),
+            "consecutive_fail": int(state.get("consecutive_fail", 0)),
+            "events": list(state.get("events") or []),
+        }
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
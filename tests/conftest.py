@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""Gemeinsame Fixtures: Projektkopie für Läufe der CLI-Einstiegspunkte."""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def project_copy(tmp_path: Path) -> Path:
+    """Code und Policy in tmp_path (eigenes data/ und logs/, kein ground.json)."""
+    ignore = shutil.ignore_patterns("__pycache__", "*.pyc", "ground.json", "keyring.json")
+    for name in ("cube", "ground_station", "configs"):
+        shutil.copytree(PROJECT_ROOT / name, tmp_path / name, ignore=ignore)
+    return tmp_path
+
+
+@pytest.fixture
+def run_module(project_copy: Path):
+    """Startet 'python -m <modul> <args>' in der Projektkopie (ohne HMAC-Geheimnis, sofern nicht gesetzt)."""
+
+    def run(module: str, *args: str, stdin: str = "", env: dict = None) -> subprocess.CompletedProcess:
+        child_env = {k: v for k, v in os.environ.items() if not k.startswith("HMAC_")}
+        child_env.update(env or {})
+        return subprocess.run([sys.executable, "-m", module, *args], cwd=project_copy, env=child_env,
+                              input=stdin, capture_output=True, text=True, timeout=60)
+
+    return run
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Zulassung vor der Verifikation: Eimer-Schlüssel und Verhalten ohne Schlüssel."""
+
+import pytest
+
+from cube.ground import receiver, verify
+
+SPOOFED = "2026-01-01T00:00:00,20.0,50.0,1000.0,NOMINAL,0,k1:" + "ab" * 32 + "\n"
+
+
+@pytest.fixture
+def no_secret(tmp_path, monkeypatch):
+    """Weder HMAC_SECRET_HEX noch ground.json noch keyring.json."""
+    monkeypatch.delenv("HMAC_SECRET_HEX", raising=False)
+    monkeypatch.delenv("HMAC_KEY_ID", raising=False)
+    monkeypatch.setattr(verify, "CFG_PATH", tmp_path / "ground.json")
+    monkeypatch.setattr(verify, "KEYRING_PATH", tmp_path / "keyring.json")
+    monkeypatch.setattr(verify, "_KEYRING", None)
+
+
+def test_admission_key_without_secret_is_unverified(no_secret):
+    assert receiver.admission_key(SPOOFED, "stdin") == "stdin/" + receiver.UNVERIFIED_KEY
+    assert receiver.signature_ok(SPOOFED) is False
+
+
+def test_admission_key_unsigned_line():
+    assert receiver.admission_key("ts,1,2,3,NOMINAL,0,\n", "stdin", link="udp") == "udp/" + receiver.UNVERIFIED_KEY
+
+
+class _ExemptSecman:
+    """Zählt Zulassungen; 'file' ist ausgenommen."""
+
+    def __init__(self):
+        self.calls = []
+
+    def admission_exempt(self, source):
+        return source == "file"
+
+    def admit(self, source, key=None, verify=None):
+        self.calls.append((source, key, verify))
+        return True
+
+
+def test_exempt_source_skips_keyring(monkeypatch):
+    def boom(_key_id):
+        raise AssertionError("Schlüsselbund für ausgenommene Quelle abgefragt")
+
+    monkeypatch.setattr(receiver, "known_key_id", boom)
+    secman = _ExemptSecman()
+    assert receiver.admit_line(secman, "file", line=SPOOFED)
+    assert secman.calls == [("file", None, None)]
+
+
+@pytest.mark.parametrize("mode", ["--file", "--stdin"])
+def test_receiver_without_secret_rejects_instead_of_crashing(run_module, project_copy, mode):
+    (project_copy / "in.csv").write_text(SPOOFED, encoding="utf-8")
+    args = ["--file", "in.csv", "--no-checkpoint"] if mode == "--file" else ["--stdin"]
+    proc = run_module("cube.ground.receiver", *args, stdin=SPOOFED if mode == "--stdin" else "")
+    assert proc.returncode == 0, proc.stdout + proc.stderr
+    assert "[FATAL]" not in proc.stdout + proc.stderr
+    rejected = (project_copy / "data" / "rejected" / "telemetry_rejected.csv").read_text(encoding="utf-8")
+    assert "verify_error=" in rejected
+
+
+def _control(**overrides):
+    from ground_station.admission import AdmissionControl, parse_admission
+
+    cfg = {"per_source_rate": 10, "per_source_burst": 2, "global_rate": 0,
+           "verify_rate": 1, "verify_burst": 3, "over_limit": "drop"}
+    cfg.update(overrides)
+    return AdmissionControl(parse_admission(cfg))
+
+
+def test_exhausted_source_verifies_within_budget_only():
+    control = _control()
+    calls = []
+
+    def forged():
+        calls.append(1)
+        return False
+
+    now = 100.0
+    results = [control.admit("stdin", now, "stdin/k1", forged)[1] for _ in range(10)]
+    assert results[:2] == [None, None]  # Vorrat der Quelle
+    assert results[2:5] == ["rate_source"] * 3  # geprüft und gefälscht
+    assert results[5:] == ["rate_verify"] * 5  # ohne HMAC verworfen
+    assert len(calls) == 3
+    # Nach einer Sekunde ist der Quellen-Eimer wieder gefüllt
+    assert control.admit("stdin", now + 1.0, "stdin/k1", forged) == (True, None)
+    assert control.take_report(now) == {"stdin/k1": {"rate_source": 3, "rate_verify": 5}}
+
+
+def test_exhausted_source_admits_authentic_packets():
+    control = _control(verify_burst=1)
+    for _ in range(2):
+        control.admit("stdin", 0.0, "stdin/k1", lambda: True)
+    assert control.admit("stdin", 0.0, "stdin/k1", lambda: True) == (True, None)
+    assert control.admit("stdin", 0.0, "stdin/k1", lambda: True) == (False, "rate_verify")
+
+
+def test_exempt_sources_bypass_buckets():
+    control = _control(exempt_sources=["file"], per_source_burst=1)
+    assert control.exempt("file") and not control.exempt("stdin")
+    assert all(control.admit("file", 0.0)[0] for _ in range(100))
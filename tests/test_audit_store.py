@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""AuditStore: gebündeltes Schreiben, inkrementeller Import ohne Duplikate, Abfragen."""
+
+import json
+import sqlite3
+
+from ground_station.audit_store import AuditStore
+
+
+def _rec(ts, event="verify_result", ok=True, reason="ok", packet_id="p", source="file"):
+    meta = {"source": source, "packet_id": packet_id} if packet_id else {"path": "policy.yaml"}
+    return {"ts": ts, "event": event, "ok": ok, "reason": reason, "meta": meta}
+
+
+def _total(store):
+    return store.counts()[0][0]
+
+
+def test_import_into_directly_written_db_adds_nothing(tmp_path):
+    records = [_rec(1000.5 + i, packet_id=f"p{i}") for i in range(5)]
+    records.append(_rec(1010.25, event="policy_reloaded", packet_id=None))
+    jsonl = tmp_path / "audit.jsonl"
+    jsonl.write_text("".join(json.dumps(r) + "\n" for r in records), encoding="utf-8")
+
+    store = AuditStore(str(tmp_path / "audit.sqlite"), flush_interval=0)
+    for r in records:
+        store.add(r)
+    store.flush()
+    assert store.import_jsonl(str(jsonl)) == 0
+    assert _total(store) == 6
+
+    with jsonl.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(_rec(2000.0, ok=False, reason="invalid_signature", packet_id="new")) + "\n")
+    assert store.import_jsonl(str(jsonl)) == 1
+    assert store.counts(reason="invalid_signature") == [(1,)]
+    store.close()
+
+
+def test_existing_duplicates_are_removed_once(tmp_path):
+    db = tmp_path / "old.sqlite"
+    conn = sqlite3.connect(db)
+    conn.executescript("""
+        CREATE TABLE audit (id INTEGER PRIMARY KEY, ts REAL NOT NULL, event TEXT NOT NULL, ok INTEGER NOT NULL,
+                            reason TEXT, source TEXT, packet_id TEXT, meta TEXT);
+        INSERT INTO audit (ts, event, ok, reason, source, packet_id, meta) VALUES
+            (1.0, 'verify_result', 1, 'ok', 'file', 'p1', '{}'),
+            (1.0, 'verify_result', 1, 'ok', 'file', 'p1', '{}'),
+            (2.0, 'policy_reloaded', 1, 'policy_changed', NULL, NULL, '{}'),
+            (2.0, 'policy_reloaded', 1, 'policy_changed', NULL, NULL, '{}');
+    """)
+    conn.close()
+    store = AuditStore(str(db), flush_interval=0)
+    assert _total(store) == 2
+    store.close()
+
+
+def test_counts_by_bucket_and_group(tmp_path):
+    store = AuditStore(str(tmp_path / "audit.sqlite"), flush_interval=0)
+    for ts, ok in ((0.5, True), (1.5, False), (61.0, False)):
+        store.add(_rec(ts, ok=ok, reason="ok" if ok else "invalid_signature", packet_id=str(ts)))
+    store.flush()
+    assert store.counts(bucket_seconds=60, group_by=("ok",)) == [(0, 0, 1), (0, 1, 1), (60, 0, 1)]
+    store.close()
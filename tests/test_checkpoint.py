@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""Wiederaufnehmbares --file-Einlesen: Checkpoint, Fortsetzen, Sink-Reparatur."""
+
+import hashlib
+import hmac
+
+import pytest
+
+from cube.ground.checkpoint import Checkpoint, load_checkpoint, save_checkpoint, sink_sizes, truncate_sinks
+
+SECRET_HEX = "00112233445566778899aabbccddeeff"
+HEADER = "ts,temperature_c,humidity_pct,pressure_hpa,mode,seq,sig\n"
+
+
+def signed(seq: int) -> str:
+    payload = f"2026-01-01T00:00:{seq:02d}Z,21.50,40.00,1013.25,NOMINAL,{seq}"
+    sig = hmac.new(bytes.fromhex(SECRET_HEX), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+    return f"{payload},k1:{sig}\n"
+
+
+def _rows(path):
+    return [line for line in path.read_text(encoding="utf-8").splitlines() if not line.startswith("ts,")]
+
+
+def test_rerun_resumes_after_checkpoint(run_module, project_copy):
+    dump = project_copy / "dump.csv"
+    dump.write_text(HEADER + "".join(signed(i) for i in range(3)), encoding="utf-8")
+    processed = project_copy / "data" / "processed" / "telemetry.csv"
+    env = {"HMAC_SECRET_HEX": SECRET_HEX}
+
+    first = run_module("cube.ground.receiver", "--file", "dump.csv", env=env)
+    assert first.returncode == 0, first.stdout + first.stderr
+    assert len(_rows(processed)) == 3
+
+    again = run_module("cube.ground.receiver", "--file", "dump.csv", env=env)
+    assert "Bereits vollständig verarbeitet (3 Pakete" in again.stdout
+    assert len(_rows(processed)) == 3
+
+    with dump.open("a", encoding="utf-8") as f:
+        f.write(signed(3) + signed(4))
+    resumed = run_module("cube.ground.receiver", "--file", "dump.csv", env=env)
+    assert "Fortsetzen ab Byte" in resumed.stdout
+    assert [row.split(",")[5] for row in _rows(processed)] == ["0", "1", "2", "3", "4"]
+
+
+def test_checkpoint_roundtrip_and_match(tmp_path):
+    dump = tmp_path / "dump.csv"
+    dump.write_text(HEADER + signed(0), encoding="utf-8")
+    path = tmp_path / "cp.json"
+    save_checkpoint(path, Checkpoint.for_file(dump, offset=len(HEADER), packets=0, sinks={}))
+    cp = load_checkpoint(path)
+    assert cp.offset == len(HEADER) and cp.matches(dump)
+
+    # Ersetzte Datei (neuer Inhalt am Anfang) → kein Fortsetzen
+    replaced = tmp_path / "new.csv"
+    replaced.write_text("ts,x\n" + signed(0), encoding="utf-8")
+    replaced.replace(dump)
+    assert not cp.matches(dump)
+
+
+def test_load_checkpoint_ignores_garbage(tmp_path):
+    path = tmp_path / "cp.json"
+    path.write_text("{kaputt", encoding="utf-8")
+    assert load_checkpoint(path) is None
+    assert load_checkpoint(tmp_path / "fehlt.json") is None
+
+
+def test_truncate_sinks_refuses_foreign_growth(tmp_path):
+    sink = tmp_path / "sink.csv"
+    sink.write_text("a\n", encoding="utf-8")
+    sizes = sink_sizes([sink, tmp_path / "fehlt.csv"])
+    sink.write_text("a\nb\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        truncate_sinks(sizes, max_growth=1)
+    assert sink.read_text(encoding="utf-8") == "a\nb\n"
+    assert truncate_sinks(sizes, max_growth=2) == {str(sink): 2}
+    assert sink.read_text(encoding="utf-8") == "a\n"
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Dashboard: History/Delta sind striktes JSON, Deltas tragen eine fortlaufende seq."""
+
+import json
+
+from cube.ground.dashboard import DashboardState, _json, _sse
+
+MAC = "ab" * 32
+
+
+def _strict(text):
+    def reject(const):
+        raise AssertionError(f"kein gültiges JSON für den Browser: {const}")
+    return json.loads(text, parse_constant=reject)
+
+
+def test_non_finite_readings_are_dropped():
+    state = DashboardState(history_points=100)
+    delta = state.ingest([
+        "ts,temperature_c,humidity_pct,pressure_hpa,mode,seq,sig",
+        f"2026-01-01T00:00:00,20.0,50.0,1000.0,NOMINAL,0,k1:{MAC}",
+        f"2026-01-01T00:00:01,nan,50.0,1000.0,NOMINAL,1,k1:{MAC}",
+        f"2026-01-01T00:00:02,20.0,inf,1000.0,NOMINAL,2,k1:{MAC}",
+        f"2026-01-01T00:00:03,20.0,50.0,-Infinity,NOMINAL,3,k1:{MAC},plausibility=range",
+    ], [])
+    assert delta["telemetry"]["ts"] == [1767225600.0]
+    _strict(_sse("delta", delta).split("data: ", 1)[1])
+    _strict(_json(state.history()))
+
+
+def test_malformed_audit_records_are_skipped():
+    state = DashboardState(history_points=100)
+    delta = state.ingest([], [
+        '{"event": "verify_result", "ts": NaN, "ok": true}',
+        '{"event": "verify_result", "ts": Infinity, "ok": true}',
+        '{"event": "admission_shed", "ts": 5, "meta": {"packets": NaN}}',
+        '{"event": "lockout_enabled", "ts": 7, "reason": NaN, "meta": {"until": Infinity}}',
+        '{"event": "verify_result", "ts": 12, "ok": false, "reason": "invalid_signature"}',
+        "[1, 2]",
+        "kein json",
+    ])
+    history = _strict(_json(state.history()))
+    assert history["security"]["totals"]["fail"] == 1
+    assert history["security"]["lockout"]["until"] is None
+    assert delta["seq"] == history["seq"] == 1
+
+
+def test_seq_increases_only_on_changes():
+    state = DashboardState(history_points=100)
+    assert state.ingest([], []) is None
+    first = state.ingest([f"2026-01-01T00:00:00,20.0,50.0,1000.0,NOMINAL,0,k1:{MAC}"], [])
+    second = state.ingest([f"2026-01-01T00:00:01,20.0,50.0,1000.0,NOMINAL,1,k1:{MAC}"], [])
+    assert (first["seq"], second["seq"], state.history()["seq"]) == (1, 2, 2)
+    assert len(state.history()["telemetry"]["ts"]) == 2
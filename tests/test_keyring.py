@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""Schlüsselbund: Gründe der Prüfung, Gültigkeitsfenster, Widerruf, Hot-Reload, Einzelschlüssel."""
+
+import hashlib
+import hmac
+import json
+import os
+
+import pytest
+
+from cube.ground import verify
+from cube.ground.keyring import Keyring, parse_keyring
+from cube.ground.packet import parse_packet
+
+K1 = "00112233445566778899aabbccddeeff"
+K2 = "ffeeddccbbaa99887766554433221100"
+PAYLOAD = b"2026-01-01T00:00:00Z,21.50,40.00,1013.25,NOMINAL,0"
+
+
+def mac(secret_hex, payload=PAYLOAD):
+    return hmac.new(bytes.fromhex(secret_hex), payload, hashlib.sha256).digest()
+
+
+def _no_legacy():
+    raise AssertionError("Einzelschlüssel trotz Schlüsselbund geladen")
+
+
+@pytest.fixture
+def keyring_file(tmp_path):
+    path = tmp_path / "keyring.json"
+
+    def write(doc):
+        path.write_text(json.dumps(doc), encoding="utf-8")
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))  # mtime sicher ändern
+        return path
+
+    write({"default_key_id": "k1", "keys": [
+        {"id": "k1", "secret_hex": K1, "not_after": "2026-06-01T00:00:00Z"},
+        {"id": "k2", "secret_hex": K2, "not_before": "2026-05-01T00:00:00Z"},
+    ]})
+    return path, write
+
+
+def test_check_reasons(keyring_file):
+    path, _ = keyring_file
+    ring = Keyring(path, legacy_secret=_no_legacy, reload_seconds=0)
+    jan, jul = 1767225600.0, 1782864000.0  # 2026-01-01, 2026-07-01
+    assert ring.check("k1", jan, PAYLOAD, mac(K1)) == "ok"
+    assert ring.check(None, jan, PAYLOAD, mac(K1)) == "ok"  # Standardschlüssel
+    assert ring.check("k1", jan, PAYLOAD, mac(K2)) == "invalid_signature"
+    assert ring.check("k9", jan, PAYLOAD, mac(K1)) == "unknown_key_id"
+    assert ring.check("k1", jul, PAYLOAD, mac(K1)) == "key_not_valid"
+    assert ring.check("k2", jan, PAYLOAD, mac(K2)) == "key_not_valid"
+    assert ring.check("k2", jul, PAYLOAD, mac(K2)) == "ok"
+    # Zulassung: nur Signatur, ohne Fenster
+    assert ring.authentic("k1", PAYLOAD, mac(K1)) and not ring.authentic("k1", PAYLOAD, mac(K2))
+    assert ring.known("k2") and not ring.known("k9")
+
+
+def test_revoked_key_is_never_authentic(keyring_file):
+    path, write = keyring_file
+    ring = Keyring(path, legacy_secret=_no_legacy, reload_seconds=0)
+    assert ring.authentic("k1", PAYLOAD, mac(K1))
+    write({"keys": [{"id": "k1", "secret_hex": K1, "revoked": True}]})
+    assert not ring.authentic("k1", PAYLOAD, mac(K1))
+    assert ring.check("k1", 1767225600.0, PAYLOAD, mac(K1)) == "key_not_valid"
+
+
+def test_invalid_reload_keeps_previous_keys(keyring_file, capsys):
+    path, write = keyring_file
+    ring = Keyring(path, legacy_secret=_no_legacy, reload_seconds=0)
+    assert ring.known("k1")
+    write({"keys": [{"id": "k1"}]})  # secret_hex fehlt
+    assert ring.check("k1", 1767225600.0, PAYLOAD, mac(K1)) == "ok"
+    assert "Reload abgelehnt" in capsys.readouterr().out
+
+
+def test_parse_keyring_rejects_bad_documents():
+    for doc in ({}, {"keys": [{"id": "a b", "secret_hex": K1}]},
+                {"keys": [{"id": "k1", "secret_hex": K1}, {"id": "k1", "secret_hex": K2}]},
+                {"default_key_id": "k2", "keys": [{"id": "k1", "secret_hex": K1}]},
+                {"keys": [{"id": "k1", "secret_hex": "zz"}]}):
+        with pytest.raises(ValueError):
+            parse_keyring(doc)
+
+
+def test_check_packet_with_legacy_secret(tmp_path, monkeypatch):
+    monkeypatch.setenv("HMAC_SECRET_HEX", K1)
+    monkeypatch.delenv("HMAC_KEY_ID", raising=False)
+    monkeypatch.setattr(verify, "CFG_PATH", tmp_path / "ground.json")
+    monkeypatch.setattr(verify, "KEYRING_PATH", tmp_path / "keyring.json")
+    monkeypatch.setattr(verify, "_KEYRING", None)
+    line = PAYLOAD.decode() + ",k1:" + mac(K1).hex()
+    assert verify.check_packet(parse_packet(line)) == "ok"
+    assert verify.line_signature_ok(line)
+    assert verify.check_packet(parse_packet(line.replace("21.50", "21.51"))) == "invalid_signature"
+    assert not verify.line_signature_ok(line.replace("21.50", "21.51"))
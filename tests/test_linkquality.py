@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Sequenz-Fenster: Lücken, Umordnung, Duplikate, verspätete Pakete, Sender-Neustart."""
+
+from cube.ground.linkquality import RESET_DISTANCE, WINDOW, LinkQuality, SeqWindow
+
+
+def observe_all(window, seqs):
+    return [window.observe(s) for s in seqs]
+
+
+def test_gap_reorder_duplicate():
+    w = SeqWindow()
+    assert observe_all(w, [0, 1, 2, 5, 4, 4, 6]) == [
+        "ok", "ok", "ok", "seq_gap", "seq_reorder", "seq_duplicate", "ok"]
+    s = w.stats()
+    assert (s["expected"], s["received"], s["lost"]) == (7, 6, 1)
+    assert (s["duplicates"], s["reordered"], s["bursts"], s["burst_max"]) == (1, 1, 1, 2)
+    assert s["loss_pct"] == round(100.0 / 7, 3)
+
+
+def test_stale_packet_beyond_window_counts_as_received():
+    w = SeqWindow()
+    w.observe(0)
+    w.observe(WINDOW + 10)
+    assert w.observe(5) == "seq_stale"
+    s = w.stats()
+    assert s["stale"] == 1 and s["received"] == 3
+    assert s["lost"] == s["expected"] - 3
+
+
+def test_reset_keeps_counters():
+    w = SeqWindow()
+    observe_all(w, range(RESET_DISTANCE + 100, RESET_DISTANCE + 110))
+    assert w.observe(0) == "seq_reset"
+    assert w.observe(1) == "ok"
+    s = w.stats()
+    assert s["resets"] == 1
+    assert (s["expected"], s["received"], s["lost"]) == (12, 12, 0)
+
+
+def test_links_are_independent_and_pop_removes():
+    lq = LinkQuality(publish_interval=3600)
+    assert not lq.due()
+    lq.observe("a", 0)
+    lq.observe("b", 100)
+    assert lq.observe("a", 1) == "ok"
+    assert lq.observe("b", 103) == "seq_gap"
+    assert set(lq.stats()) == {"a", "b"}
+    assert lq.pop("b")["lost"] == 2
+    assert lq.pop("b") is None and set(lq.stats()) == {"a"}
+    assert not lq.due()  # Intervall noch nicht abgelaufen
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""Paket-Parser: Grundcodes der Strukturfehler und typisierte Felder."""
+
+import math
+
+import pytest
+
+from cube.ground.packet import PacketError, parse_packet
+
+MAC = "ab" * 32
+LINE = f"2026-01-01T00:00:00,20.50,40.00,1013.25,NOMINAL,7,k1:{MAC}"
+
+
+def test_parses_fields():
+    pkt = parse_packet(LINE + "\r\n")
+    assert pkt.packet_id == "2026-01-01T00:00:00"
+    assert pkt.ts == 1767225600.0
+    assert pkt.values == (20.5, 40.0, 1013.25)
+    assert (pkt.mode, pkt.seq, pkt.key_id) == ("NOMINAL", 7, "k1")
+    assert pkt.mac == bytes.fromhex(MAC)
+    assert bytes(pkt.payload) == LINE.rpartition(",")[0].encode("utf-8")
+
+
+def test_legacy_line_without_seq_and_key_id():
+    pkt = parse_packet(f"2026-01-01T00:00:00,20.50,40.00,1013.25,NOMINAL,{MAC}")
+    assert pkt.seq is None and pkt.key_id is None
+
+
+def test_non_numeric_values_are_not_structural_errors():
+    pkt = parse_packet(f"gestern,x,40.00,1013.25,NOMINAL,7,k1:{MAC}")
+    assert pkt.ts is None and math.isnan(pkt.temperature_c)
+
+
+@pytest.mark.parametrize("line, reason", [
+    ("a,b,c", "wrong_field_count"),
+    (f"{LINE},extra", "wrong_field_count"),
+    (f"2026-01-01T00:00:00,1,2,3,NOMINAL,-1,k1:{MAC}", "bad_seq"),
+    (f"2026-01-01T00:00:00,1,2,3,NOMINAL,²,k1:{MAC}", "bad_seq"),
+    (f"2026-01-01T00:00:00,1,2,3,NOMINAL,١٢,k1:{MAC}", "bad_seq"),
+    (f"2026-01-01T00:00:00,1,2,3,NOMINAL,7,:{MAC}", "bad_key_id"),
+    (f"2026-01-01T00:00:00,1,2,3,NOMINAL,7,k/1:{MAC}", "bad_key_id"),
+    (f"2026-01-01T00:00:00,1,2,3,NOMINAL,7,{'k' * 17}:{MAC}", "bad_key_id"),
+    ("2026-01-01T00:00:00,1,2,3,NOMINAL,7,k1:", "empty_mac"),
+    ("2026-01-01T00:00:00,1,2,3,NOMINAL,7,k1:FAKESIGN", "bad_mac_length"),
+    (f"2026-01-01T00:00:00,1,2,3,NOMINAL,7,k1:{'zz' * 32}", "bad_mac_hex"),
+])
+def test_structural_errors(line, reason):
+    with pytest.raises(PacketError) as exc:
+        parse_packet(line)
+    assert exc.value.reason == reason
+    assert exc.value.packet_id == line.split(",")[0]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Plausibilitätsprüfung: Messbereich, NaN, Sprünge mit Niveauwechsel, hängender Sensor, Ströme."""
+
+from types import SimpleNamespace
+
+from cube.ground.plausibility import PlausibilityScorer
+
+
+def row(i, temp=21.0):
+    # leicht schwankend, damit der Stuck-Zähler nicht anspringt
+    return (temp + 0.01 * (i % 3), 40.0, 1013.0)
+
+
+def warm(scorer, stream=None, n=20, temp=21.0):
+    for i in range(n):
+        assert scorer.score(row(i, temp), stream) is None
+
+
+def test_range_and_non_numeric():
+    s = PlausibilityScorer()
+    assert s.score((90.0, 40.0, 1013.0)) == "out_of_range"
+    assert s.score((21.0, 40.0, 200.0)) == "out_of_range"
+    assert s.score((float("nan"), 40.0, 1013.0)) == "non_numeric"
+    assert s.score((21.0, float("inf"), 1013.0)) == "non_numeric"
+    assert s.score_packet(SimpleNamespace(ts=None, values=(21.0, 40.0, 1013.0))) == "bad_timestamp"
+    assert s.counts == {"out_of_range": 2, "non_numeric": 2, "bad_timestamp": 1}
+
+
+def test_jump_then_sustained_level_change_relearns():
+    s = PlausibilityScorer(warmup=10)
+    warm(s)
+    for i in range(9):
+        assert s.score(row(i, 60.0)) == "implausible_jump"
+    # zehnter Sprung in Folge: Niveauwechsel, Modell neu gelernt
+    assert s.score(row(9, 60.0)) is None
+    for i in range(10, 20):
+        assert s.score(row(i, 60.0)) is None
+    assert s.counts == {"implausible_jump": 9}
+
+
+def test_single_outlier_does_not_poison_model():
+    s = PlausibilityScorer(warmup=10)
+    warm(s)
+    assert s.score(row(0, 60.0)) == "implausible_jump"
+    assert s.score(row(1)) is None
+    assert s.score(row(2, 60.0)) == "implausible_jump"
+
+
+def test_stuck_sensor():
+    s = PlausibilityScorer(stuck_threshold=5)
+    results = [s.score((21.0, 40.0, 1013.0)) for _ in range(6)]
+    assert results == [None, None, None, None, "stuck_sensor", "stuck_sensor"]
+
+
+def test_streams_are_isolated_and_bounded():
+    s = PlausibilityScorer(warmup=10, max_streams=2)
+    warm(s, "a")
+    # Strom b startet auf anderem Niveau, ohne Sprung gegenüber a
+    warm(s, "b", temp=60.0)
+    assert s.score(row(0, 60.0), "a") == "implausible_jump"
+    s.forget(lambda key: key == "a")
+    assert s.score(row(0, 60.0), "a") is None  # neuer Strom, kein Modell
+    s.score(row(0), "c")  # verdrängt den ältesten Strom (b)
+    assert set(s._streams) == {"a", "c"}
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Rollups: Schreiben, Zusammenführen mehrfach geschriebener Buckets, Auswahl im Plot."""
+
+import datetime
+
+import pytest
+
+from cube.ground import plot
+from cube.ground.rollup import ROLLUP_HEADER, RollupWriter, rollup_path
+
+pytest.importorskip("pandas")
+
+T0 = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc).timestamp()
+
+
+def _iso(ts):
+    return datetime.datetime.fromtimestamp(ts, datetime.timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def test_late_row_does_not_override_newer_last(tmp_path):
+    base = tmp_path / "telemetry.csv"
+    writer = RollupWriter(base, resolutions={"1m": 60})
+    writer.add(T0 + 10, (20.0, 40.0, 1000.0))
+    writer.add(T0 + 50, (22.0, 42.0, 1002.0))   # jüngster Wert im Bucket T0
+    writer.add(T0 + 70, (30.0, 50.0, 1010.0))   # neuer Bucket → T0 wird geschrieben
+    writer.add(T0 + 20, (10.0, 30.0, 990.0))    # verspätet: eigene Zeile nach dem Bucket
+    writer.flush()
+
+    df = plot._load_rollup(rollup_path(base, "1m"), span_sec=3600)
+    first = df.iloc[0]
+    assert first["count"] == 3
+    assert first["temperature_c_last"] == 22.0
+    assert first["temperature_c_min"] == 10.0 and first["temperature_c_max"] == 22.0
+    assert first["temperature_norm"] == pytest.approx((20.0 + 22.0 + 10.0) / 3)
+    assert list(df["count"]) == [3, 1]
+
+
+def test_reads_rollups_without_last_ts(tmp_path):
+    path = tmp_path / "telemetry_1m.csv"
+    old_header = ROLLUP_HEADER.rsplit(",", 1)[0]
+    stats = ",".join(["1.00,2.00,1.5000,2.00"] * 3)
+    path.write_text(f"{old_header}\n{_iso(T0)},2,{stats}\n{_iso(T0)},1,{stats},{T0 + 5:.3f}\n", encoding="utf-8")
+    df = plot._load_rollup(path, span_sec=3600)
+    assert list(df["count"]) == [3]
+
+
+def _raw(path, start, end, step):
+    rows = [f"{_iso(t)},20.0,40.0,1000.0,NOMINAL,0,k1:{'ab' * 32}" for t in range(int(start), int(end), step)]
+    path.write_text("ts,temperature_c,humidity_pct,pressure_hpa,mode,seq,sig\n" + "\n".join(rows) + "\n", encoding="utf-8")
+
+
+def _rollup(path, start, end, width):
+    stats = ",".join(["20.00,20.00,20.0000,20.00"] * 3)
+    rows = [f"{_iso(t)},1,{stats},{t:.3f}" for t in range(int(start), int(end), width)]
+    path.write_text(ROLLUP_HEADER + "\n" + "\n".join(rows) + "\n", encoding="utf-8")
+
+
+def test_pick_rollup_requires_coverage(tmp_path):
+    base = tmp_path / "telemetry.csv"
+    day = 86400
+    _raw(base, T0, T0 + 10 * day, 600)
+    hourly = rollup_path(base, "1h")
+
+    # Rollups erst seit dem letzten Tag: ein 7-Tage-Fenster ist nicht abgedeckt
+    _rollup(hourly, T0 + 9 * day, T0 + 10 * day, 3600)
+    assert plot._pick_rollup(base, 7 * day, min_points=100) is None
+
+    _rollup(hourly, T0, T0 + 10 * day, 3600)
+    assert plot._pick_rollup(base, 7 * day, min_points=100) == hourly
+
+    # Veraltet: letzter Bucket einen Tag vor dem jüngsten Rohdatum
+    _rollup(hourly, T0, T0 + 9 * day, 3600)
+    assert plot._pick_rollup(base, 7 * day, min_points=100) is None
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""SecurityManager: Audit-Schreibpfad je log_mode."""
+
+import json
+
+import pytest
+import yaml
+
+from ground_station.security_manager import SecurityManager
+from tests.conftest import PROJECT_ROOT
+
+
+@pytest.fixture
+def make_secman(tmp_path):
+    policy = yaml.safe_load((PROJECT_ROOT / "configs" / "security_policy.yaml").read_text(encoding="utf-8"))
+    policy.update(state_snapshot_path=None, policy_reload_seconds=0)
+    policy_path = tmp_path / "policy.yaml"
+    policy_path.write_text(yaml.safe_dump(policy), encoding="utf-8")
+    created = []
+
+    def make(log_mode):
+        sm = SecurityManager(str(policy_path), security_log_path=str(tmp_path / "security.log"),
+                             audit_log_path=str(tmp_path / f"audit-{log_mode}.jsonl"), log_mode=log_mode)
+        created.append(sm)
+        return sm
+
+    yield make
+    for sm in created:
+        sm.close()
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_summary_mode_buffers_audit_until_flush(make_secman, tmp_path):
+    sm = make_secman("summary")
+    audit = tmp_path / "audit-summary.jsonl"
+    for i in range(3):
+        sm.on_verification_result(ok=True, reason="ok", meta={"source": "file", "packet_id": str(i)})
+    assert audit.read_text(encoding="utf-8") == ""
+    sm.flush_audit()
+    assert [r["meta"]["packet_id"] for r in _records(audit)] == ["0", "1", "2"]
+    sm.on_verification_result(ok=False, reason="invalid_signature", meta={"source": "file", "packet_id": "3"})
+    sm.close()
+    assert [r["reason"] for r in _records(audit)][-1] == "invalid_signature"
+
+
+def test_verbose_mode_writes_each_record(make_secman, tmp_path):
+    sm = make_secman("verbose")
+    sm.on_verification_result(ok=True, reason="ok", meta={"source": "file", "packet_id": "0"})
+    assert _records(tmp_path / "audit-verbose.jsonl")[0]["event"] == "verify_result"
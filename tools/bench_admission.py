@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Flut-Benchmark für die Token-Bucket-Zulassung (Policy-Abschnitt 'admission')
+
+Zweck:
+  • Spielt einen Live-Strom über STDIN ein: eine Flut ungültig signierter
+    Pakete, die die echte Schlüssel-ID "k1" fälschen, verzahnt mit seltenen
+    gültig signierten Paketen des OBC (ebenfalls "k1")
+  • Misst CPU-Zeit pro Paket mit und ohne Zulassung und rechnet sie auf die
+    Ziel-Flutrate hoch: < 100 % heißt, die Station hält die Flut in Echtzeit
+    aus und behält CPU für legitimen Verkehr
+  • Ziel: Zulassung aktiv, CPU-Bedarf bei 100k pkt/s Flut < 100 % und
+    höchstens verify_burst + verify_rate × Laufzeit HMAC-Prüfungen in der
+    Zulassung (der Rest der Flut wird ohne HMAC verworfen)
+
+Die Pakete laufen durch receive_from_stdin (Zulassung → RAW → handle_line),
+genau wie im Betrieb mit --stdin: Eimer je Schlüssel-ID, bei leerem Eimer
+entscheidet die reine HMAC-Prüfung im Rahmen des Prüf-Budgets. Jeder Lauf findet in einer temporären
+Kopie des Projekts statt (eigener Prozess, eigenes data/ und logs/).
+
+Hinweis: Auch die zugelassenen Flut-Pakete lösen den (globalen) Lockout aus;
+gültige Pakete landen währenddessen wie bisher in der Quarantäne. Die
+Zulassung spart Rechenzeit, ersetzt den Lockout aber nicht.
+
+Aufruf:
+    python tools/bench_admission.py [--seconds 2] [--flood-rate 100000] [--legit-rate 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import hmac
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+BENCH_SECRET_HEX = "00112233445566778899aabbccddeeff"
+TARGET_CPU_PCT = 100.0
+
+
+def _copy_project(dst: Path) -> None:
+    """Kopiert Code, Policy und dieses Skript (keine Daten) in ein Temp-Verzeichnis."""
+    ignore = shutil.ignore_patterns("__pycache__", "*.pyc", "docs")
+    for name in ("cube", "ground_station", "configs", "tools"):
+        shutil.copytree(PROJECT_ROOT / name, dst / name, ignore=ignore)
+
+
+def _set_admission(root: Path, enabled: bool) -> None:
+    """Schaltet die Zulassung in der Policy der Kopie ein/aus (Rest wie im Projekt)."""
+    import yaml
+
+    path = root / "configs" / "security_policy.yaml"
+    policy = yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    policy.setdefault("admission", {})["enabled"] = enabled
+    policy["state_snapshot_path"] = None
+    path.write_text(yaml.safe_dump(policy, sort_keys=False), encoding="utf-8")
+
+
+def _stream(seconds: float, flood_rate: int, legit_rate: int):
+    """Verzahnter Strom (Zeile, Herkunft): alle flood_rate/legit_rate Pakete ein gültiges."""
+    key = bytes.fromhex(BENCH_SECRET_HEX)
+    total = int(seconds * flood_rate)
+    every = max(1, flood_rate // max(1, legit_rate))
+    legit_seq = flood_seq = 0
+    lines = []
+    for i in range(total):
+        if i % every == 0:
+            payload = f"2026-01-01T00:00:00Z,21.50,40.00,1013.25,NOMINAL,{legit_seq}"
+            sig = hmac.new(key, payload.encode("utf-8"), hashlib.sha256).hexdigest()
+            lines.append((f"{payload},k1:{sig}\n", "obc"))
+            legit_seq += 1
+        else:
+            lines.append((f"2026-01-01T00:00:00Z,99.00,0.00,0.00,FLOOD,{flood_seq},k1:{'ab' * 32}\n", "flood"))
+            flood_seq += 1
+    return lines
+
+
+def _worker(seconds: float, flood_rate: int, legit_rate: int) -> dict:
+    """Läuft in der Projektkopie (cwd): Strom einspielen und Kennzahlen als JSON liefern."""
+    sys.path.insert(0, os.getcwd())
+    from cube.ground import receiver as rx
+    from cube.ground.config.paths import PROC_PATH, RAW_PATH
+    from ground_station.security_manager import SecurityManager
+
+    stream = _stream(seconds, flood_rate, legit_rate)
+    secman = SecurityManager(policy_path="configs/security_policy.yaml", log_mode="summary")
+    rx.SUMMARY.configure("summary", interval=3600)
+    rx.SUMMARY.out = open(os.devnull, "w")
+    # HMAC-Prüfungen der Zulassung zählen (admit_line ruft signature_ok je erschöpfter Zeile)
+    hmac_checks = [0]
+    signature_ok = rx.signature_ok
+
+    def counting_signature_ok(line):
+        hmac_checks[0] += 1
+        return signature_ok(line)
+
+    rx.signature_ok = counting_signature_ok
+    admission = secman._admission
+    legit_lines = {line for line, origin in stream if origin == "obc"}
+
+    sys.stdin = io.StringIO("".join(line for line, _ in stream))
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    t0 = time.perf_counter()
+    c0 = time.process_time()
+    try:
+        rx.receive_from_stdin(secman)
+    finally:
+        sys.stdout = stdout
+    cpu = time.process_time() - c0
+    wall = time.perf_counter() - t0
+    rx.ROLLUPS.flush()
+    secman.close()
+
+    def rows(path):
+        if not path.exists():
+            return []
+        with path.open(encoding="utf-8") as f:
+            return [line for line in f if not rx.is_header(line)]
+
+    # RAW enthält genau die zugelassenen Zeilen
+    raw = rows(RAW_PATH)
+    legit_admitted = sum(1 for line in raw if line in legit_lines)
+    shed = {"obc": len(legit_lines) - legit_admitted,
+            "flood": len(stream) - len(legit_lines) - (len(raw) - legit_admitted)}
+    # Eine Quelle ("stdin/k1"): Vorrat plus Nachfüllung über die Laufzeit
+    budget = (admission.verify_burst + admission.verify_rate * wall
+              if admission.enabled and admission.verify_rate > 0 else None)
+    return {"packets": len(stream), "cpu": cpu, "wall": wall, "shed": shed,
+            "legit": len(legit_lines), "legit_processed": len(rows(PROC_PATH)),
+            "hmac_checks": hmac_checks[0], "hmac_budget": budget}
+
+
+def _run(enabled: bool, args: argparse.Namespace) -> dict:
+    with tempfile.TemporaryDirectory(prefix="cubesat_flood_") as tmp:
+        root = Path(tmp)
+        _copy_project(root)
+        _set_admission(root, enabled)
+        env = dict(os.environ, HMAC_SECRET_HEX=BENCH_SECRET_HEX)
+        out = subprocess.run(
+            [sys.executable, str(root / "tools" / "bench_admission.py"), "--worker",
+             "--seconds", str(args.seconds), "--flood-rate", str(args.flood_rate),
+             "--legit-rate", str(args.legit_rate)],
+            cwd=root, env=env, check=True, capture_output=True, text=True,
+        ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _report(label: str, r: dict, flood_rate: int) -> float:
+    per_packet_us = r["cpu"] / r["packets"] * 1e6
+    cpu_pct = per_packet_us * flood_rate / 1e4
+    print(f"{label}: {r['packets']} Pakete, CPU {r['cpu']:.2f}s ({per_packet_us:.2f} µs/Paket, "
+          f"{r['packets'] / r['wall']:,.0f} pkt/s) → CPU-Bedarf bei {flood_rate:,} pkt/s: {cpu_pct:.0f} %")
+    print(f"    verworfen: flood={r['shed']['flood']} obc={r['shed']['obc']}, "
+          f"gültige Pakete verarbeitet: {r['legit_processed']}/{r['legit']}")
+    if r["hmac_budget"] is not None:
+        print(f"    HMAC-Prüfungen in der Zulassung: {r['hmac_checks']} (Budget {r['hmac_budget']:.0f})")
+    return cpu_pct
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Flut-Benchmark für die Token-Bucket-Zulassung")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Länge des Stroms in Sekunden Flut")
+    parser.add_argument("--flood-rate", type=int, default=100_000, help="Flutrate (pkt/s) der Quelle 'flood'")
+    parser.add_argument("--legit-rate", type=int, default=20, help="Rate (pkt/s) gültiger Pakete der Quelle 'obc'")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_worker(args.seconds, args.flood_rate, args.legit_rate)))
+        return 0
+
+    off = _report("admission aus", _run(False, args), args.flood_rate)
+    result = _run(True, args)
+    on = _report("admission an ", result, args.flood_rate)
+    print(f"Entlastung: Faktor {off / on:.1f}" if on > 0 else "")
+    cpu_ok = on < TARGET_CPU_PCT
+    print(f"{'[OK] ' if cpu_ok else '[ERR]'} Ziel CPU-Bedarf < {TARGET_CPU_PCT:.0f} % bei aktiver Zulassung ({on:.0f} %)")
+    budget = result["hmac_budget"]
+    hmac_ok = budget is None or result["hmac_checks"] <= budget
+    print(f"{'[OK] ' if hmac_ok else '[ERR]'} HMAC-Prüfungen der Zulassung im Budget "
+          f"({result['hmac_checks']} ≤ {budget if budget is None else round(budget)})")
+    return 0 if cpu_ok and hmac_ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
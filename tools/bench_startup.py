@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Startup-Benchmark für die Bodenstations-CLIs
+
+Zweck:
+  • Misst die Time-to-first-packet von receiver.py (Prozessstart bis zur
+    ersten Ergebniszeile). Das Paket ist gültig signiert ("k1:", Schlüssel
+    aus HMAC_SECRET_HEX), die Messung enthält also Parser, Schlüsselbund und
+    HMAC-Prüfung; jede andere Ergebniszeile als "[OK]" bricht ab
+  • Optional: misst einen headless Plot-Lauf (plot.py --headless --save)
+  • Ziel: Receiver < 100 ms (Median)
+
+Der Benchmark läuft in einer temporären Kopie des Projekts, damit
+data/ und logs/ des echten Projekts nicht verändert werden.
+
+Aufruf:
+    python tools/bench_startup.py [--runs 20] [--plot]
+"""
+
+from __future__ import annotations
+
+import argparse
+import compileall
+import hashlib
+import hmac
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+TARGET_MS = 100.0
+RESULT_PREFIXES = ("[OK]", "[REJECTED]", "[LOCKED]", "[ANOMALY]")
+BENCH_SECRET_HEX = "00112233445566778899aabbccddeeff"
+
+
+def _sample_csv() -> str:
+    """Kopfzeile plus ein mit BENCH_SECRET_HEX gültig signiertes Paket (Schlüssel-ID k1)."""
+    payload = "2025-11-08T12:00:00Z,23.20,43.30,1012.06,sim,0"
+    sig = hmac.new(bytes.fromhex(BENCH_SECRET_HEX), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+    return f"ts,temperature_c,humidity_pct,pressure_hpa,mode,seq,sig\n{payload},k1:{sig}\n"
+
+
+def _copy_project(dst: Path) -> None:
+    """
+    Kopiert nur den Code und die Policy (keine Daten) in ein Temp-Verzeichnis
+    und legt den Bytecode an – auch wenn PYTHONDONTWRITEBYTECODE gesetzt ist,
+    misst der Benchmark so den Dauerbetrieb statt eines Kompilierlaufs.
+    """
+    ignore = shutil.ignore_patterns("__pycache__", "*.pyc", "docs")
+    for name in ("cube", "ground_station", "configs"):
+        shutil.copytree(PROJECT_ROOT / name, dst / name, ignore=ignore)
+        compileall.compile_dir(dst / name, quiet=1)
+
+
+def _time_to_first_packet(root: Path, csv_path: Path) -> float:
+    """Startet den Receiver und liefert die Zeit bis zur ersten Ergebniszeile (ms)."""
+    env = dict(os.environ, PYTHONUNBUFFERED="1", HMAC_SECRET_HEX=BENCH_SECRET_HEX)
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "cube.ground.receiver", "--file", str(csv_path), "--no-checkpoint"],
+        cwd=root, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+    )
+    elapsed = result = None
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        if line.startswith(RESULT_PREFIXES):
+            elapsed = (time.perf_counter() - t0) * 1000.0
+            result = line.strip()
+            break
+    proc.stdout.close()
+    proc.wait()
+    if elapsed is None:
+        raise RuntimeError("Receiver lieferte keine Ergebniszeile")
+    if not result.startswith("[OK]"):
+        # Nur ein verifiziertes Paket misst den vollständigen (lazy) Verify-Pfad
+        raise RuntimeError(f"Receiver lieferte {result!r} statt [OK]")
+    return elapsed
+
+
+def _time_plot_headless(root: Path, csv_path: Path, out_png: Path) -> float:
+    """Misst einen vollständigen headless Plot-Lauf (ms)."""
+    t0 = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "cube.ground.plot", "--csv", str(csv_path), "--headless", "--save", str(out_png)],
+        cwd=root, check=True, stdout=subprocess.DEVNULL,
+    )
+    return (time.perf_counter() - t0) * 1000.0
+
+
+def _summary(label: str, samples: list[float]) -> str:
+    samples = sorted(samples)
+    p90 = samples[min(len(samples) - 1, int(round(0.9 * (len(samples) - 1))))]
+    return (f"{label}: min={samples[0]:.1f} ms  median={statistics.median(samples):.1f} ms  "
+            f"p90={p90:.1f} ms  (n={len(samples)})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Startup-Benchmark receiver.py / plot.py")
+    parser.add_argument("--runs", type=int, default=20, help="Anzahl Messläufe pro CLI")
+    parser.add_argument("--plot", action="store_true", help="zusätzlich plot.py --headless messen")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="cubesat_bench_") as tmp:
+        root = Path(tmp)
+        _copy_project(root)
+        csv_path = root / "bench.csv"
+        csv_path.write_text(_sample_csv(), encoding="utf-8")
+
+        # Warm-up: füllt Bytecode- und Policy-Cache (entspricht dem Dauerbetrieb per Cron)
+        _time_to_first_packet(root, csv_path)
+
+        recv = [_time_to_first_packet(root, csv_path) for _ in range(args.runs)]
+        print(_summary("receiver time-to-first-packet", recv))
+        median = statistics.median(recv)
+        status = "[OK] " if median < TARGET_MS else "[ERR]"
+        print(f"{status} Ziel < {TARGET_MS:.0f} ms (Median {median:.1f} ms)")
+
+        if args.plot:
+            out_png = root / "bench.png"
+            _time_plot_headless(root, csv_path, out_png)
+            plot = [_time_plot_headless(root, csv_path, out_png) for _ in range(max(1, args.runs // 4))]
+            print(_summary("plot --headless --save", plot))
+
+    return 0 if median < TARGET_MS else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Soak-Test für Receiver + SecurityManager (Speicher- und Latenzstabilität)
+
+Zweck:
+  • Schiebt zig Millionen erzeugte Pakete durch handle_line mit echtem
+    SecurityManager, abwechselnd ruhige Phasen (gültig signiert) und
+    Angriffsphasen (ungültige Signaturen, kaputte Zeilen, Replays,
+    unbekannte Schlüssel-IDs → Lockouts, Quarantäne)
+  • Misst alle --sample-every Pakete: RSS, Python-Objekte (gc), Länge des
+    Ereignisfensters, optional tracemalloc, Latenz pro Paket (p50/p99)
+  • Schlägt fehl (Exit-Code 1), wenn nach der Aufwärmphase von der ersten
+    zur zweiten Hälfte der Messpunkte
+      – der RSS-Spitzenwert um mehr als --max-rss-growth-mb wächst,
+      – die Objektanzahl um mehr als --max-object-growth wächst,
+      – der Median von p50/p99 einer Phase um mehr als den Faktor
+        --max-latency-drift / --max-p99-drift steigt
+
+Zeitbasis: standardmäßig clock=event mit Paket-Zeitstempeln im Takt von
+--rate pkt/s. Das Analysefenster enthält dann window_seconds × rate
+Ereignisse wie im Live-Betrieb – unabhängig davon, wie schnell der Test
+läuft. --clock wall füllt das Fenster mit allem, was in window_seconds
+Wanduhr durchläuft (Stresstest für das Fenster selbst).
+
+Senken (PROCESSED/REJECTED/ANOMALIES/Quarantäne, Security-Log, Audit) gehen
+standardmäßig nach /dev/null – der Schreibpfad (Datei öffnen, formatieren,
+schreiben) läuft vollständig, ohne die Platte zu füllen. --sink disk schreibt
+in die temporäre Projektkopie.
+
+Aufruf:
+    python tools/soak.py                                  # 20 Mio. Pakete
+    python tools/soak.py --packets 2000000 --phase-packets 200000 --sample-every 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+SOAK_SECRET_HEX = "00112233445566778899aabbccddeeff"
+LINKS = ("obc-a", "obc-b")
+BASE_TS = 1_790_000_000  # 2026-09-21T…Z
+
+
+def _copy_project(dst: Path) -> None:
+    """Kopiert Code, Policy und dieses Skript (keine Daten) in ein Temp-Verzeichnis."""
+    ignore = shutil.ignore_patterns("__pycache__", "*.pyc", "docs")
+    for name in ("cube", "ground_station", "configs", "tools"):
+        shutil.copytree(PROJECT_ROOT / name, dst / name, ignore=ignore)
+
+
+def _rss_bytes() -> int:
+    """Aktueller RSS (Linux: /proc/self/statm), sonst Spitzenwert aus getrusage."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _packets(total: int, phase_packets: int, rate: int) -> Iterator[Tuple[str, str, str]]:
+    """
+    Erzeugt (Zeile, Link, Phase). Angriffsphasen mischen je 10 Pakete:
+    4 ungültige Signaturen, 1 kaputte Zeile, 1 Replay, 1 unbekannte
+    Schlüssel-ID, 3 gültige.
+    """
+    key = bytes.fromhex(SOAK_SECRET_HEX)
+    seq = {link: 0 for link in LINKS}
+    last_valid = {link: "" for link in LINKS}
+    ts_second, ts_text = -1, ""
+    for i in range(total):
+        phase = "attack" if (i // phase_packets) % 2 else "calm"
+        link = LINKS[i & 1]
+        second = BASE_TS + i // rate
+        if second != ts_second:
+            ts_second = second
+            ts_text = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second))
+        kind = i % 10 if phase == "attack" else 9
+
+        if kind == 4:
+            yield f"{ts_text},garbage,{i}", link, phase
+            continue
+        if kind == 5 and last_valid[link]:
+            yield last_valid[link], link, phase
+            continue
+        payload = (f"{ts_text},{20 + (i % 97) / 10:.2f},{40 + (i % 89) / 10:.2f},"
+                   f"{1000 + (i % 83) / 10:.2f},NOMINAL,{seq[link]}")
+        seq[link] += 1
+        if kind < 4:
+            yield f"{payload},k1:{os.urandom(32).hex()}", link, phase
+        elif kind == 6:
+            yield f"{payload},k9:{hmac.new(key, payload.encode(), hashlib.sha256).hexdigest()}", link, phase
+        else:
+            line = f"{payload},k1:{hmac.new(key, payload.encode(), hashlib.sha256).hexdigest()}"
+            last_valid[link] = line
+            yield line, link, phase
+
+
+def _percentile(sorted_values: array, q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _worker(args: argparse.Namespace) -> int:
+    """Läuft in der Projektkopie (cwd): Soak-Schleife, Messpunkte, Bewertung."""
+    sys.path.insert(0, os.getcwd())
+    from cube.ground import receiver as rx
+    from ground_station.security_manager import SecurityManager
+
+    devnull = Path(os.devnull)
+    quarantine = Path("data/quarantine/telemetry.csv")
+    logs = {}
+    if args.sink == "devnull":
+        rx.PROC_PATH = rx.REJ_PATH = rx.ANOM_PATH = quarantine = devnull
+        logs = {"security_log_path": os.devnull, "audit_log_path": os.devnull}
+    secman = SecurityManager(policy_path="configs/security_policy.yaml", log_mode="summary",
+                             clock=args.clock, **logs)
+    rx.SUMMARY.configure("summary", interval=10 ** 9)
+    rx.SUMMARY.out = open(os.devnull, "w")
+    rx.LINKS.publish_interval = 10 ** 9
+
+    if args.tracemalloc:
+        import tracemalloc
+        tracemalloc.start(1)
+
+    samples: List[Dict] = []
+    lat = array("d")
+    perf = time.perf_counter_ns
+    handle = rx.handle_line
+    t_interval = time.perf_counter()
+    print(f"[SOAK] {args.packets:,} Pakete, Phasen à {args.phase_packets:,}, clock={args.clock}, "
+          f"sink={args.sink}", flush=True)
+
+    for n, (line, link, phase) in enumerate(_packets(args.packets, args.phase_packets, args.rate), 1):
+        t0 = perf()
+        handle(line, secman=secman, source="file", quarantine_path=quarantine, link=link)
+        lat.append((perf() - t0) / 1000.0)
+        if n % args.sample_every:
+            continue
+
+        elapsed = time.perf_counter() - t_interval
+        values = array("d", sorted(lat))
+        gc.collect()
+        sample = {
+            "packets": n,
+            "phase": phase,
+            "rss_mb": _rss_bytes() / 2 ** 20,
+            "objects": len(gc.get_objects()),
+            "window_events": len(secman._events),
+            "p50_us": _percentile(values, 0.50),
+            "p99_us": _percentile(values, 0.99),
+            "rate": len(values) / elapsed if elapsed > 0 else 0.0,
+        }
+        if args.tracemalloc:
+            sample["traced_mb"] = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        samples.append(sample)
+        traced = f" py={sample['traced_mb']:.1f}MB" if args.tracemalloc else ""
+        print(f"[SOAK] {n / 1e6:7.2f}M {phase:6s} rss={sample['rss_mb']:.1f}MB{traced} "
+              f"objs={sample['objects']} fenster={sample['window_events']} "
+              f"p50={sample['p50_us']:.1f}µs p99={sample['p99_us']:.1f}µs {sample['rate']:,.0f} pkt/s",
+              flush=True)
+        lat = array("d")
+        t_interval = time.perf_counter()
+
+    rx.ROLLUPS.flush()
+    secman.close()
+    failures = _evaluate(samples, args)
+    if args.report:
+        Path(args.report).write_text(json.dumps({"args": vars(args), "samples": samples, "failures": failures},
+                                                indent=1), encoding="utf-8")
+    for msg in failures:
+        print(f"[ERR]  {msg}")
+    if not failures:
+        print("[OK]   Speicher und Latenz stabil")
+    return 1 if failures else 0
+
+
+def _evaluate(samples: List[Dict], args: argparse.Namespace) -> List[str]:
+    """
+    Vergleicht erste und zweite Hälfte der Messpunkte nach der Aufwärmphase.
+    Speicher: Spitzenwerte (das Fenster füllt und leert sich mit den Phasen,
+    ein Leck hebt die Spitzen). Latenz: Median je Phase (erste Messpunkte
+    nach einem Angriff fallen in den Lockout und sind schneller – beide
+    Hälften enthalten dieselbe Mischung).
+    """
+    steady = samples[int(len(samples) * args.warmup):]
+    if len(steady) < 8:
+        return [f"zu wenige Messpunkte nach der Aufwärmphase ({len(steady)} < 8) – "
+                f"--packets erhöhen oder --sample-every verringern"]
+
+    def halves(rows: List[Dict], key: str, agg) -> Tuple[float, float]:
+        mid = len(rows) // 2
+        return agg(r[key] for r in rows[:mid]), agg(r[key] for r in rows[mid:])
+
+    failures = []
+    start, end = halves(steady, "rss_mb", max)
+    if end - start > args.max_rss_growth_mb:
+        failures.append(f"RSS wächst um {end - start:.1f} MB ({start:.1f} → {end:.1f}), "
+                        f"Grenze {args.max_rss_growth_mb} MB")
+    if args.tracemalloc:
+        start, end = halves(steady, "traced_mb", max)
+        if end - start > args.max_rss_growth_mb:
+            failures.append(f"Python-Heap (tracemalloc) wächst um {end - start:.1f} MB")
+    start, end = halves(steady, "objects", max)
+    if end - start > args.max_object_growth:
+        failures.append(f"Objektanzahl wächst um {end - start:.0f} ({start:.0f} → {end:.0f}), "
+                        f"Grenze {args.max_object_growth}")
+
+    for phase in ("calm", "attack"):
+        rows = [r for r in steady if r["phase"] == phase]
+        if len(rows) < 4:
+            continue
+        for key, limit in (("p50_us", args.max_latency_drift), ("p99_us", args.max_p99_drift)):
+            start, end = halves(rows, key, statistics.median)
+            if start > 0 and end / start > limit:
+                failures.append(f"Latenz {key[:3]} ({phase}) driftet um Faktor {end / start:.2f} "
+                                f"({start:.1f} → {end:.1f} µs), Grenze {limit}")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Soak-Test: Speicher- und Latenzstabilität des Receivers")
+    parser.add_argument("--packets", type=int, default=20_000_000, help="Anzahl Pakete insgesamt")
+    parser.add_argument("--phase-packets", type=int, default=1_000_000, help="Pakete je ruhiger/Angriffsphase")
+    parser.add_argument("--sample-every", type=int, default=250_000, help="Messpunkt alle N Pakete")
+    parser.add_argument("--rate", type=int, default=1000, help="simulierte Paketrate für Zeitstempel (pkt/s)")
+    parser.add_argument("--clock", choices=("event", "wall"), default="event", help="Zeitbasis des SecurityManager")
+    parser.add_argument("--sink", choices=("devnull", "disk"), default="devnull", help="Ziel der Senken und Logs")
+    parser.add_argument("--tracemalloc", action="store_true", help="zusätzlich Python-Heap messen (langsamer)")
+    parser.add_argument("--warmup", type=float, default=0.1, help="Anteil der Messpunkte als Aufwärmphase")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=32.0)
+    parser.add_argument("--max-object-growth", type=int, default=50_000)
+    parser.add_argument("--max-latency-drift", type=float, default=1.5, help="erlaubter Faktor für p50")
+    parser.add_argument("--max-p99-drift", type=float, default=2.0, help="erlaubter Faktor für p99")
+    parser.add_argument("--report", default=None, help="Messpunkte und Ergebnis als JSON speichern")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.phase_packets % args.sample_every:
+        parser.error("--phase-packets muss ein Vielfaches von --sample-every sein")
+
+    if args.worker:
+        return _worker(args)
+
+    if args.report:
+        args.report = str(Path(args.report).resolve())
+    with tempfile.TemporaryDirectory(prefix="cubesat_soak_") as tmp:
+        root = Path(tmp)
+        _copy_project(root)
+        env = dict(os.environ, HMAC_SECRET_HEX=SOAK_SECRET_HEX, HMAC_KEY_ID="k1",
+                   HMAC_KEYRING=str(root / "keyring.json"))
+        cmd = [sys.executable, str(root / "tools" / "soak.py"), "--worker", *sys.argv[1:]]
+        if args.report:
+            cmd += ["--report", args.report]
+        # Lockout-Meldungen des SecurityManager (stderr) in eine Datei, Messpunkte durchreichen
+        stderr_path = root / "soak_stderr.log"
+        with stderr_path.open("w", encoding="utf-8") as err:
+            code = subprocess.run(cmd, cwd=root, env=env, stderr=err).returncode
+        if code not in (0, 1):
+            print("".join(stderr_path.read_text(encoding="utf-8").splitlines(True)[-20:]), file=sys.stderr)
+        return code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())